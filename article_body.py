@@ -0,0 +1,298 @@
+# 기사 본문 수집 (선택, ENRICH_BODIES=1)
+# 검색 API는 요약(description)만 주므로, originallink 페이지를 병렬로 받아 본문을 추출해
+# news['body']에 넣는다 (키워드 매칭에 사용, 저장 전에 제거).
+# - 언론사(호스트)별 동시 연결 수 제한, 응답 크기 상한, 타임아웃
+# - 본문은 URL별로 디스크에 캐시하고 ETag/Last-Modified 조건부 요청으로 재검증 (변경 없으면 304)
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    BODY_CACHE_DIR, BODY_FETCH_WORKERS as DEFAULT_FETCH_WORKERS, BODY_PER_HOST as DEFAULT_PER_HOST,
+    BODY_MAX_BYTES, BODY_MAX_CHARS, BODY_TIMEOUT_SEC as DEFAULT_TIMEOUT_SEC, BODY_FRESH_HOURS
+)
+
+# 동시 요청 수(전체/호스트별), 요청 타임아웃(초) - 환경 변수로 덮어쓰기 가능
+BODY_FETCH_WORKERS = int(os.environ.get('BODY_FETCH_WORKERS', DEFAULT_FETCH_WORKERS))
+BODY_PER_HOST = int(os.environ.get('BODY_PER_HOST', DEFAULT_PER_HOST))
+BODY_TIMEOUT_SEC = float(os.environ.get('BODY_TIMEOUT_SEC', DEFAULT_TIMEOUT_SEC))
+
+USER_AGENT = "Mozilla/5.0 (compatible; mvno-news-collector)"
+
+# 본문으로 보지 않는 요소 (안쪽 텍스트 전체 무시)
+SKIP_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "button", "select", "iframe", "svg"}
+
+# 텍스트 블록 경계가 되는 요소
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "article", "section", "td", "tr", "table", "ul", "ol",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "figcaption", "main"
+}
+
+# 이보다 짧은 블록은 메뉴/링크 모음으로 보고 제외 (<article>/<p> 안의 블록은 그대로 사용)
+MIN_BLOCK_CHARS = 40
+
+_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class _TextExtractor(HTMLParser):
+    """HTML을 텍스트 블록 [(텍스트, 본문 영역 여부), ...]로 나눔"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.current = []
+        self.skip_depth = 0
+        self.article_depth = 0
+        self.paragraph_depth = 0
+        self.description = ""
+
+    def _flush(self):
+        text = re.sub(r'\s+', ' ', "".join(self.current)).strip()
+        if text:
+            self.blocks.append((text, self.article_depth > 0 or self.paragraph_depth > 0))
+        self.current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            if attrs.get("property") in ("og:description", "description") or attrs.get("name") == "description":
+                self.description = self.description or (attrs.get("content") or "").strip()
+            return
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in ("article", "main"):
+            self.article_depth += 1
+        elif tag == "p":
+            self.paragraph_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(self.skip_depth - 1, 0)
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in ("article", "main"):
+            self.article_depth = max(self.article_depth - 1, 0)
+        elif tag == "p":
+            self.paragraph_depth = max(self.paragraph_depth - 1, 0)
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.current.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_text(html, max_chars=BODY_MAX_CHARS):
+    """HTML에서 본문 텍스트 추출 (<article>/<p> 블록 우선, 없으면 긴 텍스트 블록, 그래도 없으면 meta description)"""
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+
+    main_blocks = [text for text, in_main in parser.blocks if in_main]
+    if sum(len(text) for text in main_blocks) < MIN_BLOCK_CHARS * 3:
+        main_blocks = [text for text, _ in parser.blocks if len(text) >= MIN_BLOCK_CHARS]
+    body = "\n".join(main_blocks) or parser.description
+    return body[:max_chars]
+
+
+def decode_html(content, response):
+    """응답 바이트를 문자열로 (Content-Type charset → <meta charset> → UTF-8 순)"""
+    encoding = None
+    if 'charset=' in response.headers.get('Content-Type', ''):
+        encoding = response.encoding
+    if not encoding:
+        match = _CHARSET_PATTERN.search(content[:4096])
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+class BodyCache:
+    """URL별 본문 캐시 (BODY_CACHE_DIR/<sha1 앞 2자리>/<sha1>.json)"""
+
+    def __init__(self, directory=BODY_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.json"
+
+    def get(self, url):
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url, entry):
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+class BodyFetcher:
+    """originallink 본문 병렬 수집기 (호스트별 동시 연결 제한 + 조건부 요청 캐시)"""
+
+    def __init__(self, cache=None, workers=BODY_FETCH_WORKERS, per_host=BODY_PER_HOST,
+                 timeout=BODY_TIMEOUT_SEC, max_bytes=BODY_MAX_BYTES, fresh_hours=BODY_FRESH_HOURS):
+        self.cache = cache or BodyCache()
+        self.workers = workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.fresh_sec = fresh_hours * 3600
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max(workers, 1))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="body-fetch")
+        self.lock = threading.Lock()
+        self.host_slots = {}
+        self.stats = {
+            'requested': 0,
+            'cache_fresh': 0,
+            'not_modified': 0,
+            'fetched': 0,
+            'too_large': 0,
+            'failed': 0,
+            'bytes': 0
+        }
+
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _host_slot(self, url):
+        host = urlparse(url).netloc.lower()
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(self.per_host)
+        return slot
+
+    def _download(self, url, headers):
+        """(응답, 본문 바이트) 반환, 크기 상한을 넘으면 바이트는 None"""
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True, allow_redirects=True) as response:
+            if response.status_code != 200:
+                return response, b""
+            length = response.headers.get('Content-Length')
+            if length and length.isdigit() and int(length) > self.max_bytes:
+                return response, None
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=16384):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    return response, None
+                chunks.append(chunk)
+            return response, b"".join(chunks)
+
+    def fetch(self, url):
+        """URL의 본문 텍스트 (실패 시 캐시된 본문 또는 빈 문자열)"""
+        self._count('requested')
+        cached = self.cache.get(url)
+        if cached and time.time() - cached.get('checked_ts', 0) < self.fresh_sec:
+            self._count('cache_fresh')
+            return cached['text']
+
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        try:
+            with self._host_slot(url):
+                response, content = self._download(url, headers)
+        except requests.RequestException:
+            self._count('failed')
+            return cached['text'] if cached else ""
+
+        if response.status_code == 304 and cached:
+            self._count('not_modified')
+            cached['checked_ts'] = time.time()
+            self.cache.put(url, cached)
+            return cached['text']
+        if content is None:
+            self._count('too_large')
+            return cached['text'] if cached else ""
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            self._count('failed')
+            return cached['text'] if cached else ""
+
+        self._count('fetched')
+        self._count('bytes', len(content))
+        text = extract_text(decode_html(content, response))
+        self.cache.put(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'checked_ts': time.time(),
+            'text': text
+        })
+        return text
+
+    def enrich(self, news_list):
+        """기사 목록의 originallink(없으면 link) 본문을 병렬로 받아 news['body']에 저장
+
+        여러 키워드 검색 스레드에서 동시에 호출해도 전체 동시 요청 수는 workers개로 제한된다.
+        """
+        pending = [news for news in news_list if 'body' not in news]
+        urls = list(dict.fromkeys(news.get('originallink') or news['link'] for news in pending))
+        if not urls:
+            return
+
+        bodies = dict(zip(urls, self.executor.map(self.fetch, urls)))
+        for news in pending:
+            news['body'] = bodies[news.get('originallink') or news['link']]
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_body_fetcher():
+    """프로세스 공용 본문 수집기 (커넥션 풀/호스트별 제한 공유)"""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = BodyFetcher()
+    return _fetcher
+
+
+def drop_bodies(news_by_keyword):
+    """저장 전에 본문 제거 (JSON/아카이브/리포트에는 요약만 기록)"""
+    for news_list in news_by_keyword.values():
+        for news in news_list:
+            news.pop('body', None)
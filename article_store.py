@@ -0,0 +1,323 @@
+# 수집 기사 저장소 (SQLite, 링크/정규화 제목 인덱스)
+# 매 실행마다 mvno_news_*.json 전체를 다시 읽지 않고 중복 여부를 바로 조회한다.
+# 기사 제목의 MinHash LSH 밴드를 수집일과 함께 저장해, 제목만 살짝 바꿔 다시 나온 기사를 실행 간에 찾는다.
+# (재게재 확인 기간 안의 밴드만 색인 범위로 조회하므로 저장소 전체 크기와 관계없이 조회 비용이 일정)
+# 저장소가 없을 때는 압축된 아카이브(archive/)와 남아 있는 실행별 JSON에서 다시 만든다.
+
+import json
+import re
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+
+import pytz
+
+from config import ARCHIVE_DIR, DATA_DIR, STORE_PATH
+from news_archive import read_records
+from news_similarity import (
+    MINHASH_MIN_BANDS, MINHASH_SCHEME, char_set_bound, lsh_band_hashes, normalize_title, title_similarity, upper_bound
+)
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 수집 시각 저장 형식 (KST, 문자열 비교 = 시간 순서, 앞 10자리가 수집일)
+# 예전 저장소에는 ISO 시각/"YYYY-MM-DD HH:MM KST"/빈 값이 섞여 있어 처음 열 때 한 번 변환한다
+COLLECTED_AT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# 재게재 후보 제목을 한 번에 읽는 개수 (수집 순서대로 읽다가 일치하는 기사를 찾으면 멈춤)
+REPEAT_FETCH_CHUNK = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    link TEXT PRIMARY KEY,
+    norm_title TEXT NOT NULL,
+    keyword TEXT,
+    pub_date TEXT,
+    collected_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_norm_title ON articles (norm_title);
+CREATE TABLE IF NOT EXISTS watermarks (
+    keyword TEXT PRIMARY KEY,
+    pub_date TEXT,
+    link TEXT
+);
+CREATE TABLE IF NOT EXISTS title_bands (
+    band INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    collected_at TEXT NOT NULL,
+    link TEXT NOT NULL,
+    PRIMARY KEY (band, hash, collected_at, link)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS repeats (
+    link TEXT PRIMARY KEY,
+    original_link TEXT NOT NULL,
+    keyword TEXT,
+    collected_at TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def store_time(value):
+    """수집 시각(datetime, ISO 문자열, "YYYY-MM-DD HH:MM KST")을 COLLECTED_AT_FORMAT으로 변환, 알 수 없으면 ''"""
+    if not isinstance(value, datetime):
+        value = (value or '').strip()
+        try:
+            if value.endswith(" KST"):
+                value = datetime.strptime(value[:-len(" KST")], "%Y-%m-%d %H:%M")
+            else:
+                value = datetime.fromisoformat(value)
+        except ValueError:
+            return ''
+    if value.tzinfo is None:
+        value = KST.localize(value)
+    return value.astimezone(KST).strftime(COLLECTED_AT_FORMAT)
+
+
+def snapshot_time(json_file):
+    """mvno_news_YYYYMMDD_HHMMSS.json 파일 이름의 수집 시각 (collection_time이 없는 스냅샷용)"""
+    match = re.search(r'_(\d{8}_\d{6})\.json$', str(json_file))
+    return KST.localize(datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")) if match else None
+
+
+class ArticleStore:
+    """링크/정규화 제목 기준 기사 저장소"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        if "collected_at" not in [row[1] for row in self.conn.execute("PRAGMA table_info(title_bands)")]:
+            # 수집 시각이 없는 이전 형식 서명 색인: 지우고 open_store()에서 다시 만듦
+            self.conn.executescript("DROP TABLE title_bands;" + SCHEMA)
+        if self.get_meta('collected_at_format') != COLLECTED_AT_FORMAT:
+            self._normalize_collected_at()
+        # preload() 이후에는 링크를 메모리 집합으로 조회 (데몬 모드)
+        self._links = None
+
+    def preload(self):
+        """링크 색인을 메모리에 올려 이후 has_link() 조회를 집합 연산으로 처리"""
+        self._links = {link for link, in self.conn.execute("SELECT link FROM articles")}
+        return len(self._links)
+
+    def _remember(self, rows):
+        if self._links is not None:
+            self._links.update(row[0] for row in rows)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def has_link(self, link):
+        """링크가 이미 저장되어 있는지 확인"""
+        if self._links is not None:
+            return link in self._links
+        row = self.conn.execute("SELECT 1 FROM articles WHERE link = ?", (link,)).fetchone()
+        return row is not None
+
+    def _normalize_collected_at(self):
+        """기존 기록의 수집 시각을 COLLECTED_AT_FORMAT으로 변환 (1회성)"""
+        with self.conn:
+            for table in ("articles", "repeats"):
+                for (value,) in self.conn.execute(f"SELECT DISTINCT collected_at FROM {table}").fetchall():
+                    normalized = store_time(value)
+                    if normalized != value:
+                        self.conn.execute(
+                            f"UPDATE {table} SET collected_at = ? WHERE collected_at = ?", (normalized, value)
+                        )
+        self.set_meta('collected_at_format', COLLECTED_AT_FORMAT)
+
+    @staticmethod
+    def _band_rows(rows):
+        """(link, norm_title, ..., collected_at) 행의 (band, hash, collected_at, link) 서명 색인 행 (수집 시각을 모르면 제외)"""
+        return [
+            (band, value, row[-1], row[0])
+            for row in rows if row[-1]
+            for band, value in lsh_band_hashes(row[1])
+        ]
+
+    def _insert_articles(self, rows):
+        """(link, norm_title, keyword, pub_date, collected_at) 행 추가 + 새 기사의 제목 서명 색인"""
+        rows = [(*row[:4], store_time(row[4])) for row in rows]
+        with self.conn:
+            new_rows = [
+                row for row in rows
+                if self.conn.execute(
+                    "INSERT OR IGNORE INTO articles (link, norm_title, keyword, pub_date, collected_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    row
+                ).rowcount
+            ]
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO title_bands (band, hash, collected_at, link) VALUES (?, ?, ?, ?)",
+                self._band_rows(new_rows)
+            )
+        self._remember(rows)
+        return len(rows)
+
+    def add_articles(self, grouped_news_by_keyword, collected_at):
+        """그룹화된 뉴스를 저장소에 추가 (이미 있는 링크는 무시)"""
+        return self._insert_articles([
+            (news['link'], normalize_title(news['title']), keyword, news.get('pubDate', ''), collected_at)
+            for keyword, groups in grouped_news_by_keyword.items()
+            for group in groups
+            for news in group
+        ])
+
+    def find_repeat(self, title, threshold, since):
+        """since(YYYY-MM-DD) 이후 수집된 기사 중 제목 유사도가 threshold 이상인 가장 먼저 수집된 기사 링크
+
+        since 이후 수집된 기사의 LSH 밴드만 색인 범위로 읽어 MINHASH_MIN_BANDS개 이상 겹친 기사를 후보로 하고,
+        수집 순서대로 제목을 REPEAT_FETCH_CHUNK개씩 읽어 그룹화와 같은 SequenceMatcher 기준으로 판정한다.
+        """
+        norm_title = normalize_title(title)
+        hits = Counter()
+        collected = {}
+        for band, value in lsh_band_hashes(norm_title):
+            rows = self.conn.execute(
+                "SELECT link, collected_at FROM title_bands WHERE band = ? AND hash = ? AND collected_at >= ?",
+                (band, value, since)
+            ).fetchall()
+            collected.update(rows)
+            hits.update(map(itemgetter(0), rows))
+        candidates = sorted((collected[link], link) for link, count in hits.items() if count >= MINHASH_MIN_BANDS)
+
+        counts = Counter(norm_title)
+        chars = set(counts)
+        for offset in range(0, len(candidates), REPEAT_FETCH_CHUNK):
+            chunk = [link for _, link in candidates[offset:offset + REPEAT_FETCH_CHUNK]]
+            titles = dict(self.conn.execute(
+                f"SELECT link, norm_title FROM articles WHERE link IN ({','.join('?' * len(chunk))})", chunk
+            ))
+            for link in chunk:
+                earlier_title = titles.get(link)
+                if earlier_title is None:
+                    continue
+                if char_set_bound(set(earlier_title), chars, len(earlier_title), len(norm_title)) < threshold:
+                    continue
+                if upper_bound(Counter(earlier_title), counts, len(earlier_title), len(norm_title)) < threshold:
+                    continue
+                if title_similarity(earlier_title, norm_title) >= threshold:
+                    return link
+        return None
+
+    def add_repeats(self, repeats, collected_at):
+        """이전 기사에 붙인 재게재 기사 기록 [(keyword, news, original_link), ...]
+
+        재게재 기사도 링크 중복 체크 대상이 되도록 articles에 추가한다 (서명 색인에는 넣지 않음).
+        """
+        collected_at = store_time(collected_at)
+        rows = [
+            (news['link'], normalize_title(news['title']), keyword, news.get('pubDate', ''), collected_at)
+            for keyword, news, original_link in repeats
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO repeats (link, original_link, keyword, collected_at) VALUES (?, ?, ?, ?)",
+                [(news['link'], original_link, keyword, collected_at) for keyword, news, original_link in repeats]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles (link, norm_title, keyword, pub_date, collected_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        self._remember(rows)
+        return len(repeats)
+
+    def build_title_index(self):
+        """재게재 기사를 뺀 모든 기사의 LSH 밴드를 현재 서명 방식(MINHASH_SCHEME)으로 다시 생성"""
+        rows = self.conn.execute(
+            "SELECT link, norm_title, collected_at FROM articles WHERE link NOT IN (SELECT link FROM repeats)"
+        ).fetchall()
+        with self.conn:
+            self.conn.execute("DELETE FROM title_bands")
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO title_bands (band, hash, collected_at, link) VALUES (?, ?, ?, ?)",
+                self._band_rows(rows)
+            )
+        self.set_meta('title_index_built', MINHASH_SCHEME)
+        return len(rows)
+
+    def get_watermarks(self):
+        """키워드별 마지막 처리 기사 {키워드: {'pubDate': ..., 'link': ...}}"""
+        rows = self.conn.execute("SELECT keyword, pub_date, link FROM watermarks").fetchall()
+        return {keyword: {'pubDate': pub_date, 'link': link} for keyword, pub_date, link in rows}
+
+    def set_watermarks(self, watermarks):
+        """키워드별 마지막 처리 기사 저장"""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO watermarks (keyword, pub_date, link) VALUES (?, ?, ?)",
+                [(keyword, mark['pubDate'], mark['link']) for keyword, mark in watermarks.items()]
+            )
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def prune(self, before_date):
+        """before_date(YYYY-MM-DD) 이전에 수집된 기사 기록 삭제, 삭제 건수 반환"""
+        with self.conn:
+            self.conn.execute("DELETE FROM title_bands WHERE collected_at < ?", (before_date,))
+            self.conn.execute("DELETE FROM repeats WHERE collected_at < ?", (before_date,))
+            cursor = self.conn.execute("DELETE FROM articles WHERE collected_at < ?", (before_date,))
+        if self._links is not None:
+            self.preload()
+        return cursor.rowcount
+
+    def import_archive(self, archive_dir=ARCHIVE_DIR):
+        """아카이브 레코드(압축된 일별 파일 포함)를 저장소로 가져오기"""
+        return self._insert_articles([
+            (record['link'], normalize_title(record['title']), record['keyword'], record['pubDate'],
+             record['collected_at'])
+            for record in read_records(["link", "title", "keyword", "pubDate", "collected_at"], archive_dir=archive_dir)
+        ])
+
+    def import_json_history(self, data_dir=DATA_DIR, archive_dir=ARCHIVE_DIR):
+        """아카이브와 남아 있는 mvno_news_*.json 히스토리를 저장소로 가져오기 (1회성)"""
+        imported = self.import_archive(archive_dir)
+        for json_file in sorted(Path(data_dir).glob("mvno_news_*.json")):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            collected_at = data.get('collection_time') or snapshot_time(json_file)
+            imported += self.add_articles(data.get('news_by_keyword', {}), collected_at)
+
+        self.set_meta('json_history_imported', 1)
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+
+def open_store(path=STORE_PATH):
+    """저장소를 열고, 처음 사용하는 경우 JSON 히스토리를 가져온다"""
+    store = ArticleStore(path)
+    if not store.get_meta('json_history_imported'):
+        imported = store.import_json_history()
+        print(f"Imported JSON history into article store: {imported} articles")
+    if store.get_meta('title_index_built') != MINHASH_SCHEME:
+        indexed = store.build_title_index()
+        print(f"Built title signature index: {indexed} articles")
+    return store
+
+
+if __name__ == "__main__":
+    # python article_store.py --reimport : JSON 히스토리 강제 재가져오기
+    store = ArticleStore()
+    if "--reimport" in sys.argv:
+        print(f"Imported: {store.import_json_history()} articles")
+    print(f"Articles in store: {len(store)}")
+    store.close()
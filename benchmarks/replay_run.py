@@ -0,0 +1,109 @@
+# 대역 서버를 띄우고 수집 스크립트 전체를 네트워크 없이 실행하는 재생 하네스
+# 임시 디렉토리에서 naver_news.py(또는 일일 요약)의 main()을 실행하고,
+# 전체 소요 시간과 대역 서버 통계(요청 수, 429, 텔레그램 메시지)를 출력/저장한다.
+#
+# 사용법:
+#   python benchmarks/replay_run.py --articles 3000 --latency-ms 80 --error-rate 0.05 --workers 4
+#   python benchmarks/replay_run.py --script daily --span-hours 48
+#   python benchmarks/replay_run.py --corpus mvno_news/mvno_news_YYYYMMDD_HHMMSS.json --output replay.json
+
+import argparse
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from standin_server import add_server_arguments, build_server_options, start_server
+
+SCRIPTS = {"collect": "naver_news", "daily": "naver_news_daily_summary"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대역 서버로 수집 스크립트 전체 실행")
+    parser.add_argument("--script", choices=sorted(SCRIPTS), default="collect", help="실행할 스크립트")
+    parser.add_argument("--workers", type=int, help="키워드 검색 동시 실행 수 (MAX_WORKERS)")
+    parser.add_argument("--output", help="결과 JSON 경로")
+    parser.add_argument("--verbose", action="store_true", help="스크립트 출력 표시")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    articles, options = build_server_options(args)
+    server, base_url = start_server(articles, **options)
+    print(f"Stand-in server: {base_url} ({len(articles)} articles)")
+
+    # naver_api 등은 import 시점에 환경 변수를 읽으므로 스크립트 import 전에 설정
+    os.environ.update({
+        "NAVER_API_BASE": base_url,
+        "TELEGRAM_API_BASE": base_url,
+        "NAVER_CLIENT_ID": "standin",
+        "NAVER_CLIENT_SECRET": "standin",
+        "TELEGRAM_BOT_TOKEN": "standin",
+        "TELEGRAM_CHAT_ID_NEWS": "0",
+        "NAVER_DAILY_QUOTA": os.environ.get("NAVER_DAILY_QUOTA", "1000000")
+    })
+    if args.workers is not None:
+        os.environ["MAX_WORKERS"] = str(args.workers)
+
+    cwd = os.getcwd()
+    leaked_before = os.path.exists(os.path.join(cwd, "mvno_news"))
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            module = importlib.import_module(SCRIPTS[args.script])
+            from naver_api import get_scheduler
+            # 호출 횟수는 atexit에서 상대 경로(mvno_news/api_quota.json)로 저장되는데,
+            # 그 시점에는 임시 디렉토리를 벗어나 있으므로 저장하지 않음 (run_shard와 동일)
+            get_scheduler().quota.persist = False
+            output = io.StringIO()
+            started = time.perf_counter()
+            if args.verbose:
+                module.main()
+                module.flush_notifications()
+            else:
+                with redirect_stdout(output):
+                    module.main()
+                    module.flush_notifications()
+            elapsed = time.perf_counter() - started
+        finally:
+            os.chdir(cwd)
+
+    server.shutdown()
+    # 실행 결과물은 모두 임시 디렉토리에만 써야 함 (종료 시 atexit 저장도 미리 실행해 확인)
+    get_scheduler().quota.save()
+    if not leaked_before and os.path.exists(os.path.join(cwd, "mvno_news")):
+        raise RuntimeError(f"replay run wrote into the caller's directory: {os.path.join(cwd, 'mvno_news')}")
+    with server.state.lock:
+        stats = dict(server.state.stats)
+        messages = list(server.state.messages)
+
+    result = {
+        "script": args.script,
+        "articles": len(articles),
+        "workers": int(os.environ.get("MAX_WORKERS", 0)) or None,
+        "server_options": options,
+        "elapsed_sec": round(elapsed, 3),
+        "server_stats": stats,
+        "telegram_messages": messages
+    }
+
+    print(f"Elapsed: {elapsed:.3f}s")
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✓ 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# 수집 파이프라인 주요 단계 벤치마크
+# 합성 기사/히스토리로 load_existing_news, remove_duplicates, group_all_news, save_data의
+# 실행 시간과 최대 메모리(tracemalloc)를 기사 수별로 측정해 JSON으로 저장한다.
+#   load_existing_news         히스토리 가져오기 + 제목 서명 색인 생성 (저장소가 없을 때 1회성)
+#   remove_duplicates          링크/제목 중복 확인만 (재게재 기사 조회 없음)
+#   remove_duplicates_repeats  실제 실행과 같이 재게재 기사 조회 포함 (앞 단계와의 차이가 조회 비용)
+#
+# 사용법:
+#   python benchmarks/run_benchmarks.py                       # 100, 1k, 10k, 100k
+#   python benchmarks/run_benchmarks.py --sizes 100,1000 --output results.json
+#   python benchmarks/run_benchmarks.py --no-memory           # 메모리 측정 생략 (시간만 측정)
+#
+# 시간은 tracemalloc 없이 측정하고, 최대 메모리는 같은 입력으로 한 번 더 실행해 측정한다.
+# 합성 기사는 대부분 히스토리와 제목이 비슷해 재게재로 판정되므로 100k 단계의 remove_duplicates_repeats는 오래 걸릴 수 있다.
+#
+# 측정은 임시 디렉토리에서 실행되며 저장소의 mvno_news/, news_reports/는 건드리지 않는다.
+
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+import naver_news
+from synthetic_news import articles_by_keyword, generate_articles, write_history
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+HISTORY_RUNS = 8  # 하루치 3시간 간격 실행
+
+
+def measure(stage, size, trace_memory, func, *args):
+    """func(*args) 실행 시간(초)과 최대 메모리(MB, trace_memory일 때만) 측정, (결과, 측정값) 반환"""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = func(*args)
+    elapsed = time.perf_counter() - started
+    peak_mb = None
+    if trace_memory:
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+        tracemalloc.stop()
+
+    row = {"stage": stage, "size": size, "seconds": round(elapsed, 4), "peak_mb": peak_mb}
+    print(f"  {stage:<26} {elapsed:>9.3f}s" + (f" {peak_mb:>9.1f}MB" if peak_mb is not None else ""))
+    return result, row
+
+
+def build_stats(grouped_news_by_keyword):
+    stats = {'total_news': 0, 'by_keyword': {}, 'repeats_suppressed': 0}
+    for keyword, groups in grouped_news_by_keyword.items():
+        total_articles = sum(len(g) for g in groups)
+        stats['total_news'] += total_articles
+        stats['by_keyword'][keyword] = total_articles
+    return stats
+
+
+def run_size(size, trace_memory):
+    """기사 size개 기준 한 번의 파이프라인 측정"""
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            write_history(naver_news.DATA_DIR, HISTORY_RUNS, max(size // HISTORY_RUNS, 1))
+            all_news_by_keyword = articles_by_keyword(generate_articles(size))
+
+            store, row = measure("load_existing_news", size, trace_memory, naver_news.load_existing_news)
+            rows.append(row)
+
+            _, row = measure(
+                "remove_duplicates", size, trace_memory, naver_news.remove_duplicates, all_news_by_keyword, store
+            )
+            rows.append(row)
+
+            deduplicated, row = measure(
+                "remove_duplicates_repeats", size, trace_memory,
+                naver_news.remove_duplicates, all_news_by_keyword, store, []
+            )
+            rows.append(row)
+
+            grouped, row = measure("group_all_news", size, trace_memory, naver_news.group_all_news, deduplicated)
+            rows.append(row)
+
+            _, row = measure("save_data", size, trace_memory, naver_news.save_data, grouped, build_stats(grouped), store, {})
+            rows.append(row)
+
+            store.close()
+        finally:
+            os.chdir(cwd)
+    return rows
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 실행 시간/메모리 측정")
+    parser.add_argument("--sizes", help="쉼표로 구분한 기사 수 목록 (기본: 100,1000,10000,100000)")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/bench_YYYYMMDD_HHMMSS.json)")
+    parser.add_argument("--no-memory", action="store_true", help="메모리 측정 생략 (시간만 측정)")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.sizes.split(",")] if args.sizes else DEFAULT_SIZES
+    trace_memory = not args.no_memory
+
+    results = []
+    for size in sizes:
+        print(f"\n[{size} articles]")
+        rows = run_size(size, False)
+        if trace_memory:
+            # tracemalloc은 실행을 크게 느리게 하므로 같은 입력으로 한 번 더 실행해 메모리만 측정
+            print("  (memory pass)")
+            for row, traced in zip(rows, run_size(size, True)):
+                row["peak_mb"] = traced["peak_mb"]
+        results.extend(rows)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "grouping_scope": naver_news.GROUPING_SCOPE,
+        "similarity_backend": naver_news.SIMILARITY_BACKEND,
+        "similarity_threshold": naver_news.SIMILARITY_THRESHOLD,
+        "history_runs": HISTORY_RUNS,
+        "memory_traced": trace_memory,
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else BENCH_DIR / "results" / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ 결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
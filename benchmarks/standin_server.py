@@ -0,0 +1,348 @@
+# 네이버 뉴스 검색 API / 텔레그램 Bot API 로컬 대역 서버
+# 네트워크와 실제 인증 정보 없이 naver_news.py / naver_news_daily_summary.py 전체 실행을 시험한다.
+#   GET  /v1/search/news.json  : 기록된 응답 또는 합성 기사로 검색 결과 반환 (query/display/start/sort)
+#   POST /bot<token>/sendMessage : 메시지를 받아 기록 (4096자 초과 시 400)
+#   GET  /article/<번호>         : 기사 본문 페이지 (--serve-articles, ETag/Last-Modified 조건부 요청 지원)
+#   GET  /_stats                : 요청/오류/메시지 통계
+#
+# 사용법:
+#   python benchmarks/standin_server.py --port 8765 --articles 2000 --latency-ms 80 --error-rate 0.05
+#   python benchmarks/standin_server.py --corpus mvno_news/mvno_news_YYYYMMDD_HHMMSS.json
+#   NAVER_API_BASE=http://127.0.0.1:8765 TELEGRAM_API_BASE=http://127.0.0.1:8765 python naver_news.py
+#   python benchmarks/standin_server.py --serve-articles   # originallink를 대역 서버 본문 페이지로 (ENRICH_BODIES=1 시험)
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic_news import KEYWORDS, KST, generate_articles
+
+TELEGRAM_MAX_LENGTH = 4096
+
+
+def load_corpus(path):
+    """기록된 응답 파일을 기사 목록으로 읽기
+
+    - 기사 목록 JSON ([{title, link, ...}, ...])
+    - 검색 API 응답 JSON ({"items": [...]})
+    - 실행별 수집 JSON ({"news_by_keyword": {키워드: [[기사, ...], ...]}})
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return data
+    if 'items' in data:
+        return data['items']
+
+    articles = {}
+    for groups in data.get('news_by_keyword', {}).values():
+        for group in groups:
+            for news in group:
+                articles.setdefault(news['link'], news)
+    return list(articles.values())
+
+
+class StandinState:
+    """대역 서버 설정과 통계 (요청 스레드 간 공유)"""
+
+    def __init__(self, articles, latency_ms=0, jitter_ms=0, error_rate=0.0, quota=None, seed=0, serve_articles=False):
+        self.articles = sorted(articles, key=lambda news: news.get('pub_ts', 0), reverse=True)
+        self.serve_articles = serve_articles
+        self.base_url = ""
+        if serve_articles:
+            # 본문에만 다른 키워드가 나오는 기사를 섞어 본문 수집 효과를 확인할 수 있게 함
+            body_random = random.Random(seed + 1)
+            for news in self.articles:
+                extra = ""
+                if body_random.random() < 0.3:
+                    extra = f" 한편 {body_random.choice(KEYWORDS)} 역시 비슷한 전략을 검토 중인 것으로 알려졌다."
+                news['page_body'] = f"{news.get('description', '')}{extra}"
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota = quota
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.query_cache = {}
+        self.messages = []
+        self.stats = {
+            'search_requests': 0,
+            'search_ok': 0,
+            'injected_429': 0,
+            'quota_429': 0,
+            'unauthorized': 0,
+            'bytes_sent': 0,
+            'telegram_messages': 0,
+            'telegram_rejected': 0,
+            'article_requests': 0,
+            'article_not_modified': 0
+        }
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            with self.lock:
+                jitter = self.random.uniform(0, self.jitter_ms)
+            time.sleep((self.latency_ms + jitter) / 1000)
+
+    def should_fail(self):
+        """(429 주입 여부, 한도 초과 여부)"""
+        with self.lock:
+            if self.quota is not None and self.stats['search_requests'] > self.quota:
+                return False, True
+            return self.random.random() < self.error_rate, False
+
+    def search(self, query):
+        """검색어가 제목/요약에 들어간 기사 (최신순, 검색어별로 한 번만 계산)"""
+        key = query.lower()
+        with self.lock:
+            cached = self.query_cache.get(key)
+        if cached is None:
+            cached = [
+                news for news in self.articles
+                if key in (news.get('title', '') + " " + news.get('description', '') + " " + news.get('page_body', '')).lower()
+            ]
+            with self.lock:
+                self.query_cache[key] = cached
+        return cached
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """네이버 검색 API / 텔레그램 sendMessage 대역 핸들러"""
+
+    server_version = "StandinServer/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_article(self, number):
+        """기사 본문 HTML (ETag/Last-Modified가 같으면 304)"""
+        self.state.count('article_requests')
+        self.state.delay()
+        if not 0 <= number < len(self.state.articles):
+            self._send_json(404, {"error": "Not Found"})
+            return
+
+        news = self.state.articles[number]
+        etag = f'"article-{number}"'
+        last_modified = news.get('pubDate', '')
+        if self.headers.get("If-None-Match") == etag or (
+            last_modified and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.state.count('article_not_modified')
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        title = escape(news.get('title', '').replace('<b>', '').replace('</b>', ''), quote=False)
+        page = (
+            f"<html><head><meta charset=\"utf-8\"><title>{title}</title></head><body>"
+            f"<header><nav>홈 | 경제 | IT | 사회 | 전체기사</nav></header>"
+            f"<article><h1>{title}</h1><p>{news.get('page_body', '')}</p>"
+            f"<p>업계 관계자는 이번 발표가 요금 경쟁에 미칠 영향을 지켜보고 있다고 말했다.</p></article>"
+            f"<footer>Copyright StandinServer. 무단 전재 및 재배포 금지</footer></body></html>"
+        )
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if last_modified:
+            self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count('bytes_sent', len(body))
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count('bytes_sent', len(body))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/_stats":
+            with self.state.lock:
+                stats = dict(self.state.stats)
+            self._send_json(200, stats)
+            return
+        if url.path.startswith("/article/") and self.state.serve_articles:
+            number = url.path.rsplit("/", 1)[-1]
+            self._send_article(int(number) if number.isdigit() else -1)
+            return
+        if url.path != "/v1/search/news.json":
+            self._send_json(404, {"errorMessage": "Not Found", "errorCode": "404"})
+            return
+
+        self.state.count('search_requests')
+        self.state.delay()
+
+        if not self.headers.get("X-Naver-Client-Id") or not self.headers.get("X-Naver-Client-Secret"):
+            self.state.count('unauthorized')
+            self._send_json(401, {"errorMessage": "Authentication failed.", "errorCode": "024"})
+            return
+
+        inject, over_quota = self.state.should_fail()
+        if over_quota:
+            self.state.count('quota_429')
+            self._send_json(429, {"errorMessage": "Query limit exceeded.", "errorCode": "010"})
+            return
+        if inject:
+            self.state.count('injected_429')
+            self._send_json(429, {"errorMessage": "Rate limit exceeded.", "errorCode": "012"}, {"Retry-After": "0"})
+            return
+
+        params = parse_qs(url.query)
+        query = params.get("query", [""])[0]
+        display = int(params.get("display", ["10"])[0])
+        start = int(params.get("start", ["1"])[0])
+        if not query or not 1 <= display <= 100 or not 1 <= start <= 1000:
+            self._send_json(400, {"errorMessage": "Incorrect query request.", "errorCode": "SE01"})
+            return
+
+        results = self.state.search(query)
+        items = [
+            {field: news.get(field, '') for field in ("title", "originallink", "link", "description", "pubDate")}
+            for news in results[start - 1:start - 1 + display]
+        ]
+        if self.state.serve_articles:
+            for item, news in zip(items, results[start - 1:start - 1 + display]):
+                item['originallink'] = f"{self.state.base_url}/article/{news['number']}"
+        self.state.count('search_ok')
+        self._send_json(200, {
+            "lastBuildDate": format_datetime(datetime.now(KST)),
+            "total": len(results),
+            "start": start,
+            "display": len(items),
+            "items": items
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode('utf-8') if length else ""
+
+        if not (url.path.startswith("/bot") and url.path.endswith("/sendMessage")):
+            self._send_json(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+            return
+
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            data = json.loads(body or "{}")
+        else:
+            data = {key: values[0] for key, values in parse_qs(body).items()}
+        text = data.get("text", "")
+
+        if not text or len(text) > TELEGRAM_MAX_LENGTH:
+            self.state.count('telegram_rejected')
+            self._send_json(400, {"ok": False, "error_code": 400, "description": "Bad Request: message is too long"})
+            return
+
+        with self.state.lock:
+            self.state.messages.append({"chat_id": data.get("chat_id"), "text": text})
+            message_id = len(self.state.messages)
+        self.state.count('telegram_messages')
+        self._send_json(200, {"ok": True, "result": {"message_id": message_id, "text": text}})
+
+
+def create_server(articles, host="127.0.0.1", port=0, **options):
+    """대역 서버 생성 (port=0이면 빈 포트 사용, server.server_address로 확인)"""
+    for news in articles:
+        if 'pub_ts' not in news:
+            try:
+                news['pub_ts'] = parsedate_to_datetime(news.get('pubDate', '')).timestamp()
+            except Exception:
+                news['pub_ts'] = 0
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.state = StandinState(articles, **options)
+    bound_host, bound_port = server.server_address[:2]
+    server.state.base_url = f"http://{bound_host}:{bound_port}"
+    for number, news in enumerate(server.state.articles):
+        news['number'] = number
+    return server
+
+
+def start_server(articles, **options):
+    """백그라운드 스레드에서 대역 서버 실행, (server, base_url) 반환"""
+    server = create_server(articles, **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--corpus", help="기록된 응답/수집 JSON (없으면 합성 기사 사용)")
+    parser.add_argument("--articles", type=int, default=2000, help="합성 기사 수")
+    parser.add_argument("--span-hours", type=float, default=3, help="합성 기사 발행 시간 범위(시간)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="응답 지연(ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="추가 무작위 지연 최대값(ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 주입 비율 (0~1)")
+    parser.add_argument("--quota", type=int, help="이 횟수를 넘는 검색 요청은 429 (한도 초과)")
+    parser.add_argument("--serve-articles", action="store_true", help="originallink를 대역 서버의 기사 본문 페이지로 바꿔 응답")
+
+
+def build_server_options(args):
+    """명령행 인자로 (기사 목록, 서버 옵션) 생성"""
+    if args.corpus:
+        articles = load_corpus(args.corpus)
+    else:
+        articles = generate_articles(args.articles, span_hours=args.span_hours)
+    options = {
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "quota": args.quota,
+        "serve_articles": args.serve_articles
+    }
+    return articles, options
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 검색 API / 텔레그램 Bot API 로컬 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    articles, options = build_server_options(args)
+    server = create_server(articles, host=args.host, port=args.port, **options)
+    print(f"Stand-in server on http://{args.host}:{args.port} ({len(articles)} articles)")
+    print(f"  NAVER_API_BASE=http://{args.host}:{args.port} TELEGRAM_API_BASE=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.state.stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# 벤치마크용 합성 MVNO 뉴스 생성기
+# 네이버 뉴스 검색 API 응답과 같은 형식(title/originallink/link/description/pubDate)으로
+# 같은 사건을 여러 언론사가 조금씩 다르게 쓴 유사 기사, <b> 강조 태그, HTML 엔티티를 포함한 기사를 만든다.
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from pathlib import Path
+
+import pytz
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import KEYWORDS
+
+KST = pytz.timezone('Asia/Seoul')
+
+CARRIERS = ["SK텔레콤", "KT", "LG유플러스", "SKT", "LGU+"]
+ACTIONS = [
+    "5G 중간요금제 출시", "가입자 {n}만 돌파", "월 {n}천원대 요금제 공개", "번호이동 {n}% 증가",
+    "도매대가 인하 합의", "eSIM 개통 지원", "해외 로밍 요금 인하", "고객센터 {n}시간 운영",
+    "점유율 {n}% 달성", "신규 부가서비스 출시", "제휴 카드 할인 확대", "자급제폰 프로모션",
+    "과기정통부 활성화 대책 발표", "데이터 무제한 요금제 개편", "시니어 전용 요금제 선보여"
+]
+PREFIXES = ["[단독]", "[종합]", "[속보]", "[현장]", "(종합2보)", "[이슈]"]
+SUFFIXES = ["…업계 긴장", "…소비자 반응은?", "\"가성비 최고\"", "&quot;파격 혜택&quot;", "…3사 경쟁 심화", "(상보)"]
+QUOTES = ["&quot;요금 부담 낮춘다&quot;", "'알뜰' 바람", "&lt;분석&gt;", "R&amp;D 투자 확대"]
+# 기사마다 다른 고유명사(지역/인물/상품명 역할)로 서로 다른 사건의 제목이 겹치지 않게 한다
+_entity_random = random.Random(7)
+ENTITIES = [
+    "".join(chr(0xAC00 + _entity_random.randrange(11172)) for _ in range(_entity_random.randint(2, 4)))
+    for _ in range(3000)
+]
+OUTLETS = [
+    "news.example.co.kr", "biz.example.com", "it.example.kr", "economy.example.com", "daily.example.net",
+    "tech.example.co.kr", "press.example.kr", "media.example.com"
+]
+
+
+def _fill(rng, text):
+    return text.replace("{n}", str(rng.randint(2, 99)))
+
+
+def make_story(rng):
+    """한 사건의 기본 제목 (키워드 1~2개 + 통신사 + 고유명사 + 행동)"""
+    keyword = rng.choice(KEYWORDS)
+    parts = [f"<b>{keyword}</b>"]
+    if rng.random() < 0.3:
+        parts.append(f"<b>{rng.choice(KEYWORDS)}</b>")
+    if rng.random() < 0.5:
+        parts.append(rng.choice(CARRIERS))
+    parts.extend(rng.sample(ENTITIES, 2))
+    parts.append(_fill(rng, rng.choice(ACTIONS)))
+    parts.extend(rng.sample(ENTITIES, rng.randint(1, 2)))
+    if rng.random() < 0.3:
+        parts.append(rng.choice(QUOTES))
+    return " ".join(parts)
+
+
+def make_variant(rng, title):
+    """다른 언론사의 유사 제목 (머리말/꼬리말 추가, 단어 삭제·순서 변경)"""
+    words = title.split()
+    if len(words) > 3 and rng.random() < 0.4:
+        words.pop(rng.randrange(1, len(words)))
+    if len(words) > 2 and rng.random() < 0.3:
+        k = rng.randrange(len(words) - 1)
+        words[k], words[k + 1] = words[k + 1], words[k]
+    if rng.random() < 0.5:
+        words.insert(0, rng.choice(PREFIXES))
+    if rng.random() < 0.5:
+        words.append(rng.choice(SUFFIXES))
+    return " ".join(words)
+
+
+def generate_articles(count, seed=0, end_time=None, span_hours=3):
+    """합성 기사 count개 (최신순, pubDate는 end_time 이전 span_hours 시간에 분포)"""
+    rng = random.Random(seed)
+    end_time = end_time or datetime.now(KST)
+    articles = []
+
+    while len(articles) < count:
+        story = make_story(rng)
+        for version in range(1 + min(int(rng.expovariate(0.7)), 6)):
+            title = story if version == 0 else make_variant(rng, story)
+            outlet = rng.choice(OUTLETS)
+            article_id = f"{seed:03d}{len(articles):09d}"
+            articles.append({
+                "title": title,
+                "originallink": f"https://{outlet}/news/{article_id}",
+                "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 999):03d}/{article_id}",
+                "description": f"{title} 관련 내용을 전했다. 업계에 따르면 {_fill(rng, rng.choice(ACTIONS))} 등 &quot;알뜰&quot; 경쟁이 이어지고 있다.",
+                "pubDate": None
+            })
+            if len(articles) >= count:
+                break
+
+    rng.shuffle(articles)
+    step = span_hours * 3600 / max(count, 1)
+    for rank, article in enumerate(articles):
+        article["pubDate"] = format_datetime(end_time - timedelta(seconds=step * rank))
+    return articles
+
+
+def articles_by_keyword(articles):
+    """검색 API처럼 키워드별 결과 목록으로 배분 (제목/요약에 키워드가 들어간 기사, 키워드 간 중복 포함)"""
+    by_keyword = {keyword: [] for keyword in KEYWORDS}
+    for article in articles:
+        text = (article["title"] + " " + article["description"]).lower()
+        for keyword in KEYWORDS:
+            if keyword.lower() in text:
+                by_keyword[keyword].append(article)
+    return {keyword: news for keyword, news in by_keyword.items() if news}
+
+
+def write_history(data_dir, runs, articles_per_run, seed=1000, end_time=None):
+    """과거 실행 runs개의 mvno_news_YYYYMMDD_HHMMSS.json을 data_dir에 생성 (3시간 간격)"""
+    end_time = end_time or datetime.now(KST)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    for run in range(runs):
+        run_time = end_time - timedelta(hours=3 * (run + 1))
+        articles = generate_articles(articles_per_run, seed=seed + run, end_time=run_time)
+        grouped = {}
+        for keyword, news_list in articles_by_keyword(articles).items():
+            grouped[keyword] = [[news] for news in news_list]
+        data = {
+            "collection_time": run_time.strftime("%Y-%m-%d %H:%M KST"),
+            "search_hours": 3,
+            "similarity_threshold": 0.6,
+            "statistics": {},
+            "news_by_keyword": grouped
+        }
+        path = data_dir / f"mvno_news_{run_time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    # python benchmarks/synthetic_news.py [기사 수] : 합성 기사를 JSON으로 출력
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(json.dumps(generate_articles(count), ensure_ascii=False, indent=2))
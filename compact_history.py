@@ -0,0 +1,193 @@
+# 수집 히스토리 압축 및 보존 기간 정리
+# - 하루치 mvno_news_YYYYMMDD_HHMMSS.json 스냅샷과 실행별 아카이브 파트를 하나의 일별 아카이브로 병합
+#   (mvno_news/archive/date=YYYY-MM-DD/daily-YYYYMMDD.jsonl + 링크 색인)
+# - 보존 기간이 지난 리포트/아카이브/저장소 기록 삭제
+#
+# 사용법: python compact_history.py [--dry-run]
+
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+
+import config
+from config import DATA_DIR, REPORTS_DIR, ARCHIVE_DIR, STORE_PATH
+from article_store import ArticleStore
+from news_archive import flatten_run, list_partitions, partition_dir, partition_parts, read_partition, rewrite_partition
+
+KST = pytz.timezone('Asia/Seoul')
+
+UNCOMPACTED_DAYS = int(os.environ.get('UNCOMPACTED_DAYS', config.UNCOMPACTED_DAYS))
+REPORT_RETENTION_DAYS = int(os.environ.get('REPORT_RETENTION_DAYS', config.REPORT_RETENTION_DAYS))
+DAILY_RETENTION_DAYS = int(os.environ.get('DAILY_RETENTION_DAYS', config.DAILY_RETENTION_DAYS))
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', config.ARCHIVE_RETENTION_DAYS))
+
+
+def get_kst_now():
+    """현재 한국 시간 반환"""
+    return datetime.now(KST)
+
+
+def snapshot_files_by_day():
+    """{YYYY-MM-DD: [스냅샷 파일, ...]} (실시간 수집 JSON)"""
+    by_day = {}
+    for json_file in sorted(Path(DATA_DIR).glob("mvno_news_*.json")):
+        stamp = json_file.stem[len("mvno_news_"):]
+        try:
+            day = datetime.strptime(stamp, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+        by_day.setdefault(day, []).append(json_file)
+    return by_day
+
+
+def compact_day(day, snapshot_files, dry_run=False):
+    """하루치 스냅샷/아카이브 파트를 일별 아카이브 하나로 병합하고 원본 삭제"""
+    directory = partition_dir(day)
+    part_name = f"daily-{day.replace('-', '')}"
+    parts = partition_parts(directory) if directory.exists() else []
+
+    if not snapshot_files and parts in ([], [f"{part_name}.jsonl"], [f"{part_name}.parquet"]):
+        return 0
+
+    records = read_partition(directory) if parts else []
+    archived_runs = {record['run_id'] for record in records}
+    fetch_status = {}
+
+    for json_file in snapshot_files:
+        run_id = json_file.stem[len("mvno_news_"):]
+        if run_id in archived_runs:
+            continue
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            print(f"  skip unreadable snapshot: {json_file}")
+            continue
+        collected_at = KST.localize(datetime.strptime(run_id, "%Y%m%d_%H%M%S"))
+        records.extend(flatten_run(run_id, collected_at, data.get('search_hours', 3), data.get('news_by_keyword', {})))
+        if data.get('fetch_status'):
+            fetch_status[run_id] = data['fetch_status']
+
+    records.sort(key=lambda record: record['run_id'])
+    print(f"  {day}: {len(snapshot_files)} snapshots + {len(parts)} parts → {len(records)} records")
+
+    if dry_run:
+        return len(records)
+
+    rewrite_partition(directory, part_name, records, fetch_status=fetch_status)
+    for json_file in snapshot_files:
+        json_file.unlink()
+    return len(records)
+
+
+def compact_history(now, dry_run=False):
+    """UNCOMPACTED_DAYS 이전 날짜를 일별 아카이브로 병합"""
+    cutoff = (now - timedelta(days=max(UNCOMPACTED_DAYS - 1, 0))).strftime("%Y-%m-%d")
+    snapshots = snapshot_files_by_day()
+    days = {day for day in snapshots if day < cutoff}
+    days |= {directory.name[len("date="):] for directory in list_partitions(end_date=cutoff)}
+
+    compacted = 0
+    for day in sorted(days):
+        if day >= cutoff:
+            continue
+        compacted += compact_day(day, snapshots.get(day, []), dry_run)
+    return compacted
+
+
+def remove_old_files(paths, label, dry_run=False):
+    removed = 0
+    for path in paths:
+        print(f"  remove {label}: {path}")
+        if not dry_run:
+            if path.is_dir():
+                for child in path.iterdir():
+                    child.unlink()
+                path.rmdir()
+            else:
+                path.unlink()
+        removed += 1
+    return removed
+
+
+def file_day(path, prefix):
+    """파일명(prefix + YYYYMMDD...)의 날짜 (YYYY-MM-DD, 형식이 다르면 None)"""
+    stamp = path.name[len(prefix):len(prefix) + 8]
+    try:
+        return datetime.strptime(stamp, "%Y%m%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def profile_day(path):
+    """프로파일 결과 파일명(profile_<스크립트>_YYYYMMDD_HHMMSS.*)의 날짜 (형식이 다르면 None)"""
+    match = re.search(r'_(\d{8})_\d{6}\.', path.name)
+    return datetime.strptime(match.group(1), "%Y%m%d").strftime("%Y-%m-%d") if match else None
+
+
+def apply_retention(now, dry_run=False):
+    """보존 기간이 지난 파일과 저장소 기록 삭제 (보존 기간 0은 무기한 보관)"""
+
+    def cutoff(days):
+        return (now - timedelta(days=days)).strftime("%Y-%m-%d") if days else None
+
+    def older(paths, prefix, limit):
+        return [path for path in paths if limit and (file_day(path, prefix) or limit) < limit]
+
+    removed = 0
+    reports = Path(REPORTS_DIR)
+    data = Path(DATA_DIR)
+
+    report_cutoff = cutoff(REPORT_RETENTION_DAYS)
+    removed += remove_old_files(older(sorted(reports.glob("mvno_news_*")), "mvno_news_", report_cutoff), "report", dry_run)
+
+    # 프로파일 결과(run_profiler.py)도 실시간 리포트와 같은 기간 보관
+    profiles = [
+        path for path in sorted(reports.glob("profile_*"))
+        if report_cutoff and (profile_day(path) or report_cutoff) < report_cutoff
+    ]
+    removed += remove_old_files(profiles, "profile", dry_run)
+
+    daily_cutoff = cutoff(DAILY_RETENTION_DAYS)
+    daily_files = sorted(reports.glob("mvno_daily_*")) + sorted(data.glob("mvno_daily_*.json"))
+    removed += remove_old_files(older(daily_files, "mvno_daily_", daily_cutoff), "daily", dry_run)
+
+    archive_cutoff = cutoff(ARCHIVE_RETENTION_DAYS)
+    if archive_cutoff:
+        partitions = [p for p in list_partitions(archive_dir=ARCHIVE_DIR) if p.name[len("date="):] < archive_cutoff]
+        removed += remove_old_files(partitions, "archive", dry_run)
+        snapshots = older(sorted(data.glob("mvno_news_*.json")), "mvno_news_", archive_cutoff)
+        removed += remove_old_files(snapshots, "snapshot", dry_run)
+        if not dry_run and Path(STORE_PATH).exists():
+            store = ArticleStore(STORE_PATH)
+            pruned = store.prune(archive_cutoff)
+            store.close()
+            print(f"  pruned {pruned} store rows collected before {archive_cutoff}")
+
+    return removed
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    now = get_kst_now()
+
+    # 보존 기간이 지난 날짜는 병합하지 않도록 정리를 먼저 실행
+    print(
+        f"Applying retention (reports {REPORT_RETENTION_DAYS}d, daily {DAILY_RETENTION_DAYS}d, "
+        f"archive {ARCHIVE_RETENTION_DAYS}d){' [dry run]' if dry_run else ''}..."
+    )
+    removed = apply_retention(now, dry_run)
+
+    print(f"Compacting history (keep last {UNCOMPACTED_DAYS} days as snapshots)...")
+    compacted = compact_history(now, dry_run)
+
+    print(f"✅ Compacted {compacted} records, removed {removed} files/partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 # MVNO 뉴스 수집 설정 (GitHub Actions 최적화)
 
+import os
+
 # 검색 키워드 목록 (우선순위 순서)
 # 앞쪽 키워드가 우선순위가 높으며, 중복 기사 발견 시 앞쪽 키워드로 분류됨
 KEYWORDS = [
@@ -15,11 +17,47 @@ KEYWORDS = [
     "스카이라이프"
 ]
 
+# 외부 키워드 파일 - KEYWORDS_FILE 환경 변수로 지정하면 위 목록 대신 사용
+# 한 줄에 키워드 하나, 파일 순서가 우선순위, 빈 줄과 '#'으로 시작하는 줄은 무시 (중복은 앞쪽만 유지)
+KEYWORDS_FILE = os.environ.get('KEYWORDS_FILE', '')
+
+def load_keywords(path):
+    """키워드 파일 읽기 (우선순위 순서)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    keywords = list(dict.fromkeys(line for line in lines if line and not line.startswith('#')))
+    if not keywords:
+        raise ValueError(f"no keywords in {path}")
+    return keywords
+
+if KEYWORDS_FILE:
+    KEYWORDS = load_keywords(KEYWORDS_FILE)
+
 # 키워드당 수집할 뉴스 개수
 # 일반 수집: 10개 권장
-# 일일 요약: 스크립트에서 50개로 자동 설정
+# 일일 요약: 개수 제한 없이 전일 기사를 페이지 단위로 모두 수집
 NEWS_COUNT = 10
 
+# 키워드 검색 동시 실행 수 - 워크플로우에서 MAX_WORKERS로 설정 가능
+# 1이면 기존처럼 순차 실행
+MAX_WORKERS = 4
+
+# 일일 요약 데이터 출처 - 워크플로우에서 DAILY_SOURCE로 설정 가능
+# - "api": 전일 기사를 키워드별로 다시 검색 (기본값)
+# - "snapshots": naver_news.py가 3시간마다 저장한 mvno_news_*.json의 그룹을 집계하고,
+#   스냅샷이 커버하지 못한 시간대만 키워드별로 API 검색 (API 호출 최소화)
+#   스냅샷은 워터마크/기간 경계까지 빠짐없이 검색한 키워드의 구간만 커버한 것으로 봄 (NEWS_COUNT에서 끊긴 구간은 다시 검색)
+DAILY_SOURCE = "api"
+
+# 네이버 API 호출 제한
+# - 초당 요청 수(토큰 버킷)와 순간 최대 요청 수
+# - 일일 호출 한도 (네이버 검색 API 기본 25,000회, 두 스크립트 합산, 실행 간 유지)
+# - 429/5xx 응답 재시도 횟수 (지수 백오프 + 지터)
+NAVER_RATE_PER_SEC = 10
+NAVER_BURST = 10
+NAVER_DAILY_QUOTA = 25000
+NAVER_MAX_RETRIES = 4
+
 # 주의: 아래 설정들은 워크플로우 파일의 환경 변수로 덮어쓰기됩니다.
 # 워크플로우에서 설정하지 않은 경우에만 아래 기본값이 사용됩니다.
 
@@ -33,6 +71,110 @@ NEWS_COUNT = 10
 # 권장값: 0.60 (SKT 골드번호 같은 유사 기사를 잘 묶음)
 SIMILARITY_THRESHOLD = 0.60
 
+# 유사도 계산 방식 - 워크플로우에서 SIMILARITY_BACKEND로 설정 가능
+# - "sequence": 제목 n-gram 후보 + SequenceMatcher 검증 (기본값, 기존 결과와 동일)
+# - "matrix": 문자 2/3-gram 벡터 행렬 연산 (Dice 계수, NumPy 필요)
+# SIMILARITY_COMPARE=1 로 실행하면 두 방식의 그룹화 차이를 로그로 출력
+SIMILARITY_BACKEND = "sequence"
+
+# 유사 기사 그룹화 범위 - 워크플로우에서 GROUPING_SCOPE로 설정 가능
+# - "keyword": 중복 제거 후 키워드별로 따로 그룹화 (기본값)
+# - "global": 전체 기사를 한 번에 클러스터링하고, 각 그룹을 가장 앞쪽 키워드에 배정
+#   (같은 기사가 "알뜰폰"/"헬로모바일"에 나뉘어 보고되지 않음)
+GROUPING_SCOPE = "keyword"
+
 # 데이터 저장 디렉토리
 DATA_DIR = "mvno_news"
 REPORTS_DIR = "news_reports"
+
+# 수집 기사 저장소 (링크 중복 체크용 SQLite, 커밋하지 않음 - 워크플로우는 actions/cache로 유지, 없으면 아카이브에서 다시 만듦)
+STORE_PATH = "mvno_news/article_store.db"
+
+# 재게재 기사 억제 기간(일) - 워크플로우에서 REPEAT_WINDOW_DAYS로 설정 가능
+# 최근 N일 내 수집한 기사와 제목 유사도가 SIMILARITY_THRESHOLD 이상이면 링크가 달라도 새 기사로 보고하지 않음
+# 0이면 끔
+REPEAT_WINDOW_DAYS = 3
+
+# 기사 아카이브 (날짜별 파티션, 기사 1건 = 레코드 1개) - ARCHIVE_FORMAT으로 설정 가능
+# - "jsonl": 줄 단위 JSON + 파티션별 색인 (기본값, 추가 의존성 없음)
+# - "parquet": 열 단위 Parquet (pyarrow 필요)
+ARCHIVE_DIR = "mvno_news/archive"
+ARCHIVE_FORMAT = "jsonl"
+
+# 실행별 JSON(mvno_news_YYYYMMDD_HHMMSS.json) 저장 여부 - EXPORT_RUN_JSON=0 으로 끌 수 있음
+# 끄면 아카이브만 저장되며, 일일 요약의 스냅샷 집계도 아카이브에서 읽음
+EXPORT_RUN_JSON = True
+
+# 스트리밍 알림 - 워크플로우에서 STREAM_ALERTS=1로 설정 가능
+# 키워드 검색이 끝나는 대로 키워드 필터 → 수집 여부 → 재게재/유사 제목 확인을 거쳐
+# 새 이야기(유사 기사 그룹의 첫 기사)마다 바로 텔레그램 알림 (파일 저장과 요약 알림은 기존처럼 마지막에)
+# STREAM_ALERT_LIMIT: 실행당 최대 알림 수 (첫 실행 등 새 기사가 많을 때 알림 폭주 방지)
+STREAM_ALERTS = False
+STREAM_ALERT_LIMIT = 20
+
+# 데몬 모드 (python naver_news.py --daemon) - DAEMON_INTERVAL_MIN으로 설정 가능
+# 프로세스를 유지하며 주기적으로 수집 (커넥션 풀/저장소 색인/키워드 매처 재사용)
+# 체크포인트에 마지막 실행 시각을 저장해 재시작 시 이어서 실행
+DAEMON_INTERVAL_MIN = 30
+DAEMON_STATE_PATH = "mvno_news/daemon_state.json"
+
+# 실행 계측 내보내기 - 워크플로우에서 METRICS_EXPORT로 설정 가능 (쉼표 구분)
+# - "prometheus": METRICS_DIR/<스크립트>.prom (node_exporter textfile collector 형식, 매 실행 덮어씀)
+# - "jsonl": METRICS_DIR/<스크립트>_metrics.jsonl (실행마다 한 줄 추가)
+# 빈 값이면 내보내지 않음 (단계별 시간/카운터는 항상 실행 JSON의 statistics.metrics에 포함)
+METRICS_EXPORT = ""
+METRICS_DIR = "mvno_news/metrics"
+
+# API 서버 주소 - NAVER_API_BASE / TELEGRAM_API_BASE 환경 변수로 설정 가능
+# 로컬 대역 서버(benchmarks/standin_server.py)로 네트워크 없이 전체 실행을 시험할 때 사용
+NAVER_API_BASE = "https://openapi.naver.com"
+TELEGRAM_API_BASE = "https://api.telegram.org"
+
+# 기사 본문 수집 (article_body.py) - 워크플로우에서 ENRICH_BODIES=1로 설정 가능
+# originallink 페이지를 받아 본문을 추출하고 키워드 확인에 사용 (요약에 키워드가 없어도 본문에 있으면 수집)
+# 본문은 BODY_CACHE_DIR에 URL별로 캐시하고, BODY_FRESH_HOURS가 지나면 ETag/Last-Modified 조건부 요청으로 재검증
+# 본문은 키워드 확인에만 쓰이고 JSON/아카이브/리포트에는 저장하지 않음
+ENRICH_BODIES = False
+BODY_CACHE_DIR = "mvno_news/body_cache"
+BODY_FETCH_WORKERS = 8          # 전체 동시 요청 수
+BODY_PER_HOST = 2               # 언론사(호스트)별 동시 연결 수
+BODY_TIMEOUT_SEC = 5            # 연결/읽기 타임아웃
+BODY_MAX_BYTES = 2_000_000      # 이보다 큰 페이지는 받지 않음
+BODY_MAX_CHARS = 5000           # 추출 본문 최대 길이
+BODY_FRESH_HOURS = 6            # 이 시간 안에 확인한 본문은 요청 없이 캐시 사용
+
+# 텔레그램 알림 전송 (telegram_notifier.py) - 환경 변수로 설정 가능
+# 메시지는 보관함 파일에 먼저 기록되고 백그라운드 스레드가 전송 (수집 단계는 전송을 기다리지 않음)
+# - 밀린 메시지는 4096자 이내로 합쳐 보내고, 429/5xx/연결 오류는 백오프 후 재시도
+# - 보내지 못한 메시지는 보관함에 남아 다음 실행에서 이어서 전송 (보관 기간이 지나면 버림)
+# - TELEGRAM_FLUSH_TIMEOUT_SEC: 실행 종료 전 남은 메시지 전송을 기다리는 최대 시간
+TELEGRAM_OUTBOX_PATH = "mvno_news/telegram_outbox.json"
+TELEGRAM_RATE_PER_SEC = 1
+TELEGRAM_MAX_RETRIES = 4
+TELEGRAM_FLUSH_TIMEOUT_SEC = 30
+TELEGRAM_OUTBOX_MAX_AGE_HOURS = 24
+
+# 네이버 검색 API 응답 캐시 (response_cache.py) - NAVER_CACHE_MODE / NAVER_CACHE_TTL_MIN으로 설정 가능
+# (query, display, start, sort)별 응답을 저장해 재실행 시 API 호출 없이 재사용 (커밋하지 않음, 워크플로우는 actions/cache로 유지)
+# - "on": TTL 안의 응답은 캐시 사용 (기본값), "refresh": 항상 API 호출 후 저장
+# - "offline": 캐시만 사용 (네트워크 없이 그룹화/리포트 변경 확인), "off": 사용 안 함
+NAVER_CACHE_MODE = "on"
+NAVER_CACHE_TTL_MIN = 60
+RESPONSE_CACHE_DIR = "mvno_news/response_cache"
+RESPONSE_CACHE_KEEP_DAYS = 3    # 이보다 오래된 캐시 파일은 삭제 (offline 재현용으로 보관하는 기간)
+
+# 샤드 실행 (shard_runner.py, naver_news.py --shard i/N) - 키워드가 많을 때 여러 프로세스/CI 작업으로 나눠 검색
+# 샤드별 부분 결과를 SHARD_DIR/<run_id>/에 저장하고, 병합 단계(--merge)에서 단일 실행과 같은 순서로 중복 제거/그룹화/저장
+SHARD_DIR = "mvno_news/shards"
+
+# 네이버 API 일일 호출 횟수 기록
+QUOTA_PATH = "mvno_news/api_quota.json"
+
+# 히스토리 압축 및 보존 기간 (compact_history.py, 일일 요약 워크플로우에서 실행) - 환경 변수로 설정 가능
+# - UNCOMPACTED_DAYS: 최근 N일(오늘 포함)의 실행별 JSON은 그대로 둠 (일일 요약 스냅샷 모드용)
+#   그 이전 날짜는 archive/date=YYYY-MM-DD/daily-YYYYMMDD.jsonl 하나로 병합하고 원본 JSON 삭제
+# - *_RETENTION_DAYS: 보존 기간(일), 0이면 무기한 보관
+UNCOMPACTED_DAYS = 2
+REPORT_RETENTION_DAYS = 7      # news_reports/mvno_news_* (실시간 리포트), news_reports/profile_* (프로파일 결과)
+DAILY_RETENTION_DAYS = 30      # mvno_daily_* (일일 요약 리포트/JSON)
+ARCHIVE_RETENTION_DAYS = 30    # 아카이브 파티션 + 저장소 기사 기록
@@ -0,0 +1,90 @@
+# 다중 키워드 매처 (Aho-Corasick)
+# config.KEYWORDS로 한 번만 오토마톤을 만들고, 기사 텍스트를 한 번 훑어 포함된 키워드를 우선순위 순서로 반환한다.
+
+from collections import deque
+from functools import lru_cache
+
+from config import KEYWORDS
+from news_similarity import clean_title
+
+
+class KeywordMatcher:
+    """대소문자 무시 다중 키워드 매처"""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [set()]
+
+        for rank, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword.lower():
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append(set())
+                    self.transitions[state][char] = next_state
+                state = next_state
+            self.outputs[state].add(rank)
+
+        # 실패 링크 (BFS)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.outputs[next_state] |= self.outputs[self.fail[next_state]]
+
+        self._match_text = lru_cache(maxsize=8192)(self._scan_ranks)
+
+    def _scan_ranks(self, text):
+        """소문자 텍스트를 한 번 훑어 포함된 키워드 순위를 오름차순 튜플로 반환"""
+        found = set()
+        state = 0
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+
+        for char in text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found |= outputs[state]
+
+        return tuple(sorted(found))
+
+    def match_text(self, text):
+        """텍스트에 포함된 키워드 목록 (우선순위 순서)"""
+        return [self.keywords[rank] for rank in self._match_text(text.lower())]
+
+    def match(self, news):
+        """기사 제목/본문 요약(본문을 수집했으면 본문 포함)에 포함된 키워드 목록 (우선순위 순서)
+
+        필드 사이에 줄바꿈을 넣어 두 필드에 걸친 키워드는 매칭되지 않도록 한다.
+        """
+        text = clean_title(news.get('title', '')) + "\n" + clean_title(news.get('description', ''))
+        if news.get('body'):
+            text += "\n" + news['body']
+        return self.match_text(text)
+
+
+_matchers = {}
+
+
+def get_keyword_matcher(keywords=None):
+    """키워드 목록별로 한 번만 생성한 매처 반환 (기본값: config.KEYWORDS)"""
+    key = tuple(KEYWORDS if keywords is None else keywords)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = KeywordMatcher(key)
+    return matcher
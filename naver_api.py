@@ -0,0 +1,180 @@
+# 네이버 뉴스 검색 API 공통 모듈 (naver_news.py / naver_news_daily_summary.py 공용)
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    MAX_WORKERS, NAVER_RATE_PER_SEC, NAVER_BURST, NAVER_DAILY_QUOTA, NAVER_MAX_RETRIES, QUOTA_PATH,
+    NAVER_API_BASE as DEFAULT_NAVER_API_BASE, NAVER_CACHE_MODE, NAVER_CACHE_TTL_MIN,
+    RESPONSE_CACHE_DIR, RESPONSE_CACHE_KEEP_DAYS
+)
+from request_scheduler import create_scheduler
+from response_cache import ResponseCache
+
+NAVER_CLIENT_ID = os.environ.get('NAVER_CLIENT_ID')
+NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET')
+
+NAVER_API_BASE = os.environ.get('NAVER_API_BASE', DEFAULT_NAVER_API_BASE).rstrip("/")
+NAVER_NEWS_URL = f"{NAVER_API_BASE}/v1/search/news.json"
+
+# 네이버 검색 API 제한: display 최대 100, start 최대 1000
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+# 동시 요청 수 (환경 변수로 덮어쓰기 가능)
+FETCH_WORKERS = int(os.environ.get('MAX_WORKERS', str(MAX_WORKERS)))
+
+
+
+class NaverAPIError(Exception):
+    """검색 API 오류 응답 (페이지 탐색이 중간에 끊김 → 호출 측은 불완전한 결과로 처리)"""
+
+
+_session = None
+_session_lock = threading.Lock()
+_scheduler = None
+_response_cache = None
+
+
+def get_session():
+    """keep-alive 커넥션 풀을 공유하는 requests 세션 반환"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(FETCH_WORKERS, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def get_scheduler():
+    """모든 네이버 호출이 거치는 요청 스케줄러 반환 (속도 제한/재시도/일일 한도)"""
+    global _scheduler
+    with _session_lock:
+        if _scheduler is None:
+            _scheduler = create_scheduler(
+                get_session,
+                rate=float(os.environ.get('NAVER_RATE_PER_SEC', NAVER_RATE_PER_SEC)),
+                burst=int(os.environ.get('NAVER_BURST', NAVER_BURST)),
+                daily_limit=int(os.environ.get('NAVER_DAILY_QUOTA', NAVER_DAILY_QUOTA)),
+                quota_path=QUOTA_PATH,
+                max_retries=int(os.environ.get('NAVER_MAX_RETRIES', NAVER_MAX_RETRIES))
+            )
+    return _scheduler
+
+
+def get_response_cache():
+    """검색 응답 디스크 캐시 반환 (NAVER_CACHE_MODE / NAVER_CACHE_TTL_MIN 환경 변수로 설정)"""
+    global _response_cache
+    with _session_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                RESPONSE_CACHE_DIR,
+                ttl_min=float(os.environ.get('NAVER_CACHE_TTL_MIN', NAVER_CACHE_TTL_MIN)),
+                mode=os.environ.get('NAVER_CACHE_MODE', NAVER_CACHE_MODE),
+                keep_days=RESPONSE_CACHE_KEEP_DAYS
+            )
+    return _response_cache
+
+
+def print_request_stats():
+    """네이버 API 호출 통계 출력 (응답 캐시 통계 포함)"""
+    stats = get_scheduler().summary()
+    print(
+        f"Naver API: {stats['requests']} requests, {stats['retried']} retried, "
+        f"{stats['failed']} failed, {stats['throttled']} throttled ({stats['throttle_wait_sec']}s), "
+        f"quota {stats['quota_used_today']} used / {stats['quota_remaining']} remaining today"
+    )
+    cache = get_response_cache()
+    if cache.enabled:
+        cache_stats = cache.summary()
+        print(
+            f"Response cache ({cache.mode}): {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+            f"{cache_stats['stored']} stored" + (f", {cache_stats['offline_misses']} offline misses" if cache.mode == "offline" else "")
+        )
+        stats.update({f"cache_{name}": value for name, value in cache_stats.items()})
+    return stats
+
+
+def request_news(query, display, start=1, sort="date"):
+    """네이버 뉴스 검색 API 1회 호출 (응답 캐시 → 스케줄러 경유, 응답 객체 반환)"""
+    cache = get_response_cache()
+    cached = cache.get(query, display, start, sort)
+    if cached is not None:
+        return cached
+    
+    headers = {
+        "X-Naver-Client-Id": NAVER_CLIENT_ID,
+        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
+    }
+    params = {
+        "query": query,
+        "display": display,
+        "start": start,
+        "sort": sort
+    }
+    response = get_scheduler().request("GET", NAVER_NEWS_URL, headers=headers, params=params, timeout=10)
+    cache.put(query, display, start, sort, response)
+    return response
+
+
+def iter_news_pages(query, display=MAX_DISPLAY, sort="date"):
+    """start 오프셋을 늘려가며 검색 결과를 페이지 단위로 반환 (generator)
+
+    호출 측에서 break 하면 이후 페이지는 요청하지 않는다.
+    빈 페이지나 API 오프셋 한도에 도달하면 종료하고, 오류 응답이면 NaverAPIError를 발생시킨다.
+    """
+    display = min(display, MAX_DISPLAY)
+    start = 1
+
+    while start <= MAX_START:
+        response = request_news(query, display, start=start, sort=sort)
+        if response.status_code != 200:
+            raise NaverAPIError(f"Error {response.status_code}: {query} (start={start})")
+
+        items = response.json().get('items', [])
+        if not items:
+            return
+
+        yield items
+
+        if len(items) < display:
+            return
+        start += display
+
+
+def search_keywords(search_fn, keywords, *args, workers=None):
+    """키워드별 검색을 병렬 실행하고 keywords 순서대로 결과 반환
+
+    search_fn(keyword, *args) 형태로 호출하며, 결과 dict는 항상 keywords 순서를 따르므로
+    remove_duplicates의 우선순위 처리가 실행 순서와 무관하게 결정적으로 유지된다.
+    """
+    workers = FETCH_WORKERS if workers is None else workers
+
+    if workers <= 1 or len(keywords) <= 1:
+        return {keyword: search_fn(keyword, *args) for keyword in keywords}
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(keywords))) as executor:
+        futures = {keyword: executor.submit(search_fn, keyword, *args) for keyword in keywords}
+        return {keyword: futures[keyword].result() for keyword in keywords}
+
+
+def iter_search_keywords(search_fn, keywords, *args, workers=None):
+    """키워드별 검색을 병렬 실행하고 끝나는 순서대로 (keyword, 결과) 반환 (generator, 스트리밍 모드)"""
+    workers = FETCH_WORKERS if workers is None else workers
+
+    if workers <= 1 or len(keywords) <= 1:
+        for keyword in keywords:
+            yield keyword, search_fn(keyword, *args)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(keywords))) as executor:
+        futures = {executor.submit(search_fn, keyword, *args): keyword for keyword in keywords}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
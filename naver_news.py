@@ -1,20 +1,31 @@
-import requests
+import argparse
+import html
 from datetime import datetime, timedelta
 import os
+import signal
+import threading
+import time
 from collections import defaultdict
 import re
 import json
-from difflib import SequenceMatcher
 import pytz
-import pandas as pd
 from pathlib import Path
-from config import KEYWORDS, NEWS_COUNT, DATA_DIR, REPORTS_DIR
-
-# 환경 변수
-TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
-TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID_NEWS')
-NAVER_CLIENT_ID = os.environ.get('NAVER_CLIENT_ID')
-NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET')
+from config import KEYWORDS, NEWS_COUNT, DATA_DIR, REPORTS_DIR, GROUPING_SCOPE as DEFAULT_GROUPING_SCOPE
+from config import EXPORT_RUN_JSON as DEFAULT_EXPORT_RUN_JSON, REPEAT_WINDOW_DAYS as DEFAULT_REPEAT_WINDOW_DAYS
+from config import DAEMON_INTERVAL_MIN as DEFAULT_DAEMON_INTERVAL_MIN, DAEMON_STATE_PATH
+from config import ENRICH_BODIES as DEFAULT_ENRICH_BODIES
+from config import STREAM_ALERTS as DEFAULT_STREAM_ALERTS, STREAM_ALERT_LIMIT as DEFAULT_STREAM_ALERT_LIMIT
+from article_store import open_store
+from article_body import drop_bodies, get_body_fetcher
+from keyword_matcher import get_keyword_matcher
+from run_metrics import RunMetrics
+from run_profiler import run_main
+from news_similarity import StoryTracker, comparison_stats, group_news, cluster_news_globally, print_backend_comparison, SIMILARITY_BACKEND
+from report_writer import write_reports
+from news_archive import write_run
+from shard_runner import load_shards, parse_shard, remove_shards, shard_keywords, write_shard
+from telegram_notifier import flush_notifications, get_notifier, send_message
+from naver_api import iter_news_pages, iter_search_keywords, search_keywords, print_request_stats, get_response_cache, get_scheduler, FETCH_WORKERS
 
 # 검색 기간 설정 (환경 변수, 기본값 3시간)
 SEARCH_HOURS = int(os.environ.get('SEARCH_HOURS', '3'))
@@ -22,6 +33,35 @@ SEARCH_HOURS = int(os.environ.get('SEARCH_HOURS', '3'))
 # 유사도 임계값
 SIMILARITY_THRESHOLD = float(os.environ.get('SIMILARITY_THRESHOLD', '0.60'))
 
+# 유사도 방식 비교 로그 (SIMILARITY_COMPARE=1)
+SIMILARITY_COMPARE = os.environ.get('SIMILARITY_COMPARE', '0') == '1'
+
+# 그룹화 범위 ("keyword": 키워드별, "global": 전체 기사 클러스터링 후 우선순위 키워드에 배정)
+GROUPING_SCOPE = os.environ.get('GROUPING_SCOPE', DEFAULT_GROUPING_SCOPE)
+
+# 실행별 JSON 저장 여부 (아카이브는 항상 저장)
+EXPORT_RUN_JSON = os.environ.get('EXPORT_RUN_JSON', '1' if DEFAULT_EXPORT_RUN_JSON else '0') == '1'
+
+# 재게재 기사 억제 기간(일, 0이면 끔)
+REPEAT_WINDOW_DAYS = int(os.environ.get('REPEAT_WINDOW_DAYS', DEFAULT_REPEAT_WINDOW_DAYS))
+
+# 기사 본문 수집 (originallink 본문으로 키워드 확인)
+ENRICH_BODIES = os.environ.get('ENRICH_BODIES', '1' if DEFAULT_ENRICH_BODIES else '0') == '1'
+
+# 스트리밍 알림 (새 이야기가 확인되는 즉시 텔레그램 알림, 실행당 최대 알림 수)
+STREAM_ALERTS = os.environ.get('STREAM_ALERTS', '1' if DEFAULT_STREAM_ALERTS else '0') == '1'
+STREAM_ALERT_LIMIT = int(os.environ.get('STREAM_ALERT_LIMIT', DEFAULT_STREAM_ALERT_LIMIT))
+
+# 데몬 모드 수집 주기(분)와 최대 반복 횟수(0이면 무제한)
+DAEMON_INTERVAL_MIN = float(os.environ.get('DAEMON_INTERVAL_MIN', DEFAULT_DAEMON_INTERVAL_MIN))
+DAEMON_MAX_CYCLES = int(os.environ.get('DAEMON_MAX_CYCLES', '0'))
+
+# 검색 구간을 빠짐없이 확인한 종료 사유 - 이 경우에만 워터마크를 옮기고, 스냅샷에 구간을 기록해
+# 일일 요약(DAILY_SOURCE=snapshots)이 이 구간은 다시 검색하지 않음
+# "count"(NEWS_COUNT개에서 끊겨 이전 기사가 남아 있을 수 있음), "end"(결과 끝/오프셋 한도), "error"(오류 응답/예외)는
+# 이전 워터마크를 유지해 다음 실행에서 아직 받지 못한 기사까지 다시 검색
+COVERED_STOPS = ("watermark", "period")
+
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
@@ -64,138 +104,265 @@ def normalize_title(title):
     title = re.sub(r'\s+', ' ', title)
     return title.lower().strip()
 
-def calculate_similarity(title1, title2):
-    """두 제목 간의 유사도 계산 (0.0~1.0)"""
-    norm1 = normalize_title(title1)
-    norm2 = normalize_title(title2)
-    return SequenceMatcher(None, norm1, norm2).ratio()
-
 def group_similar_news(news_list):
-    """유사한 제목의 뉴스를 그룹화"""
-    if not news_list:
-        return []
-    
-    groups = []
-    used = set()
+    """유사한 제목의 뉴스를 그룹화 (n-gram 후보 추출 후 SequenceMatcher 검증)"""
+    return group_news(news_list, SIMILARITY_THRESHOLD)
+
+def group_all_news(deduplicated_news):
+    """키워드별 뉴스 그룹화 (GROUPING_SCOPE=global이면 전체 기사를 한 번에 클러스터링)"""
+    if GROUPING_SCOPE == "global":
+        return cluster_news_globally(deduplicated_news, KEYWORDS, SIMILARITY_THRESHOLD)
     
-    for i, news in enumerate(news_list):
-        if i in used:
-            continue
-        
-        group = [news]
-        used.add(i)
-        
-        for j, other_news in enumerate(news_list):
-            if j in used:
-                continue
-            
-            similarity = calculate_similarity(news['title'], other_news['title'])
-            
-            if similarity >= SIMILARITY_THRESHOLD:
-                group.append(other_news)
-                used.add(j)
+    grouped_news_by_keyword = {}
+    for keyword, news_list in deduplicated_news.items():
+        grouped_news_by_keyword[keyword] = group_similar_news(news_list)
         
-        groups.append(group)
+        if SIMILARITY_COMPARE:
+            print_backend_comparison(keyword, news_list, SIMILARITY_THRESHOLD)
     
-    return groups
-
-def select_representative_title(group):
-    """그룹에서 대표 제목 선택 (가장 정보가 풍부한 제목)"""
-    return max(group, key=lambda x: len(clean_title(x['title'])))
+    return grouped_news_by_keyword
 
 def keyword_exists_in_news(news, keyword):
-    """뉴스에 키워드가 실제로 포함되어 있는지 확인"""
-    title = clean_title(news.get('title', ''))
-    description = clean_title(news.get('description', ''))
-    
-    keyword_lower = keyword.lower()
-    title_lower = title.lower()
-    description_lower = description.lower()
-    
-    return keyword_lower in title_lower or keyword_lower in description_lower
-
-def search_naver_news(keyword):
-    """네이버 뉴스 검색 API + 키워드 필터링 + 기간 필터링"""
-    url = "https://openapi.naver.com/v1/search/news.json"
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-    }
-    params = {
-        "query": keyword,
-        "display": NEWS_COUNT * 3,
-        "sort": "date"
-    }
+    """뉴스에 키워드가 실제로 포함되어 있는지 확인 (KEYWORDS 매처로 한 번에 검사)"""
+    matcher = get_keyword_matcher()
+    if keyword in matcher.keywords:
+        return keyword in matcher.match(news)
+    
+    text = clean_title(news.get('title', '')) + "\n" + clean_title(news.get('description', ''))
+    if news.get('body'):
+        text += "\n" + news['body']
+    return keyword.lower() in text.lower()
+
+def is_at_watermark(item, watermark, watermark_dt):
+    """이전 실행에서 이미 처리한 지점(워터마크)에 도달했는지 확인"""
+    if not watermark:
+        return False
+    if item.get('link') == watermark['link']:
+        return True
+    pub_dt = parse_pub_date(item.get('pubDate', ''))
+    return bool(pub_dt and watermark_dt and pub_dt < watermark_dt)
+
+def search_naver_news(keyword, watermarks=None, fetch_status=None):
+    """네이버 뉴스 검색 API + 키워드 필터링 + 기간 필터링
+
+    최신순으로 페이지를 넘기다가 워터마크(이전 실행의 최신 기사), 검색 기간 경계,
+    NEWS_COUNT개 수집 중 하나에 도달하면 더 이상 요청하지 않는다.
+    ENRICH_BODIES이면 요약에 키워드가 없는 기사도 NEWS_COUNT개까지 후보로 두고 본문을 받아 다시 확인한다.
+    fetch_status: dict를 넘기면 키워드별 종료 사유를 {'stop': ...}로 기록 (워터마크 갱신 여부 판단),
+                  구간을 빠짐없이 확인했으면 확인한 발행 시각 범위 'from'/'to'(ISO)도 기록 (일일 요약 스냅샷 집계용)
+    """
+    watermark = (watermarks or {}).get(keyword)
+    watermark_dt = parse_pub_date(watermark['pubDate']) if watermark else None
+    searched_at = get_kst_now()
+    
+    fetched_count = 0
+    keyword_count = 0
+    collected = []
+    body_candidates = 0
+    stop_reason = "end"
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            all_items = response.json()['items']
-            
-            keyword_filtered = [
-                item for item in all_items 
-                if keyword_exists_in_news(item, keyword)
-            ]
-            
-            period_filtered = [
-                item for item in keyword_filtered
-                if is_within_search_period(item.get('pubDate', ''), SEARCH_HOURS)
-            ]
+        for items in iter_news_pages(keyword, NEWS_COUNT * 3):
+            fetched_count += len(items)
             
-            print(f"  {keyword}: {len(all_items)}개 수집 → 키워드 {len(keyword_filtered)}개 → 기간 {len(period_filtered)}개 (최근 {SEARCH_HOURS}시간)")
+            for item in items:
+                if is_at_watermark(item, watermark, watermark_dt):
+                    stop_reason = "watermark"
+                    break
+                if not is_within_search_period(item.get('pubDate', ''), SEARCH_HOURS):
+                    stop_reason = "period"
+                    break
+                if not keyword_exists_in_news(item, keyword):
+                    if ENRICH_BODIES and body_candidates < NEWS_COUNT:
+                        body_candidates += 1
+                        collected.append(item)
+                    continue
+                
+                keyword_count += 1
+                collected.append(item)
+                if keyword_count >= NEWS_COUNT:
+                    stop_reason = "count"
+                    break
             
-            return period_filtered[:NEWS_COUNT]
-        else:
-            print(f"Error {response.status_code}: {keyword}")
-            return []
+            if stop_reason != "end":
+                break
     except Exception as e:
         print(f"Exception for {keyword}: {e}")
-        return []
+        stop_reason = "error"
+    
+    if fetch_status is not None:
+        status = {'stop': stop_reason}
+        if stop_reason in COVERED_STOPS:
+            # 워터마크에서 멈췄으면 그 이전 구간은 워터마크를 남긴 실행의 기록으로 확인
+            covered_from = searched_at - timedelta(hours=SEARCH_HOURS)
+            if stop_reason == "watermark" and watermark_dt:
+                covered_from = max(covered_from, watermark_dt)
+            status['from'] = covered_from.isoformat()
+            status['to'] = searched_at.isoformat()
+        fetch_status[keyword] = status
+    
+    body_note = ""
+    if ENRICH_BODIES and collected:
+        # 본문을 받아 키워드 재확인 (요약에서 확인된 기사는 그대로 통과)
+        get_body_fetcher().enrich(collected)
+        verified = [item for item in collected if keyword_exists_in_news(item, keyword)]
+        body_note = f" (본문 확인 +{len(verified) - keyword_count})"
+        collected = verified[:NEWS_COUNT]
+    
+    print(f"  {keyword}: {fetched_count}개 수집 → 키워드 {keyword_count}개{body_note} → 신규 {len(collected)}개 (최근 {SEARCH_HOURS}시간, 종료: {stop_reason})")
+    
+    return collected
 
-def load_existing_news():
-    """기존 뉴스 데이터 로드 (중복 방지용)"""
-    data_path = Path(DATA_DIR)
-    existing_links = set()
-    
-    if data_path.exists():
-        for json_file in data_path.glob("mvno_news_*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for keyword_data in data.get('news_by_keyword', {}).values():
-                        for group in keyword_data:
-                            for news in group:
-                                existing_links.add(news['link'])
-            except:
-                continue
+def update_watermarks(store, all_news_by_keyword, watermarks, fetch_status):
+    """키워드별 가장 최신 수집 기사를 워터마크로 저장 (앞으로만 이동)
+
+    검색이 워터마크/기간 경계에 도달해 끝난 키워드만 옮긴다. 수집 개수 제한이나 오류로 중간에 끊긴 키워드의
+    워터마크를 옮기면 아직 받지 못한 이전 기사가 워터마크 뒤로 밀려 다시는 검색되지 않는다.
+    """
+    updated = {}
+    held = [
+        keyword for keyword in all_news_by_keyword
+        if fetch_status.get(keyword, {}).get('stop') not in COVERED_STOPS
+    ]
+    if held:
+        print(f"  Watermarks kept for incomplete searches: {', '.join(held)}")
+    
+    for keyword, news_list in all_news_by_keyword.items():
+        if keyword in held:
+            continue
+        dated = [(parse_pub_date(news.get('pubDate', '')), news) for news in news_list]
+        dated = [(pub_dt, news) for pub_dt, news in dated if pub_dt]
+        if not dated:
+            continue
+        
+        newest_dt, newest = max(dated, key=lambda x: x[0])
+        previous = watermarks.get(keyword)
+        previous_dt = parse_pub_date(previous['pubDate']) if previous else None
+        if previous_dt and newest_dt < previous_dt:
+            continue
+        
+        updated[keyword] = {'pubDate': newest['pubDate'], 'link': newest['link']}
     
-    return existing_links
+    store.set_watermarks(updated)
+    return updated
+
+def load_existing_news():
+    """기존 뉴스 저장소 열기 (중복 방지용)"""
+    return open_store()
+
+def iter_new_articles(news_items, store, repeats=None):
+    """키워드 필터 → 수집 여부 확인 → 재게재 확인을 거친 기사를 (분류 키워드, 기사)로 반환 (generator)
 
-def remove_duplicates(all_news_by_keyword, existing_links):
-    """중복 제거 - 키워드 순서대로 우선순위 적용 + 기존 뉴스 제외"""
-    seen_links = existing_links.copy()
+    news_items: (검색 키워드, 기사) 순서열, 먼저 들어온 기사가 같은 링크/제목 중 남음
+    repeats: 목록을 넘기면 최근 REPEAT_WINDOW_DAYS일 내 기사와 제목이 유사한 재게재 기사를
+             제외하고 (키워드, 기사, 이전 기사 링크)로 추가
+    """
+    seen_links = set()
     seen_titles = set()
-    deduplicated = defaultdict(list)
+    matcher = get_keyword_matcher()
+    repeat_since = (get_kst_now() - timedelta(days=REPEAT_WINDOW_DAYS)).strftime("%Y-%m-%d")
     
-    for keyword in KEYWORDS:
-        if keyword not in all_news_by_keyword:
+    for _, news in news_items:
+        # 모니터링 키워드가 하나도 없는 기사는 그룹화 전에 제외
+        matched_keywords = matcher.match(news)
+        if not matched_keywords:
             continue
-            
-        for news in all_news_by_keyword[keyword]:
-            link = news['link']
-            normalized_title = normalize_title(news['title'])
-            
-            if link in seen_links or normalized_title in seen_titles:
+        
+        link = news['link']
+        normalized_title = normalize_title(news['title'])
+        
+        if link in seen_links or normalized_title in seen_titles or store.has_link(link):
+            continue
+        
+        seen_links.add(link)
+        seen_titles.add(normalized_title)
+        
+        if repeats is not None and REPEAT_WINDOW_DAYS > 0:
+            original_link = store.find_repeat(news['title'], SIMILARITY_THRESHOLD, repeat_since)
+            if original_link:
+                repeats.append((matched_keywords[0], news, original_link))
                 continue
-            
-            seen_links.add(link)
-            seen_titles.add(normalized_title)
-            deduplicated[keyword].append(news)
+        
+        yield matched_keywords[0], news
+
+def remove_duplicates(all_news_by_keyword, store, repeats=None):
+    """중복 제거 - 기사에 포함된 키워드 중 가장 앞쪽 키워드로 분류 + 기존 뉴스 제외 (KEYWORDS 순서로 처리)"""
+    news_items = (
+        (keyword, news)
+        for keyword in KEYWORDS if keyword in all_news_by_keyword
+        for news in all_news_by_keyword[keyword]
+    )
+    deduplicated = defaultdict(list)
+    for keyword, news in iter_new_articles(news_items, store, repeats):
+        deduplicated[keyword].append(news)
+    
+    return {keyword: deduplicated[keyword] for keyword in KEYWORDS if keyword in deduplicated}
+
+def iter_new_stories(new_articles, tracker):
+    """새 기사 중 지금까지 나온 이야기와 유사하지 않은 첫 기사만 반환 (generator, 근접 중복 확인)"""
+    for keyword, news in new_articles:
+        scope = None if GROUPING_SCOPE == "global" else keyword
+        if tracker.add(scope, normalize_title(news['title'])):
+            yield keyword, news
+
+def stream_collect(store, watermarks, fetch_status, repeats, metrics):
+    """스트리밍 수집 - 키워드 검색이 끝나는 대로 필터/중복 확인을 거쳐 새 이야기마다 바로 알림
+
+    검색 결과는 KEYWORDS 순서로 내보낸다 (앞 순위 키워드 검색이 모두 끝날 때까지 보류). 그래서 같은 링크/제목 중
+    남는 기사와 재게재 판정이 일괄 모드(remove_duplicates)와 같다.
+    (all_news_by_keyword, deduplicated_news, 알림 수) 반환 - 앞의 두 값은 일괄 모드와 같은 형태(KEYWORDS 순서)이며
+    파일 저장과 그룹화는 기존처럼 마지막에 한 번 수행한다.
+    """
+    fetched = {}
+    collected = []
+    
+    def fetched_items():
+        released = 0
+        for keyword, news_list in iter_search_keywords(search_naver_news, KEYWORDS, watermarks, fetch_status):
+            fetched[keyword] = news_list
+            while released < len(KEYWORDS) and KEYWORDS[released] in fetched:
+                for news in fetched[KEYWORDS[released]]:
+                    yield KEYWORDS[released], news
+                released += 1
+    
+    def new_articles():
+        for keyword, news in iter_new_articles(fetched_items(), store, repeats):
+            collected.append((keyword, news))
+            yield keyword, news
+    
+    alerts = 0
+    latencies = []
+    for keyword, news in iter_new_stories(new_articles(), StoryTracker(SIMILARITY_THRESHOLD)):
+        metrics.count("stream_new_stories")
+        if alerts >= STREAM_ALERT_LIMIT:
+            continue
+        send_story_alert(keyword, news)
+        alerts += 1
+        pub_dt = parse_pub_date(news.get('pubDate', ''))
+        if pub_dt:
+            latencies.append((get_kst_now() - pub_dt).total_seconds())
+    
+    print(f"  Stream alerts: {alerts}개 전송 요청 (한도 {STREAM_ALERT_LIMIT}개)")
+    metrics.count("stream_alerts", alerts)
+    if latencies:
+        metrics.set_counters("alert_latency", {
+            'avg_sec': round(sum(latencies) / len(latencies), 1),
+            'max_sec': round(max(latencies), 1)
+        })
     
-    return deduplicated
+    deduplicated = defaultdict(list)
+    for keyword, news in collected:
+        deduplicated[keyword].append(news)
+    
+    all_news_by_keyword = {keyword: fetched[keyword] for keyword in KEYWORDS if keyword in fetched}
+    deduplicated_news = {keyword: deduplicated[keyword] for keyword in KEYWORDS if keyword in deduplicated}
+    return all_news_by_keyword, deduplicated_news, alerts
+
+def save_data(grouped_news_by_keyword, stats, store, fetch_status=None):
+    """데이터 저장 (JSON, Excel, Markdown)
 
-def save_data(grouped_news_by_keyword, stats):
-    """데이터 저장 (JSON, Excel, Markdown)"""
+    fetch_status: 키워드별 검색 종료 사유/확인 구간, None이면 확인 구간 기록 없음 (일일 요약은 스냅샷으로 보지 않음)
+    """
     now = get_kst_now()
     timestamp = now.strftime("%Y%m%d_%H%M%S")
     date_str = now.strftime("%Y-%m-%d %H:%M KST")
@@ -204,84 +371,50 @@ def save_data(grouped_news_by_keyword, stats):
     Path(DATA_DIR).mkdir(exist_ok=True)
     Path(REPORTS_DIR).mkdir(exist_ok=True)
     
-    # JSON 저장
-    json_path = f"{DATA_DIR}/mvno_news_{timestamp}.json"
-    json_data = {
+    json_path = f"{DATA_DIR}/mvno_news_{timestamp}.json" if EXPORT_RUN_JSON else None
+    excel_path = f"{REPORTS_DIR}/mvno_news_{timestamp}.xlsx"
+    md_path = f"{REPORTS_DIR}/mvno_news_{timestamp}.md"
+    
+    json_header = {
         "collection_time": date_str,
         "search_hours": SEARCH_HOURS,
         "similarity_threshold": SIMILARITY_THRESHOLD,
-        "statistics": stats,
-        "news_by_keyword": grouped_news_by_keyword
+        "fetch_status": fetch_status,
+        "statistics": stats
     }
-    
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✓ JSON 저장: {json_path}")
-    
-    # Excel 저장
-    excel_path = f"{REPORTS_DIR}/mvno_news_{timestamp}.xlsx"
-    excel_data = []
-    
-    for keyword in KEYWORDS:
-        groups = grouped_news_by_keyword.get(keyword, [])
-        for group in groups:
-            representative = select_representative_title(group)
-            excel_data.append({
-                "키워드": keyword,
-                "제목": clean_title(representative['title']),
-                "링크": representative['link'],
-                "발행일": representative['pubDate'],
-                "유사기사수": len(group) - 1,
-                "그룹크기": len(group)
-            })
-    
-    if excel_data:
-        df = pd.DataFrame(excel_data)
-        df.to_excel(excel_path, index=False, engine='openpyxl')
+    md_header = f"# MVNO 뉴스 모음\n\n"
+    md_header += f"**수집 시간**: {date_str}\n"
+    md_header += f"**검색 기간**: 최근 {SEARCH_HOURS}시간\n"
+    md_header += f"**총 뉴스**: {stats['total_news']}개\n\n"
+    md_header += "---\n\n"
+    
+    # JSON, Excel, Markdown을 한 번의 순회로 기록
+    excel_saved = write_reports(grouped_news_by_keyword, json_path, json_header, excel_path, md_path, md_header)
+    
+    if json_path:
+        print(f"✓ JSON 저장: {json_path}")
+    if excel_saved:
         print(f"✓ Excel 저장: {excel_path}")
+    print(f"✓ Markdown 저장: {md_path}")
     
-    # Markdown 저장
-    md_path = f"{REPORTS_DIR}/mvno_news_{timestamp}.md"
-    md_content = f"# MVNO 뉴스 모음\n\n"
-    md_content += f"**수집 시간**: {date_str}\n"
-    md_content += f"**검색 기간**: 최근 {SEARCH_HOURS}시간\n"
-    md_content += f"**총 뉴스**: {stats['total_news']}개\n\n"
-    md_content += "---\n\n"
-    
-    for keyword in KEYWORDS:
-        groups = grouped_news_by_keyword.get(keyword, [])
-        if groups:
-            total_in_keyword = sum(len(group) for group in groups)
-            md_content += f"## 🔍 {keyword} ({total_in_keyword}개)\n\n"
-            
-            for idx, group in enumerate(groups, 1):
-                representative = select_representative_title(group)
-                title = clean_title(representative['title'])
-                link = representative['link']
-                pub_date = representative['pubDate']
-                similar_count = len(group) - 1
-                
-                md_content += f"### {idx}. {title}\n"
-                if similar_count > 0:
-                    md_content += f"**유사 기사**: {similar_count}건\n"
-                md_content += f"**링크**: {link}\n"
-                md_content += f"**발행일**: {pub_date}\n\n"
-                
-                if similar_count > 0:
-                    md_content += "**유사 기사 목록**:\n"
-                    for similar_news in group[1:]:
-                        similar_title = clean_title(similar_news['title'])
-                        md_content += f"- {similar_title}\n"
-                        md_content += f"  - {similar_news['link']}\n"
-                    md_content += "\n"
+    # 아카이브 저장 (날짜 파티션, 기사 단위 레코드)
+    archive_path = str(write_run(timestamp, now, SEARCH_HOURS, grouped_news_by_keyword, fetch_status))
+    print(f"✓ Archive 저장: {archive_path}")
     
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+    # 기사 저장소 갱신 (다음 실행의 중복 체크용)
+    store.add_articles(grouped_news_by_keyword, date_str)
     
-    print(f"✓ Markdown 저장: {md_path}")
-    
-    return json_path, excel_path, md_path
+    return json_path, excel_path, md_path, archive_path
+
+def send_story_alert(keyword, news):
+    """새 이야기 즉시 알림 (스트리밍 모드, 보관함에 넣고 바로 반환)"""
+    pub_dt = parse_pub_date(news.get('pubDate', ''))
+    message = f"🆕 <b>[{html.escape(keyword)}]</b> {html.escape(clean_title(news['title']))}\n"
+    if pub_dt:
+        message += f"🕒 {pub_dt.strftime('%m-%d %H:%M')}\n"
+    message += html.escape(news.get('originallink') or news['link'])
+    
+    send_message(message)
 
 def send_telegram_summary(stats, file_paths):
     """텔레그램 요약 전송 (파일 경로만)"""
@@ -291,7 +424,12 @@ def send_telegram_summary(stats, file_paths):
     message = f"📰 <b>MVNO 뉴스 수집 완료</b>\n\n"
     message += f"📅 {today}\n"
     message += f"⏱️ 최근 {SEARCH_HOURS}시간 뉴스\n"
-    message += f"📊 새 뉴스: {stats['total_news']}개\n\n"
+    message += f"📊 새 뉴스: {stats['total_news']}개\n"
+    if stats.get('repeats_suppressed'):
+        message += f"♻️ 재게재 제외: {stats['repeats_suppressed']}개\n"
+    if stats.get('stream_alerts'):
+        message += f"🆕 즉시 알림: {stats['stream_alerts']}건\n"
+    message += "\n"
     
     if stats['total_news'] > 0:
         message += f"📈 <b>키워드별 통계</b>\n"
@@ -301,61 +439,87 @@ def send_telegram_summary(stats, file_paths):
         message += "\n"
     
     message += f"💾 <b>저장 파일</b>\n"
-    message += f"  • JSON: {file_paths['json']}\n"
+    if file_paths['json']:
+        message += f"  • JSON: {file_paths['json']}\n"
+    message += f"  • Archive: {file_paths['archive']}\n"
     message += f"  • Excel: {file_paths['excel']}\n"
     message += f"  • Markdown: {file_paths['markdown']}\n"
     
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "HTML"
-    }
-    
-    try:
-        response = requests.post(url, data=data)
-        return response.json()
-    except Exception as e:
-        print(f"Telegram error: {e}")
-        return None
+    send_message(message)
 
-def main():
+def main(store=None, fetched=None, fetch_status=None):
+    """한 번의 수집 실행
+
+    store: 열린 저장소를 재사용 (데몬 모드)
+    fetched, fetch_status: 키워드별 검색 결과와 종료 사유를 넘기면 검색 단계를 건너뜀 (샤드 병합)
+    """
     now = get_kst_now()
     today = now.strftime("%Y-%m-%d %H:%M KST")
     
     print(f"Starting MVNO news collection at {today}...")
     print(f"Search period: Last {SEARCH_HOURS} hours")
-    print(f"Similarity threshold: {SIMILARITY_THRESHOLD}")
-    
-    # 기존 뉴스 로드
-    existing_links = load_existing_news()
-    print(f"Loaded existing links: {len(existing_links)}")
+    print(f"Similarity threshold: {SIMILARITY_THRESHOLD} ({SIMILARITY_BACKEND})")
     
-    # 1단계: 모든 키워드의 뉴스 수집
-    all_news_by_keyword = {}
+    metrics = RunMetrics("naver_news")
+    get_notifier()  # 이전 실행에서 보내지 못한 텔레그램 메시지가 있으면 백그라운드로 전송 재개
     
-    for keyword in KEYWORDS:
-        print(f"Searching: {keyword}")
-        news_list = search_naver_news(keyword)
-        all_news_by_keyword[keyword] = news_list
+    # 기존 뉴스 로드 (데몬 모드에서는 메모리에 올린 저장소 재사용)
+    if store is None:
+        with metrics.stage("load_history"):
+            store = load_existing_news()
+    print(f"Loaded existing links: {len(store)}")
     
+    # 1단계: 모든 키워드의 뉴스 수집 (병렬, 결과는 KEYWORDS 순서 유지, 워터마크 이후만)
     # 2단계: 중복 제거 (기존 뉴스 포함)
+    # 스트리밍 모드에서는 두 단계를 파이프라인으로 연결해 새 이야기마다 바로 알림
+    watermarks = store.get_watermarks()
+    fetch_status = {} if fetch_status is None else fetch_status
+    repeats = []
+    stream_alerts = 0
+    deduplicated_news = None
+    if fetched is not None:
+        print(f"Merging shard results for {len(fetched)} keywords (watermarks: {len(watermarks)})")
+        all_news_by_keyword = fetched
+    elif STREAM_ALERTS:
+        print(f"Searching {len(KEYWORDS)} keywords (workers: {FETCH_WORKERS}, watermarks: {len(watermarks)})")
+        with metrics.stage("stream"):
+            all_news_by_keyword, deduplicated_news, stream_alerts = stream_collect(store, watermarks, fetch_status, repeats, metrics)
+    else:
+        print(f"Searching {len(KEYWORDS)} keywords (workers: {FETCH_WORKERS}, watermarks: {len(watermarks)})")
+        with metrics.stage("fetch"):
+            all_news_by_keyword = search_keywords(search_naver_news, KEYWORDS, watermarks, fetch_status)
+    
+    metrics.set_counters("http", print_request_stats())
+    metrics.count("fetched_articles", sum(len(news_list) for news_list in all_news_by_keyword.values()))
+    
+    if ENRICH_BODIES:
+        metrics.set_counters("body", get_body_fetcher().summary())
+    
     print("\nRemoving duplicates...")
-    deduplicated_news = remove_duplicates(all_news_by_keyword, existing_links)
+    with metrics.stage("dedup"):
+        if deduplicated_news is None:
+            deduplicated_news = remove_duplicates(all_news_by_keyword, store, repeats)
+        # 본문은 키워드 확인에만 사용하고 저장하지 않음
+        drop_bodies(all_news_by_keyword)
+        if repeats:
+            # 재게재 기사는 이전 기사에 붙여 기록하고 리포트에서는 제외
+            store.add_repeats(repeats, now.strftime("%Y-%m-%d %H:%M KST"))
+            print(f"  Suppressed {len(repeats)} republished articles (last {REPEAT_WINDOW_DAYS} days)")
     
     # 3단계: 유사 제목 그룹화
-    print("\nGrouping similar news...")
-    grouped_news_by_keyword = {}
+    print(f"\nGrouping similar news (scope: {GROUPING_SCOPE})...")
+    with metrics.stage("grouping"):
+        grouped_news_by_keyword = group_all_news(deduplicated_news)
+    metrics.set_counters("similarity", comparison_stats)
     stats = {
         'total_news': 0,
-        'by_keyword': {}
+        'by_keyword': {},
+        'repeats_suppressed': len(repeats),
+        'stream_alerts': stream_alerts
     }
     
-    for keyword, news_list in deduplicated_news.items():
-        groups = group_similar_news(news_list)
-        grouped_news_by_keyword[keyword] = groups
-        
-        total_articles = len(news_list)
+    for keyword, groups in grouped_news_by_keyword.items():
+        total_articles = sum(len(g) for g in groups)
         num_groups = len(groups)
         similar_count = sum(len(g) - 1 for g in groups if len(g) > 1)
         
@@ -365,28 +529,158 @@ def main():
         print(f"  {keyword}: {total_articles}개 → {num_groups}개 그룹 (유사 {similar_count}건)")
     
     print(f"\nTotal new articles: {stats['total_news']}")
+    metrics.count("new_articles", stats['total_news'])
     
-    # 새 뉴스가 없으면 종료
+    # 새 뉴스가 없으면 종료 (워터마크만 갱신)
     if stats['total_news'] == 0:
+        update_watermarks(store, all_news_by_keyword, watermarks, fetch_status)
         print("No new articles. Exiting...")
+        metrics.export()
         return
     
-    # 4단계: 데이터 저장
+    # 4단계: 데이터 저장 (저장 후 워터마크 갱신, 실행 JSON에는 저장 직전까지의 계측값 포함)
     print("\nSaving data...")
-    json_path, excel_path, md_path = save_data(grouped_news_by_keyword, stats)
+    stats['metrics'] = metrics.summary()
+    with metrics.stage("save"):
+        json_path, excel_path, md_path, archive_path = save_data(grouped_news_by_keyword, stats, store, fetch_status)
+        update_watermarks(store, all_news_by_keyword, watermarks, fetch_status)
     
-    # 5단계: 텔레그램 요약 전송
+    # 5단계: 텔레그램 요약 전송 (보관함에 넣고 백그라운드 전송)
     print("\nSending Telegram summary...")
     file_paths = {
         'json': json_path,
         'excel': excel_path,
-        'markdown': md_path
+        'markdown': md_path,
+        'archive': archive_path
     }
-    send_telegram_summary(stats, file_paths)
+    with metrics.stage("telegram"):
+        send_telegram_summary(stats, file_paths)
+    metrics.set_counters("telegram", get_notifier().summary())
+    metrics.export()
     
     print("\n✅ Completed!")
     print(f"📊 Total: {stats['total_news']} new articles")
     print(f"💾 Files saved in: {DATA_DIR}/, {REPORTS_DIR}/")
 
+def run_shard(shard, shards, run_id):
+    """KEYWORDS의 i번째 조각만 검색해 부분 결과 저장 (중복 제거/저장은 병합 단계에서)"""
+    keywords = shard_keywords(KEYWORDS, shard, shards)
+    get_scheduler().quota.persist = False  # 조각끼리 같은 파일을 덮어쓰지 않도록 병합 단계에서 합산
+    print(f"Shard {shard}/{shards}: searching {len(keywords)} of {len(KEYWORDS)} keywords (run_id: {run_id})")
+    
+    store = load_existing_news()
+    fetch_status = {}
+    news_by_keyword = search_keywords(search_naver_news, keywords, store.get_watermarks(), fetch_status)
+    store.close()
+    
+    path = write_shard(run_id, shard, shards, news_by_keyword, fetch_status, print_request_stats())
+    print(f"✓ Shard 저장: {path}")
+
+def run_merge(run_id):
+    """모든 조각의 검색 결과를 KEYWORDS 순서로 합쳐 단일 실행과 같은 방식으로 처리"""
+    fetched, fetch_status, api_requests = load_shards(run_id)
+    
+    # 조각들이 쓴 API 호출 횟수를 일일 한도 기록에 합산
+    get_scheduler().quota.add(api_requests)
+    main(fetched=fetched, fetch_status=fetch_status)
+    remove_shards(run_id)
+
+def load_daemon_state():
+    """데몬 체크포인트 읽기 (없으면 빈 dict)"""
+    try:
+        with open(DAEMON_STATE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_daemon_state(state):
+    """데몬 체크포인트 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = Path(DAEMON_STATE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+def run_daemon(interval_min=None, max_cycles=None):
+    """상주 실행 - HTTP 커넥션 풀, 저장소 색인(메모리), 키워드 매처를 유지하며 주기적으로 수집
+
+    매 주기 종료 시 체크포인트(마지막 실행 시각, 반복 횟수)와 API 호출 횟수를 저장하므로,
+    재시작하면 남은 대기 시간만큼 기다린 뒤 워터마크 이후 기사만 이어서 수집한다.
+    SIGTERM/SIGINT를 받으면 진행 중인 주기를 마치고 종료한다.
+    """
+    interval_sec = (interval_min or DAEMON_INTERVAL_MIN) * 60
+    max_cycles = DAEMON_MAX_CYCLES if max_cycles is None else max_cycles
+    stop = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop.set())
+    
+    # 매 주기 최신 검색 결과가 필요하므로 응답 캐시는 기록만 함 (재시작 후 offline 재현용)
+    cache = get_response_cache()
+    if cache.mode == "on":
+        cache.mode = "refresh"
+    
+    store = load_existing_news()
+    print(f"Daemon started: every {interval_sec / 60:g} min, {store.preload()} links in memory")
+    get_keyword_matcher()
+    
+    state = load_daemon_state()
+    cycles = 0
+    next_run = time.time()
+    if state.get('last_cycle_ts'):
+        next_run = max(next_run, state['last_cycle_ts'] + interval_sec)
+        print(f"Resuming from checkpoint: last cycle {state.get('last_cycle_at')}, {state.get('cycles', 0)} cycles")
+    
+    while not stop.is_set():
+        wait = next_run - time.time()
+        if wait > 0:
+            print(f"Next cycle in {wait / 60:.1f} min")
+            if stop.wait(wait):
+                break
+        
+        started = time.time()
+        comparison_stats.clear()
+        get_scheduler().reset_stats()
+        try:
+            main(store)
+        except Exception as e:
+            print(f"Cycle error: {e}")
+        get_scheduler().quota.save()
+        
+        cycles += 1
+        state = {
+            'last_cycle_ts': started,
+            'last_cycle_at': datetime.fromtimestamp(started, KST).strftime("%Y-%m-%d %H:%M:%S KST"),
+            'cycles': state.get('cycles', 0) + 1,
+            'interval_min': interval_sec / 60
+        }
+        save_daemon_state(state)
+        
+        if max_cycles and cycles >= max_cycles:
+            break
+        next_run = started + interval_sec
+    
+    store.close()
+    flush_notifications()
+    print(f"Daemon stopped after {cycles} cycles")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="MVNO 뉴스 실시간 수집")
+    parser.add_argument("--daemon", action="store_true", help="상주 실행 (DAEMON_INTERVAL_MIN 분마다 수집)")
+    parser.add_argument("--shard", help="i/N: 키워드를 N개로 나눈 i번째(0부터) 조각만 검색해 부분 결과 저장")
+    parser.add_argument("--merge", metavar="RUN_ID", help="샤드 부분 결과를 병합해 중복 제거/그룹화/저장")
+    parser.add_argument("--run-id", help="샤드 부분 결과 디렉토리 이름 (--shard와 함께 사용)")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        run_daemon()
+    elif args.shard:
+        if not args.run_id:
+            parser.error("--shard requires --run-id")
+        run_shard(*parse_shard(args.shard), args.run_id)
+    elif args.merge:
+        run_main(lambda: run_merge(args.merge), "naver_news")
+        flush_notifications()
+    else:
+        run_main(main, "naver_news")
+        flush_notifications()
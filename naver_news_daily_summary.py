@@ -1,27 +1,38 @@
-import requests
 from datetime import datetime, timedelta
 import os
 from collections import defaultdict
 import re
 import json
-from difflib import SequenceMatcher
 import pytz
-import pandas as pd
 from pathlib import Path
-from config import KEYWORDS, DATA_DIR, REPORTS_DIR
+from config import KEYWORDS, DATA_DIR, REPORTS_DIR, GROUPING_SCOPE as DEFAULT_GROUPING_SCOPE, DAILY_SOURCE as DEFAULT_DAILY_SOURCE
+from keyword_matcher import get_keyword_matcher
+from news_similarity import comparison_stats, group_news, group_similar_titles, cluster_news_globally, print_backend_comparison, SIMILARITY_BACKEND
+from report_writer import write_reports
+from run_metrics import RunMetrics
+from run_profiler import run_main
+from news_archive import iter_runs, read_fetch_status
+from telegram_notifier import flush_notifications, get_notifier, send_message
+from naver_api import iter_news_pages, search_keywords, print_request_stats, FETCH_WORKERS
 
-# 환경 변수
-TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
-TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID_NEWS')
-NAVER_CLIENT_ID = os.environ.get('NAVER_CLIENT_ID')
-NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET')
-
-# 일일 요약 전용 설정
-DAILY_SUMMARY_COUNT = 50
+# 일일 요약 전용 설정 (페이지당 요청 개수, API 최대 100)
+DAILY_PAGE_SIZE = 100
 
 # 유사도 임계값
 SIMILARITY_THRESHOLD = float(os.environ.get('SIMILARITY_THRESHOLD', '0.60'))
 
+# 유사도 방식 비교 로그 (SIMILARITY_COMPARE=1)
+SIMILARITY_COMPARE = os.environ.get('SIMILARITY_COMPARE', '0') == '1'
+
+# 그룹화 범위 ("keyword": 키워드별, "global": 전체 기사 클러스터링 후 우선순위 키워드에 배정)
+GROUPING_SCOPE = os.environ.get('GROUPING_SCOPE', DEFAULT_GROUPING_SCOPE)
+
+# 일일 요약 데이터 출처 ("api": 전일 기사 재검색, "snapshots": 3시간 단위 수집 결과 집계 + 누락 구간 검색)
+DAILY_SOURCE = os.environ.get('DAILY_SOURCE', DEFAULT_DAILY_SOURCE)
+
+# 이보다 짧은 스냅샷 사이 공백은 누락 구간으로 보지 않음
+MIN_GAP = timedelta(minutes=1)
+
 # 한국 시간대 설정
 KST = pytz.timezone('Asia/Seoul')
 
@@ -69,105 +80,98 @@ def normalize_title(title):
     title = re.sub(r'\s+', ' ', title)
     return title.lower().strip()
 
-def calculate_similarity(title1, title2):
-    """두 제목 간의 유사도 계산 (0.0~1.0)"""
-    norm1 = normalize_title(title1)
-    norm2 = normalize_title(title2)
-    return SequenceMatcher(None, norm1, norm2).ratio()
-
 def group_similar_news(news_list):
-    """유사한 제목의 뉴스를 그룹화"""
-    if not news_list:
-        return []
-    
-    groups = []
-    used = set()
+    """유사한 제목의 뉴스를 그룹화 (n-gram 후보 추출 후 SequenceMatcher 검증)"""
+    return group_news(news_list, SIMILARITY_THRESHOLD)
+
+def group_all_news(deduplicated_news):
+    """키워드별 뉴스 그룹화 (GROUPING_SCOPE=global이면 전체 기사를 한 번에 클러스터링)"""
+    if GROUPING_SCOPE == "global":
+        return cluster_news_globally(deduplicated_news, KEYWORDS, SIMILARITY_THRESHOLD)
     
-    for i, news in enumerate(news_list):
-        if i in used:
-            continue
-        
-        group = [news]
-        used.add(i)
-        
-        for j, other_news in enumerate(news_list):
-            if j in used:
-                continue
-            
-            similarity = calculate_similarity(news['title'], other_news['title'])
-            
-            if similarity >= SIMILARITY_THRESHOLD:
-                group.append(other_news)
-                used.add(j)
+    grouped_news_by_keyword = {}
+    for keyword, news_list in deduplicated_news.items():
+        grouped_news_by_keyword[keyword] = group_similar_news(news_list)
         
-        groups.append(group)
+        if SIMILARITY_COMPARE:
+            print_backend_comparison(keyword, news_list, SIMILARITY_THRESHOLD)
     
-    return groups
-
-def select_representative_title(group):
-    """그룹에서 대표 제목 선택 (가장 정보가 풍부한 제목)"""
-    return max(group, key=lambda x: len(clean_title(x['title'])))
+    return grouped_news_by_keyword
 
 def keyword_exists_in_news(news, keyword):
-    """뉴스에 키워드가 실제로 포함되어 있는지 확인"""
-    title = clean_title(news.get('title', ''))
-    description = clean_title(news.get('description', ''))
-    
-    keyword_lower = keyword.lower()
-    title_lower = title.lower()
-    description_lower = description.lower()
+    """뉴스에 키워드가 실제로 포함되어 있는지 확인 (KEYWORDS 매처로 한 번에 검사)"""
+    matcher = get_keyword_matcher()
+    if keyword in matcher.keywords:
+        return keyword in matcher.match(news)
     
-    return keyword_lower in title_lower or keyword_lower in description_lower
+    text = clean_title(news.get('title', '')) + "\n" + clean_title(news.get('description', ''))
+    return keyword.lower() in text.lower()
 
-def search_naver_news(keyword, start_dt, end_dt):
-    """네이버 뉴스 검색 API + 날짜 범위 필터링"""
-    url = "https://openapi.naver.com/v1/search/news.json"
-    headers = {
-        "X-Naver-Client-Id": NAVER_CLIENT_ID,
-        "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-    }
-    params = {
-        "query": keyword,
-        "display": DAILY_SUMMARY_COUNT,
-        "sort": "date"
-    }
+def search_naver_news(keyword, start_dt, end_dt, ranges=None):
+    """네이버 뉴스 검색 API + 날짜 범위 필터링 (페이지네이션)
+
+    sort=date 결과는 최신순이므로 end_dt 이후로만 채워진 페이지는 건너뛰고,
+    start_dt 이전 기사가 나오면 더 이상 페이지를 요청하지 않는다.
+    ranges: [(시작, 끝), ...]을 넘기면 그 구간에 든 기사만 수집하고 구간 밖으로만 채워진 페이지는 건너뜀 (누락 구간 검색)
+    """
+    ranges = ranges or [(start_dt, end_dt)]
+    
+    def in_ranges(pub_dt):
+        return any(lo <= pub_dt <= hi for lo, hi in ranges)
+    
+    fetched_count = 0
+    page_count = 0
+    keyword_count = 0
+    date_filtered = []
     
     try:
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code == 200:
-            all_items = response.json()['items']
+        for items in iter_news_pages(keyword, DAILY_PAGE_SIZE):
+            page_count += 1
+            fetched_count += len(items)
             
-            keyword_filtered = [
-                item for item in all_items 
-                if keyword_exists_in_news(item, keyword)
-            ]
+            pub_dts = [parse_pub_date(item.get('pubDate', '')) for item in items]
+            known_dts = [dt for dt in pub_dts if dt]
             
-            date_filtered = [
-                item for item in keyword_filtered
-                if is_within_date_range(item.get('pubDate', ''), start_dt, end_dt)
-            ]
+            # 페이지 전체가 보고 기간(구간) 밖 → 처리 생략
+            if known_dts and not any(in_ranges(dt) for dt in known_dts):
+                if min(known_dts) < start_dt:
+                    break
+                continue
             
-            print(f"  {keyword}: {len(all_items)}개 수집 → 키워드 {len(keyword_filtered)}개 → 전일 {len(date_filtered)}개")
+            for item, pub_dt in zip(items, pub_dts):
+                if not keyword_exists_in_news(item, keyword):
+                    continue
+                keyword_count += 1
+                if pub_dt and in_ranges(pub_dt):
+                    date_filtered.append(item)
             
-            return date_filtered
-        else:
-            print(f"Error {response.status_code}: {keyword}")
-            return []
+            # 보고 기간 이전 기사 도달 → 조기 종료
+            if known_dts and min(known_dts) < start_dt:
+                break
     except Exception as e:
         print(f"Exception for {keyword}: {e}")
-        return []
+    
+    print(f"  {keyword}: {fetched_count}개 수집 ({page_count}페이지) → 키워드 {keyword_count}개 → 전일 {len(date_filtered)}개")
+    
+    return date_filtered
 
 def remove_duplicates(all_news_by_keyword):
-    """중복 제거 - 키워드 순서대로 우선순위 적용"""
+    """중복 제거 - 기사에 포함된 키워드 중 가장 앞쪽 키워드로 분류"""
     seen_links = set()
     seen_titles = set()
     deduplicated = defaultdict(list)
+    matcher = get_keyword_matcher()
     
     for keyword in KEYWORDS:
         if keyword not in all_news_by_keyword:
             continue
             
         for news in all_news_by_keyword[keyword]:
+            # 모니터링 키워드가 하나도 없는 기사는 그룹화 전에 제외
+            matched_keywords = matcher.match(news)
+            if not matched_keywords:
+                continue
+            
             link = news['link']
             normalized_title = normalize_title(news['title'])
             
@@ -176,9 +180,177 @@ def remove_duplicates(all_news_by_keyword):
             
             seen_links.add(link)
             seen_titles.add(normalized_title)
-            deduplicated[keyword].append(news)
+            deduplicated[matched_keywords[0]].append(news)
     
-    return deduplicated
+    return {keyword: deduplicated[keyword] for keyword in KEYWORDS if keyword in deduplicated}
+
+def parse_snapshot_time(json_file):
+    """스냅샷 파일명(mvno_news_YYYYMMDD_HHMMSS.json)에서 수집 시각 추출"""
+    try:
+        return KST.localize(datetime.strptime(json_file.stem[len("mvno_news_"):], "%Y%m%d_%H%M%S"))
+    except ValueError:
+        return None
+
+def search_gap_news(keyword, gaps_by_keyword):
+    """키워드별 누락 구간만 검색 (한 번의 페이지 탐색으로 가장 이른 구간까지, 구간 안 기사만 수집)"""
+    gaps = gaps_by_keyword[keyword]
+    return search_naver_news(keyword, gaps[0][0], gaps[-1][1], ranges=gaps)
+
+def iter_snapshot_runs(start_dt, end_dt):
+    """보고 기간 근처의 수집 결과 (수집 시각, 검색 시간, news_by_keyword, fetch_status) 목록 (최신순)
+    
+    실행별 JSON을 우선 사용하고, JSON이 없는 실행(EXPORT_RUN_JSON=0)은 아카이브에서 복원한다.
+    fetch_status는 키워드별 검색 종료 사유/확인 구간이며, 기록이 없는 실행은 None이다.
+    """
+    runs = {}
+    
+    def in_window(collected_at):
+        # 수집 시각으로 먼저 걸러 기간과 무관한 실행은 읽지 않음
+        return collected_at and start_dt <= collected_at <= end_dt + timedelta(days=1)
+    
+    for json_file in Path(DATA_DIR).glob("mvno_news_*.json"):
+        collected_at = parse_snapshot_time(json_file)
+        if not in_window(collected_at):
+            continue
+        try:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        run_id = json_file.stem[len("mvno_news_"):]
+        runs[run_id] = (collected_at, data.get('search_hours', 3), data.get('news_by_keyword', {}), data.get('fetch_status'))
+    
+    archive_start = start_dt.strftime("%Y-%m-%d")
+    archive_end = (end_dt + timedelta(days=1)).strftime("%Y-%m-%d")
+    archived_status = read_fetch_status(archive_start, archive_end)
+    for run_id, collected_at, search_hours, news_by_keyword in iter_runs(archive_start, archive_end):
+        if run_id not in runs and in_window(collected_at):
+            runs[run_id] = (collected_at, search_hours, news_by_keyword, archived_status.get(run_id))
+    
+    return [runs[run_id] for run_id in sorted(runs, reverse=True)]
+
+def load_snapshots(start_dt, end_dt):
+    """보고 기간과 겹치는 3시간 단위 수집 스냅샷 로드
+    
+    반환값: ({키워드: [그룹, ...]} (기간 내 기사만, 최신 스냅샷 우선), {키워드: 빠짐없이 확인된 (시작, 끝) 구간 목록})
+    
+    스냅샷에는 새 기사만 최대 NEWS_COUNT개씩 들어 있으므로, 검색 구간을 끝까지 확인한 키워드
+    (워터마크/기간 경계에서 종료)의 기록된 구간만 커버한 것으로 본다. 종료 사유 기록이 없는 실행은 커버하지 않는다.
+    """
+    groups_by_keyword = defaultdict(list)
+    covered = defaultdict(list)
+    
+    for collected_at, search_hours, news_by_keyword, fetch_status in iter_snapshot_runs(start_dt, end_dt):
+        if collected_at - timedelta(hours=search_hours) > end_dt:
+            continue
+        
+        for keyword, status in (fetch_status or {}).items():
+            if not status.get('from') or not status.get('to'):
+                continue
+            covered_from = datetime.fromisoformat(status['from']).astimezone(KST)
+            covered_to = datetime.fromisoformat(status['to']).astimezone(KST)
+            if covered_from <= end_dt and covered_to >= start_dt:
+                covered[keyword].append((max(covered_from, start_dt), min(covered_to, end_dt)))
+        
+        for keyword, groups in news_by_keyword.items():
+            for group in groups:
+                in_range = [
+                    news for news in group
+                    if is_within_date_range(news.get('pubDate', ''), start_dt, end_dt)
+                ]
+                if in_range:
+                    groups_by_keyword[keyword].append(in_range)
+    
+    return groups_by_keyword, covered
+
+def find_coverage_gaps(covered, start_dt, end_dt):
+    """스냅샷이 커버하지 못한 (시작, 끝) 구간 목록"""
+    gaps = []
+    cursor = start_dt
+    
+    for covered_from, covered_to in sorted(covered):
+        if covered_from - cursor > MIN_GAP:
+            gaps.append((cursor, covered_from))
+        cursor = max(cursor, covered_to)
+    
+    if end_dt - cursor > MIN_GAP:
+        gaps.append((cursor, end_dt))
+    
+    return gaps
+
+def merge_groups(groups):
+    """여러 스냅샷에 나뉜 같은 이야기의 그룹 병합 (각 그룹의 첫 기사 제목 기준, 기존 그룹 구성은 유지)"""
+    seeds = [normalize_title(group[0]['title']) for group in groups]
+    return [
+        [news for idx in merged for news in groups[idx]]
+        for merged in group_similar_titles(seeds, SIMILARITY_THRESHOLD)
+    ]
+
+def merge_groups_globally(groups_by_keyword):
+    """키워드를 가리지 않고 그룹 병합 (GROUPING_SCOPE=global), 병합된 그룹은 가장 앞쪽 키워드에 배정
+    
+    그룹을 KEYWORDS 순서로 늘어놓고 병합하므로 각 병합 그룹의 기준(첫) 그룹이 가장 앞쪽 키워드의 그룹이다.
+    """
+    entries = [
+        (keyword, group)
+        for keyword in KEYWORDS
+        for group in groups_by_keyword.get(keyword, [])
+    ]
+    seeds = [normalize_title(group[0]['title']) for _, group in entries]
+    merged_by_keyword = defaultdict(list)
+    for merged in group_similar_titles(seeds, SIMILARITY_THRESHOLD):
+        keyword = entries[merged[0]][0]
+        merged_by_keyword[keyword].append([news for idx in merged for news in entries[idx][1]])
+    return merged_by_keyword
+
+def collect_from_snapshots(start_dt, end_dt):
+    """스냅샷 집계 + 키워드별 누락 구간만 API 검색하여 키워드별 그룹 반환"""
+    groups_by_keyword, covered = load_snapshots(start_dt, end_dt)
+    gaps_by_keyword = {}
+    for keyword in KEYWORDS:
+        gaps = find_coverage_gaps(covered.get(keyword, []), start_dt, end_dt)
+        if gaps:
+            gaps_by_keyword[keyword] = gaps
+    
+    snapshot_count = sum(len(group) for groups in groups_by_keyword.values() for group in groups)
+    print(
+        f"Snapshots: {snapshot_count}개 기사, 빠짐없이 확인된 키워드 {len(KEYWORDS) - len(gaps_by_keyword)}/{len(KEYWORDS)}개, "
+        f"누락 구간 {sum(len(gaps) for gaps in gaps_by_keyword.values())}개"
+    )
+    
+    if gaps_by_keyword:
+        for keyword, gaps in gaps_by_keyword.items():
+            gap_text = ", ".join(f"{lo.strftime('%H:%M')}~{hi.strftime('%H:%M')}" for lo, hi in gaps)
+            print(f"  gap {keyword}: {gap_text}")
+        
+        # 키워드마다 자기 누락 구간만 검색 (가장 이른 구간까지 한 번의 페이지 탐색, 구간 밖 기사는 제외)
+        gap_news = search_keywords(search_gap_news, list(gaps_by_keyword), gaps_by_keyword)
+        
+        known_links = {news['link'] for groups in groups_by_keyword.values() for group in groups for news in group}
+        known_titles = {
+            normalize_title(news['title'])
+            for groups in groups_by_keyword.values() for group in groups for news in group
+        }
+        new_news_by_keyword = {}
+        for keyword, news_list in remove_duplicates(gap_news).items():
+            new_news = [
+                news for news in news_list
+                if news['link'] not in known_links and normalize_title(news['title']) not in known_titles
+            ]
+            if new_news:
+                new_news_by_keyword[keyword] = new_news
+        for keyword, groups in group_all_news(new_news_by_keyword).items():
+            groups_by_keyword[keyword].extend(groups)
+    
+    if GROUPING_SCOPE == "global":
+        merged_by_keyword = merge_groups_globally(groups_by_keyword)
+        return {keyword: merged_by_keyword[keyword] for keyword in KEYWORDS if merged_by_keyword.get(keyword)}
+    
+    return {
+        keyword: merge_groups(groups_by_keyword[keyword])
+        for keyword in KEYWORDS
+        if groups_by_keyword.get(keyword)
+    }
 
 def save_data(grouped_news_by_keyword, stats, yesterday_date):
     """데이터 저장 (JSON, Excel, Markdown)"""
@@ -190,81 +362,28 @@ def save_data(grouped_news_by_keyword, stats, yesterday_date):
     Path(DATA_DIR).mkdir(exist_ok=True)
     Path(REPORTS_DIR).mkdir(exist_ok=True)
     
-    # JSON 저장
     json_path = f"{DATA_DIR}/mvno_daily_{timestamp}.json"
-    json_data = {
+    excel_path = f"{REPORTS_DIR}/mvno_daily_{timestamp}.xlsx"
+    md_path = f"{REPORTS_DIR}/mvno_daily_{timestamp}.md"
+    
+    json_header = {
         "report_date": yesterday_date,
         "generated_at": date_str,
         "similarity_threshold": SIMILARITY_THRESHOLD,
-        "statistics": stats,
-        "news_by_keyword": grouped_news_by_keyword
+        "statistics": stats
     }
+    md_header = f"# MVNO 일일 뉴스 요약\n\n"
+    md_header += f"**보고 날짜**: {yesterday_date} (전일)\n"
+    md_header += f"**생성 시간**: {date_str}\n"
+    md_header += f"**총 뉴스**: {stats['total_news']}개\n\n"
+    md_header += "---\n\n"
     
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(json_data, f, ensure_ascii=False, indent=2)
+    # JSON, Excel, Markdown을 한 번의 순회로 기록
+    excel_saved = write_reports(grouped_news_by_keyword, json_path, json_header, excel_path, md_path, md_header)
     
     print(f"✓ JSON 저장: {json_path}")
-    
-    # Excel 저장
-    excel_path = f"{REPORTS_DIR}/mvno_daily_{timestamp}.xlsx"
-    excel_data = []
-    
-    for keyword in KEYWORDS:
-        groups = grouped_news_by_keyword.get(keyword, [])
-        for group in groups:
-            representative = select_representative_title(group)
-            excel_data.append({
-                "키워드": keyword,
-                "제목": clean_title(representative['title']),
-                "링크": representative['link'],
-                "발행일": representative['pubDate'],
-                "유사기사수": len(group) - 1,
-                "그룹크기": len(group)
-            })
-    
-    if excel_data:
-        df = pd.DataFrame(excel_data)
-        df.to_excel(excel_path, index=False, engine='openpyxl')
+    if excel_saved:
         print(f"✓ Excel 저장: {excel_path}")
-    
-    # Markdown 저장
-    md_path = f"{REPORTS_DIR}/mvno_daily_{timestamp}.md"
-    md_content = f"# MVNO 일일 뉴스 요약\n\n"
-    md_content += f"**보고 날짜**: {yesterday_date} (전일)\n"
-    md_content += f"**생성 시간**: {date_str}\n"
-    md_content += f"**총 뉴스**: {stats['total_news']}개\n\n"
-    md_content += "---\n\n"
-    
-    for keyword in KEYWORDS:
-        groups = grouped_news_by_keyword.get(keyword, [])
-        if groups:
-            total_in_keyword = sum(len(group) for group in groups)
-            md_content += f"## 🔍 {keyword} ({total_in_keyword}개)\n\n"
-            
-            for idx, group in enumerate(groups, 1):
-                representative = select_representative_title(group)
-                title = clean_title(representative['title'])
-                link = representative['link']
-                pub_date = representative['pubDate']
-                similar_count = len(group) - 1
-                
-                md_content += f"### {idx}. {title}\n"
-                if similar_count > 0:
-                    md_content += f"**유사 기사**: {similar_count}건\n"
-                md_content += f"**링크**: {link}\n"
-                md_content += f"**발행일**: {pub_date}\n\n"
-                
-                if similar_count > 0:
-                    md_content += "**유사 기사 목록**:\n"
-                    for similar_news in group[1:]:
-                        similar_title = clean_title(similar_news['title'])
-                        md_content += f"- {similar_title}\n"
-                        md_content += f"  - {similar_news['link']}\n"
-                    md_content += "\n"
-    
-    with open(md_path, 'w', encoding='utf-8') as f:
-        f.write(md_content)
-    
     print(f"✓ Markdown 저장: {md_path}")
     
     return json_path, excel_path, md_path
@@ -291,19 +410,7 @@ def send_telegram_summary(stats, yesterday_date, file_paths):
     message += f"  • Excel: {file_paths['excel']}\n"
     message += f"  • Markdown: {file_paths['markdown']}\n"
     
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {
-        "chat_id": TELEGRAM_CHAT_ID,
-        "text": message,
-        "parse_mode": "HTML"
-    }
-    
-    try:
-        response = requests.post(url, data=data)
-        return response.json()
-    except Exception as e:
-        print(f"Telegram error: {e}")
-        return None
+    send_message(message)
 
 def main():
     now = get_kst_now()
@@ -313,34 +420,45 @@ def main():
     yesterday_date = start_dt.strftime("%Y-%m-%d")
     
     print(f"Starting daily news summary at {today}...")
-    print(f"Collection period: {yesterday_date} 00:00 ~ 23:59")
-    print(f"Similarity threshold: {SIMILARITY_THRESHOLD}")
-    
-    # 1단계: 모든 키워드의 뉴스 수집
-    all_news_by_keyword = {}
-    
-    for keyword in KEYWORDS:
-        print(f"Searching: {keyword}")
-        news_list = search_naver_news(keyword, start_dt, end_dt)
-        all_news_by_keyword[keyword] = news_list
-    
-    # 2단계: 중복 제거
-    print("\nRemoving duplicates...")
-    deduplicated_news = remove_duplicates(all_news_by_keyword)
+    print(f"Collection period: {yesterday_date} 00:00 ~ 23:59 (source: {DAILY_SOURCE})")
+    print(f"Similarity threshold: {SIMILARITY_THRESHOLD} ({SIMILARITY_BACKEND})")
+    
+    metrics = RunMetrics("naver_news_daily_summary")
+    get_notifier()  # 이전 실행에서 보내지 못한 텔레그램 메시지가 있으면 백그라운드로 전송 재개
+    
+    if DAILY_SOURCE == "snapshots":
+        # 1~3단계: 3시간 단위 스냅샷의 그룹을 그대로 집계하고 누락 구간만 검색
+        print("\nAggregating snapshots...")
+        with metrics.stage("snapshots"):
+            grouped_news_by_keyword = collect_from_snapshots(start_dt, end_dt)
+        metrics.set_counters("http", print_request_stats())
+    else:
+        # 1단계: 모든 키워드의 뉴스 수집 (병렬, 결과는 KEYWORDS 순서 유지)
+        print(f"Searching {len(KEYWORDS)} keywords (workers: {FETCH_WORKERS})")
+        with metrics.stage("fetch"):
+            all_news_by_keyword = search_keywords(search_naver_news, KEYWORDS, start_dt, end_dt)
+        
+        metrics.set_counters("http", print_request_stats())
+        metrics.count("fetched_articles", sum(len(news_list) for news_list in all_news_by_keyword.values()))
+        
+        # 2단계: 중복 제거
+        print("\nRemoving duplicates...")
+        with metrics.stage("dedup"):
+            deduplicated_news = remove_duplicates(all_news_by_keyword)
+        
+        # 3단계: 유사 제목 그룹화
+        print(f"\nGrouping similar news (scope: {GROUPING_SCOPE})...")
+        with metrics.stage("grouping"):
+            grouped_news_by_keyword = group_all_news(deduplicated_news)
+    metrics.set_counters("similarity", comparison_stats)
     
-    # 3단계: 유사 제목 그룹화
-    print("\nGrouping similar news...")
-    grouped_news_by_keyword = {}
     stats = {
         'total_news': 0,
         'by_keyword': {}
     }
     
-    for keyword, news_list in deduplicated_news.items():
-        groups = group_similar_news(news_list)
-        grouped_news_by_keyword[keyword] = groups
-        
-        total_articles = len(news_list)
+    for keyword, groups in grouped_news_by_keyword.items():
+        total_articles = sum(len(g) for g in groups)
         num_groups = len(groups)
         similar_count = sum(len(g) - 1 for g in groups if len(g) > 1)
         
@@ -351,27 +469,36 @@ def main():
     
     print(f"\nTotal articles: {stats['total_news']}")
     
+    metrics.count("articles", stats['total_news'])
+    
     # 뉴스가 없으면 종료
     if stats['total_news'] == 0:
         print("No articles found for yesterday. Exiting...")
+        metrics.export()
         return
     
-    # 4단계: 데이터 저장
+    # 4단계: 데이터 저장 (JSON에는 저장 직전까지의 계측값 포함)
     print("\nSaving data...")
-    json_path, excel_path, md_path = save_data(grouped_news_by_keyword, stats, yesterday_date)
+    stats['metrics'] = metrics.summary()
+    with metrics.stage("save"):
+        json_path, excel_path, md_path = save_data(grouped_news_by_keyword, stats, yesterday_date)
     
-    # 5단계: 텔레그램 요약 전송
+    # 5단계: 텔레그램 요약 전송 (보관함에 넣고 백그라운드 전송)
     print("\nSending Telegram summary...")
     file_paths = {
         'json': json_path,
         'excel': excel_path,
         'markdown': md_path
     }
-    send_telegram_summary(stats, yesterday_date, file_paths)
+    with metrics.stage("telegram"):
+        send_telegram_summary(stats, yesterday_date, file_paths)
+    metrics.set_counters("telegram", get_notifier().summary())
+    metrics.export()
     
     print("\n✅ Completed!")
     print(f"📊 Total: {stats['total_news']} articles")
     print(f"💾 Files saved in: {DATA_DIR}/, {REPORTS_DIR}/")
 
 if __name__ == "__main__":
-    main()
+    run_main(main, "naver_news_daily_summary")
+    flush_notifications()
@@ -0,0 +1,239 @@
+# 수집 기사 아카이브 (날짜 파티션, 평탄화된 레코드)
+# 실행마다 기사 1건 = 레코드 1개로 저장하여, 필요한 열과 날짜 범위만 읽을 수 있게 한다.
+#   mvno_news/archive/date=YYYY-MM-DD/part-YYYYMMDD_HHMMSS.jsonl  (기본, 줄 단위 JSON)
+#   mvno_news/archive/date=YYYY-MM-DD/part-YYYYMMDD_HHMMSS.parquet (ARCHIVE_FORMAT=parquet, pyarrow 필요)
+#   mvno_news/archive/date=YYYY-MM-DD/_index.json                 (파티션 요약 + 링크 색인)
+
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import pytz
+
+from config import ARCHIVE_DIR, ARCHIVE_FORMAT as DEFAULT_ARCHIVE_FORMAT
+
+KST = pytz.timezone('Asia/Seoul')
+
+ARCHIVE_FORMAT = os.environ.get('ARCHIVE_FORMAT', DEFAULT_ARCHIVE_FORMAT)
+
+INDEX_FILE = "_index.json"
+
+# 레코드 열 (순서 고정)
+COLUMNS = [
+    "run_id", "collected_at", "search_hours", "keyword", "group_id", "group_rank", "article_rank",
+    "title", "originallink", "link", "description", "pubDate", "pub_ts"
+]
+
+# 원본 뉴스 dict로 되돌릴 때 사용하는 API 필드
+NEWS_FIELDS = ["title", "originallink", "link", "description", "pubDate"]
+
+
+def _pub_ts(pub_date_str):
+    """pubDate를 epoch 초로 변환 (실패 시 None)"""
+    try:
+        return int(parsedate_to_datetime(pub_date_str).timestamp())
+    except Exception:
+        return None
+
+
+def partition_dir(day, archive_dir=ARCHIVE_DIR):
+    """날짜(YYYY-MM-DD) 파티션 디렉토리"""
+    return Path(archive_dir) / f"date={day}"
+
+
+def flatten_run(run_id, collected_at, search_hours, grouped_news_by_keyword):
+    """그룹화된 실행 결과를 레코드 목록으로 평탄화"""
+    records = []
+    for keyword, groups in grouped_news_by_keyword.items():
+        for group_rank, group in enumerate(groups):
+            group_id = f"{run_id}/{keyword}/{group_rank}"
+            for article_rank, news in enumerate(group):
+                records.append({
+                    "run_id": run_id,
+                    "collected_at": collected_at.isoformat(),
+                    "search_hours": search_hours,
+                    "keyword": keyword,
+                    "group_id": group_id,
+                    "group_rank": group_rank,
+                    "article_rank": article_rank,
+                    "title": news.get('title', ''),
+                    "originallink": news.get('originallink', ''),
+                    "link": news['link'],
+                    "description": news.get('description', ''),
+                    "pubDate": news.get('pubDate', ''),
+                    "pub_ts": _pub_ts(news.get('pubDate', ''))
+                })
+    return records
+
+
+def _load_index(directory):
+    index_path = directory / INDEX_FILE
+    if index_path.exists():
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"parts": {}, "links": {}}
+
+
+def _save_index(directory, index):
+    with open(directory / INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def _write_part(path, records, archive_format):
+    if archive_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("ARCHIVE_FORMAT=parquet requires pyarrow (pip install pyarrow)")
+        table = pa.Table.from_pylist(records)
+        pq.write_table(table, str(path))
+        return
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_part(directory, part_name, records, archive_format=None, fetch_status=None):
+    """파티션 디렉토리에 파트 파일을 쓰고 사이드카 색인을 갱신
+
+    fetch_status: {run_id: {키워드: 검색 종료 사유/확인 구간}} - 파트 요약에 함께 기록 (일일 요약 스냅샷 집계용)
+    """
+    archive_format = archive_format or ARCHIVE_FORMAT
+    directory.mkdir(parents=True, exist_ok=True)
+    extension = "parquet" if archive_format == "parquet" else "jsonl"
+    file_name = f"{part_name}.{extension}"
+    _write_part(directory / file_name, records, archive_format)
+
+    pub_values = [record['pub_ts'] for record in records if record['pub_ts'] is not None]
+    runs = sorted({record['run_id'] for record in records})
+    index = _load_index(directory)
+    index["parts"][file_name] = {
+        "records": len(records),
+        "runs": runs,
+        "min_pub_ts": min(pub_values) if pub_values else None,
+        "max_pub_ts": max(pub_values) if pub_values else None
+    }
+    if fetch_status:
+        index["parts"][file_name]["fetch_status"] = fetch_status
+    for record in records:
+        index["links"][record['link']] = file_name
+    _save_index(directory, index)
+
+    return directory / file_name
+
+
+def rewrite_partition(directory, part_name, records, archive_format=None, fetch_status=None):
+    """파티션의 기존 파트를 모두 지우고 records를 하나의 파트로 다시 기록 (압축용, 기존 파트의 검색 종료 사유 유지)"""
+    index = _load_index(directory)
+    merged_status = partition_fetch_status(directory)
+    merged_status.update(fetch_status or {})
+    for file_name in index["parts"]:
+        (directory / file_name).unlink(missing_ok=True)
+    (directory / INDEX_FILE).unlink(missing_ok=True)
+    return write_part(directory, part_name, records, archive_format, merged_status)
+
+
+def read_partition(directory):
+    """파티션의 모든 레코드 목록"""
+    records = []
+    for file_name in sorted(_load_index(directory)["parts"]):
+        records.extend(_read_part(directory / file_name, None))
+    return records
+
+
+def partition_parts(directory):
+    """파티션의 파트 파일 이름 목록"""
+    return sorted(_load_index(directory)["parts"])
+
+
+def partition_fetch_status(directory):
+    """파티션에 기록된 실행별 검색 종료 사유 {run_id: {키워드: ...}}"""
+    fetch_status = {}
+    for part in _load_index(directory)["parts"].values():
+        fetch_status.update(part.get("fetch_status", {}))
+    return fetch_status
+
+
+def write_run(run_id, collected_at, search_hours, grouped_news_by_keyword, fetch_status=None, archive_dir=ARCHIVE_DIR):
+    """한 번의 수집 결과를 수집 날짜 파티션에 저장하고 파일 경로 반환"""
+    records = flatten_run(run_id, collected_at, search_hours, grouped_news_by_keyword)
+    directory = partition_dir(collected_at.strftime("%Y-%m-%d"), archive_dir)
+    return write_part(directory, f"part-{run_id}", records, fetch_status={run_id: fetch_status} if fetch_status else None)
+
+
+def list_partitions(start_date=None, end_date=None, archive_dir=ARCHIVE_DIR):
+    """날짜 범위(YYYY-MM-DD, 양끝 포함)에 해당하는 파티션 디렉토리 (오름차순)"""
+    archive_path = Path(archive_dir)
+    if not archive_path.exists():
+        return []
+
+    partitions = []
+    for directory in sorted(archive_path.glob("date=*")):
+        day = directory.name[len("date="):]
+        if start_date and day < start_date:
+            continue
+        if end_date and day > end_date:
+            continue
+        partitions.append(directory)
+    return partitions
+
+
+def _read_part(path, columns):
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(str(path), columns=columns)
+        yield from table.to_pylist()
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            yield {column: record.get(column) for column in columns} if columns else record
+
+
+def read_records(columns=None, start_date=None, end_date=None, archive_dir=ARCHIVE_DIR):
+    """날짜 범위의 레코드를 순서대로 반환 (columns 지정 시 해당 열만)"""
+    for directory in list_partitions(start_date, end_date, archive_dir):
+        for file_name in sorted(_load_index(directory)["parts"]):
+            yield from _read_part(directory / file_name, columns)
+
+
+def read_links(start_date=None, end_date=None, archive_dir=ARCHIVE_DIR):
+    """날짜 범위에 저장된 링크 집합 (레코드 파일은 읽지 않고 사이드카 색인만 사용)"""
+    links = set()
+    for directory in list_partitions(start_date, end_date, archive_dir):
+        links.update(_load_index(directory)["links"])
+    return links
+
+
+def read_fetch_status(start_date=None, end_date=None, archive_dir=ARCHIVE_DIR):
+    """날짜 범위에 기록된 실행별 검색 종료 사유 {run_id: {키워드: ...}} (사이드카 색인만 사용)"""
+    fetch_status = {}
+    for directory in list_partitions(start_date, end_date, archive_dir):
+        fetch_status.update(partition_fetch_status(directory))
+    return fetch_status
+
+
+def iter_runs(start_date=None, end_date=None, archive_dir=ARCHIVE_DIR):
+    """실행 단위로 (run_id, 수집 시각, 검색 시간, {키워드: 그룹 목록}) 복원"""
+    runs = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+    run_info = {}
+
+    for record in read_records(start_date=start_date, end_date=end_date, archive_dir=archive_dir):
+        run_id = record['run_id']
+        run_info[run_id] = (record['collected_at'], record['search_hours'])
+        news = {field: record[field] for field in NEWS_FIELDS}
+        runs[run_id][record['keyword']][record['group_rank']].append(news)
+
+    for run_id in sorted(runs):
+        collected_at, search_hours = run_info[run_id]
+        news_by_keyword = {
+            keyword: [groups[rank] for rank in sorted(groups)]
+            for keyword, groups in runs[run_id].items()
+        }
+        yield run_id, datetime.fromisoformat(collected_at).astimezone(KST), search_hours, news_by_keyword
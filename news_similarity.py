@@ -0,0 +1,555 @@
+# 유사 제목 그룹화 엔진
+# 제목을 한 번만 정규화하고, 문자 토큰 역색인(접두 필터)으로 후보 쌍만 골라 SequenceMatcher로 검증한다.
+
+import hashlib
+import json
+import math
+import os
+import re
+import struct
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from config import SIMILARITY_BACKEND as DEFAULT_BACKEND
+
+# 유사도 계산 방식 (환경 변수로 덮어쓰기 가능)
+# - "sequence": 역색인 후보 + SequenceMatcher (기본값)
+# - "matrix": 문자 2/3-gram 벡터 행렬 연산 (Dice 계수)
+SIMILARITY_BACKEND = os.environ.get('SIMILARITY_BACKEND', DEFAULT_BACKEND)
+
+# matrix 방식: 제목 수 × 어휘 수가 이 값을 넘으면 sequence 방식으로 대체 (메모리 보호)
+MATRIX_MAX_CELLS = 50_000_000
+
+# matrix 방식: 유사도 행렬을 한 번에 계산할 행 수
+MATRIX_BLOCK_ROWS = 256
+
+# 실행 간 제목 서명 색인 (MinHash LSH): 해시 함수 수 = 밴드 수 × 밴드당 행 수
+# 밴드당 3행이면 흔한 2-gram("알뜰", "요금" 등)만 겹치는 무관한 제목은 거의 같은 밴드에 들지 않고,
+# 밴드가 MINHASH_MIN_BANDS개 이상 겹친 기사만 후보로 읽는다 (최종 판정은 SequenceMatcher).
+# 합성 기사 기준 SequenceMatcher 0.6 이상인 이전 기사가 있는 제목의 약 98%가 후보에서 그 기사를 찾고, 후보는 저장소의 약 4%
+MINHASH_BANDS = 64
+MINHASH_BAND_ROWS = 3
+MINHASH_MIN_BANDS = 1
+# 서명 방식이 바뀌면 저장된 밴드를 다시 만들어야 하므로 저장소 meta에 함께 기록
+MINHASH_SCHEME = f"shake128-{MINHASH_BANDS}x{MINHASH_BAND_ROWS}"
+_MINHASH_PRIME = (1 << 31) - 1
+_MINHASH_ROW_FORMAT = f"<{MINHASH_BANDS * MINHASH_BAND_ROWS}I"
+# 유사도 비교 횟수 (실행 계측용, 프로세스 누적)
+# - pairs: 후보 쌍 판정 수, sequence_ratio: SequenceMatcher.ratio() 계산 수, matrix_cells: 행렬 방식 유사도 계산 칸 수
+comparison_stats = Counter()
+
+
+def clean_title(title):
+    """제목에서 HTML 태그 및 특수문자 제거"""
+    title = title.replace('<b>', '').replace('</b>', '')
+    title = title.replace('&quot;', '"').replace('&amp;', '&')
+    title = title.replace('&lt;', '<').replace('&gt;', '>')
+    return title.strip()
+
+
+def normalize_title(title):
+    """제목 정규화 (중복 비교용)"""
+    title = clean_title(title)
+    title = re.sub(r'\s+', ' ', title)
+    return title.lower().strip()
+
+
+def title_ngrams(norm_title, n=2):
+    """정규화된 제목의 문자 n-gram 집합"""
+    return {norm_title[k:k + n] for k in range(len(norm_title) - n + 1)}
+
+
+def title_tokens(norm_title):
+    """문자 빈도를 보존하는 토큰 목록 (같은 문자의 k번째 등장은 (문자, k))"""
+    seen = Counter()
+    tokens = []
+    for char in norm_title:
+        seen[char] += 1
+        tokens.append((char, seen[char]))
+    return tokens
+
+
+def prefix_length(length, threshold):
+    """접두 필터 길이
+
+    ratio >= threshold 이면 공통 문자 수 M >= threshold * length / (2 - threshold) 이므로,
+    희귀 토큰 순으로 정렬한 두 제목의 접두 (length - M + 1)개는 반드시 토큰을 공유한다.
+    """
+    required = math.ceil(threshold * length / (2 - threshold) - 1e-9)
+    return max(length - required + 1, 0)
+
+
+def build_candidate_index(norm_titles, threshold):
+    """후보 추출용 접두 토큰 역색인 생성 (문자 1-gram, 희귀 토큰 우선 접두 필터)
+
+    SequenceMatcher.ratio()는 문자 빈도 교집합으로 상한이 정해지므로 이 필터는 손실이 없다.
+    반환값: (제목별 접두 토큰 집합, 토큰 → 제목 인덱스 목록, 빈 제목 인덱스 목록)
+    """
+    tokens = [title_tokens(title) for title in norm_titles]
+    frequency = Counter(token for title_tokens_list in tokens for token in title_tokens_list)
+
+    prefixes = []
+    index = defaultdict(list)
+    empty_ids = []
+
+    for idx, title_tokens_list in enumerate(tokens):
+        if not title_tokens_list:
+            empty_ids.append(idx)
+        ordered = sorted(title_tokens_list, key=lambda token: (frequency[token], token))
+        prefix = set(ordered[:prefix_length(len(ordered), threshold)])
+        prefixes.append(prefix)
+        for token in prefix:
+            index[token].append(idx)
+
+    return prefixes, index, empty_ids
+
+
+def iter_candidates(i, prefixes, index, empty_ids, total, threshold):
+    """i번 제목과 임계값 이상일 수 있는 뒤쪽 제목 인덱스 (오름차순)"""
+    if threshold <= 0:
+        return range(i + 1, total)
+    if not prefixes[i]:
+        return [j for j in empty_ids if j > i]
+
+    candidates = set()
+    for token in prefixes[i]:
+        for j in index[token]:
+            if j > i:
+                candidates.add(j)
+    return sorted(candidates)
+
+
+def upper_bound(counts_a, counts_b, len_a, len_b):
+    """SequenceMatcher.ratio()의 상한값 (길이 및 문자 빈도 교집합 기준, quick_ratio와 동일)"""
+    total = len_a + len_b
+    if not total:
+        return 1.0
+    if len(counts_a) > len(counts_b):
+        counts_a, counts_b = counts_b, counts_a
+    matches = sum(min(count, counts_b.get(char, 0)) for char, count in counts_a.items())
+    return 2.0 * matches / total
+
+
+def char_set_bound(chars_a, chars_b, len_a, len_b):
+    """upper_bound()보다 느슨한 상한 (한쪽에만 있는 문자 종류 수 기준, 집합 연산만 써서 먼저 거르는 용도)"""
+    total = len_a + len_b
+    if not total:
+        return 1.0
+    return 2.0 * min(len_a - len(chars_a - chars_b), len_b - len(chars_b - chars_a)) / total
+
+
+class TitleComparer:
+    """정규화 제목 목록에 대한 유사도 판정기 (문자 빈도를 미리 계산해 상한값으로 먼저 걸러냄)"""
+
+    def __init__(self, norm_titles, threshold):
+        self.titles = norm_titles
+        self.threshold = threshold
+        self.counts = [Counter(title) for title in norm_titles]
+        self.matcher = SequenceMatcher(None)
+        self.seed = None
+
+    def similar(self, i, j):
+        """SequenceMatcher(None, titles[i], titles[j]).ratio() >= threshold 와 같은 판정 (두 제목 모두 정규화된 값)"""
+        comparison_stats['pairs'] += 1
+        bound = upper_bound(self.counts[i], self.counts[j], len(self.titles[i]), len(self.titles[j]))
+        if bound < self.threshold:
+            return False
+
+        if self.seed != i:
+            self.matcher.set_seq1(self.titles[i])
+            self.seed = i
+        self.matcher.set_seq2(self.titles[j])
+        comparison_stats['sequence_ratio'] += 1
+        return self.matcher.ratio() >= self.threshold
+
+
+def group_similar_titles(norm_titles, threshold):
+    """정규화된 제목 목록을 그룹화하여 인덱스 그룹 목록 반환
+
+    기존 방식과 같은 탐욕적 규칙(앞쪽 미사용 기사를 기준으로 뒤쪽 기사를 묶음)을 따르되,
+    역색인으로 고른 후보(기준 제목과 임계값 이상일 수 있는 제목)에 대해서만 유사도를 계산한다.
+    """
+    total = len(norm_titles)
+    prefixes, index, empty_ids = build_candidate_index(norm_titles, threshold)
+    comparer = TitleComparer(norm_titles, threshold)
+    used = [False] * total
+    groups = []
+
+    for i in range(total):
+        if used[i]:
+            continue
+
+        group = [i]
+        used[i] = True
+
+        for j in iter_candidates(i, prefixes, index, empty_ids, total, threshold):
+            if not used[j] and comparer.similar(i, j):
+                group.append(j)
+                used[j] = True
+
+        groups.append(group)
+
+    return groups
+
+
+class StoryTracker:
+    """스트리밍 모드의 근접 중복 판정 - 기사가 들어올 때마다 같은 범위의 기존 이야기와 비교
+
+    그룹화와 같은 기준(먼저 들어온 기사 제목을 기준으로 SequenceMatcher ratio >= threshold)으로
+    어느 이야기에도 속하지 않으면 새 이야기로 기록한다.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.leaders = defaultdict(list)  # 범위(키워드) -> [(기준 제목, 문자 빈도), ...]
+        self.matcher = SequenceMatcher(None)
+
+    def add(self, scope, norm_title):
+        """새 이야기면 True (기준 제목으로 기록), 기존 이야기와 유사하면 False"""
+        counts = Counter(norm_title)
+        self.matcher.set_seq2(norm_title)
+        for leader, leader_counts in self.leaders[scope]:
+            comparison_stats['pairs'] += 1
+            if upper_bound(leader_counts, counts, len(leader), len(norm_title)) < self.threshold:
+                continue
+            self.matcher.set_seq1(leader)
+            comparison_stats['sequence_ratio'] += 1
+            if self.matcher.ratio() >= self.threshold:
+                return False
+
+        self.leaders[scope].append((norm_title, counts))
+        return True
+
+
+def similarity_edges(norm_titles, floor):
+    """유사도가 floor 이상인 모든 쌍 [(i, j, ratio), ...] (i < j, ratio는 i를 기준 제목으로 계산)
+
+    floor 이상의 어떤 임계값에 대해서도 group_edges()로 group_similar_titles()와 같은 결과를 만들 수 있다.
+    """
+    total = len(norm_titles)
+    prefixes, index, empty_ids = build_candidate_index(norm_titles, floor)
+    counts = [Counter(title) for title in norm_titles]
+    matcher = SequenceMatcher(None)
+    edges = []
+
+    for i in range(total):
+        matcher.set_seq1(norm_titles[i])
+        for j in iter_candidates(i, prefixes, index, empty_ids, total, floor):
+            comparison_stats['pairs'] += 1
+            if upper_bound(counts[i], counts[j], len(norm_titles[i]), len(norm_titles[j])) < floor:
+                continue
+            matcher.set_seq2(norm_titles[j])
+            comparison_stats['sequence_ratio'] += 1
+            ratio = matcher.ratio()
+            if ratio >= floor:
+                edges.append((i, j, ratio))
+
+    return edges
+
+
+def group_edges(total, edges, threshold):
+    """similarity_edges() 결과로 임계값별 탐욕적 그룹화 (제목 비교 없이 간선만 사용)"""
+    neighbors = defaultdict(list)
+    for i, j, ratio in edges:
+        if ratio >= threshold:
+            neighbors[i].append(j)
+
+    used = [False] * total
+    groups = []
+    for i in range(total):
+        if used[i]:
+            continue
+        group = [i]
+        used[i] = True
+        for j in sorted(neighbors.get(i, ())):
+            if not used[j]:
+                group.append(j)
+                used[j] = True
+        groups.append(group)
+
+    return groups
+
+
+def title_features(norm_title):
+    """행렬 방식용 특징 집합 (문자 2-gram + 3-gram, 짧은 제목은 제목 자체)"""
+    features = title_ngrams(norm_title, 2) | title_ngrams(norm_title, 3)
+    return features or {norm_title}
+
+
+def build_feature_matrix(norm_titles):
+    """제목별 이진 n-gram 벡터 행렬과 제목별 특징 개수 반환
+
+    두 개 이상의 제목에 등장하는 특징만 열로 사용한다 (나머지는 교집합에 기여하지 않음).
+    어휘가 너무 커서 MATRIX_MAX_CELLS를 넘으면 None을 반환한다.
+    """
+    import numpy as np
+
+    features = [title_features(title) for title in norm_titles]
+    sizes = np.array([len(f) for f in features], dtype=np.float32)
+
+    doc_freq = defaultdict(int)
+    for title_features_set in features:
+        for feature in title_features_set:
+            doc_freq[feature] += 1
+    vocab = {feature: col for col, feature in enumerate(f for f, df in doc_freq.items() if df > 1)}
+
+    if len(norm_titles) * max(len(vocab), 1) > MATRIX_MAX_CELLS:
+        return None, sizes
+
+    matrix = np.zeros((len(norm_titles), max(len(vocab), 1)), dtype=np.float32)
+    for row, title_features_set in enumerate(features):
+        cols = [vocab[f] for f in title_features_set if f in vocab]
+        matrix[row, cols] = 1.0
+
+    return matrix, sizes
+
+
+def group_similar_titles_matrix(norm_titles, threshold, metric="dice"):
+    """행렬 곱으로 전체 유사도를 블록 단위 계산하여 그룹화 (탐욕 규칙은 sequence 방식과 동일)
+
+    metric: "dice" = 2|A∩B|/(|A|+|B|), "cosine" = |A∩B|/sqrt(|A||B|)
+    """
+    import numpy as np
+
+    total = len(norm_titles)
+    matrix, sizes = build_feature_matrix(norm_titles)
+    if matrix is None:
+        print(f"  matrix backend: {total}개 제목의 어휘가 너무 커서 sequence 방식으로 대체")
+        return group_similar_titles(norm_titles, threshold)
+
+    used = np.zeros(total, dtype=bool)
+    groups = []
+    block = None
+    block_start = 0
+
+    for i in range(total):
+        if used[i]:
+            continue
+
+        if block is None or i >= block_start + len(block):
+            block_start = i
+            rows = matrix[i:i + MATRIX_BLOCK_ROWS]
+            intersections = rows @ matrix.T
+            comparison_stats['matrix_cells'] += intersections.size
+            if metric == "cosine":
+                block = intersections / np.sqrt(np.outer(sizes[i:i + MATRIX_BLOCK_ROWS], sizes))
+            else:
+                block = 2.0 * intersections / (sizes[i:i + MATRIX_BLOCK_ROWS, None] + sizes[None, :])
+
+        similar = block[i - block_start] >= threshold
+        similar[:i + 1] = False
+        members = np.flatnonzero(similar & ~used)
+
+        used[i] = True
+        used[members] = True
+        groups.append([i] + members.tolist())
+
+    return groups
+
+
+def group_titles(norm_titles, threshold, backend=None):
+    """설정된 방식으로 정규화 제목 그룹화"""
+    backend = backend or SIMILARITY_BACKEND
+    if backend == "matrix":
+        return group_similar_titles_matrix(norm_titles, threshold)
+    return group_similar_titles(norm_titles, threshold)
+
+
+def group_news(news_list, threshold, backend=None):
+    """뉴스 목록을 유사 제목 기준으로 그룹화 (뉴스 dict 그룹 목록 반환)"""
+    if not news_list:
+        return []
+
+    norm_titles = [normalize_title(news['title']) for news in news_list]
+    return [
+        [news_list[idx] for idx in group]
+        for group in group_titles(norm_titles, threshold, backend)
+    ]
+
+
+class UnionFind:
+    """전역 클러스터링용 union-find (경로 압축 + 크기 기준 합치기)"""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+
+def cluster_titles(norm_titles, threshold):
+    """역색인 후보 쌍 중 임계값 이상인 쌍을 연결한 클러스터 목록 반환
+
+    단순 연결(single-link)로 인한 연쇄 병합을 막기 위해, 서로 다른 클러스터는
+    각 클러스터의 기준 제목(가장 앞쪽 기사)끼리도 임계값 이상일 때만 합친다.
+    이미 같은 클러스터이거나 기준 제목끼리 유사하지 않다고 확인된 클러스터 쌍은 다시 비교하지 않는다.
+    클러스터와 그 안의 인덱스는 오름차순이다.
+    """
+    total = len(norm_titles)
+    prefixes, index, empty_ids = build_candidate_index(norm_titles, threshold)
+    comparer = TitleComparer(norm_titles, threshold)
+    seed_comparer = TitleComparer(norm_titles, threshold)
+    clusters = UnionFind(total)
+    seeds = list(range(total))
+
+    rejected = set()
+
+    for i in range(total):
+        for j in iter_candidates(i, prefixes, index, empty_ids, total, threshold):
+            root_i, root_j = clusters.find(i), clusters.find(j)
+            if root_i == root_j:
+                continue
+
+            seed_a, seed_b = sorted((seeds[root_i], seeds[root_j]))
+            if (seed_a, seed_b) in rejected:
+                continue
+            if (seed_a, seed_b) != (i, j) and not seed_comparer.similar(seed_a, seed_b):
+                rejected.add((seed_a, seed_b))
+                continue
+            if not comparer.similar(i, j):
+                continue
+
+            clusters.union(i, j)
+            seeds[clusters.find(i)] = seed_a
+
+    members = defaultdict(list)
+    for idx in range(total):
+        members[clusters.find(idx)].append(idx)
+    return sorted(members.values(), key=lambda group: group[0])
+
+
+def cluster_news_globally(news_by_keyword, keywords, threshold):
+    """모든 키워드의 기사를 한 번에 클러스터링하고, 클러스터를 최우선 키워드에 배정
+
+    news_by_keyword는 remove_duplicates 결과이며, 반환값은 keywords 순서의 {키워드: 그룹 목록}이다.
+    """
+    priority = {keyword: rank for rank, keyword in enumerate(keywords)}
+    articles = [
+        (keyword, news)
+        for keyword in keywords
+        for news in news_by_keyword.get(keyword, [])
+    ]
+    norm_titles = [normalize_title(news['title']) for _, news in articles]
+
+    grouped = defaultdict(list)
+    for cluster in cluster_titles(norm_titles, threshold):
+        keyword = min((articles[idx][0] for idx in cluster), key=priority.get)
+        grouped[keyword].append([articles[idx][1] for idx in cluster])
+
+    return {keyword: grouped[keyword] for keyword in keywords if grouped.get(keyword)}
+
+
+def minhash_signature(norm_title):
+    """정규화 제목의 문자 2-gram MinHash 서명 (실행 간에 같은 값이 나오는 고정 해시)
+
+    2-gram마다 SHAKE-128 출력을 32비트씩 잘라 해시 함수 MINHASH_BANDS × MINHASH_BAND_ROWS개의 값으로 쓰고,
+    위치별 최솟값을 취한다 (해시 계산과 최솟값 모두 C 수준에서 처리).
+    """
+    shingles = title_ngrams(norm_title) or {norm_title}
+    size = struct.calcsize(_MINHASH_ROW_FORMAT)
+    columns = [
+        struct.unpack(_MINHASH_ROW_FORMAT, hashlib.shake_128(shingle.encode('utf-8')).digest(size))
+        for shingle in shingles
+    ]
+    return list(map(min, zip(*columns)))
+
+
+def lsh_band_hashes(norm_title):
+    """LSH 밴드별 해시 목록 [(밴드 번호, 해시), ...] (밴드 해시가 하나라도 같으면 후보)"""
+    signature = minhash_signature(norm_title)
+    bands = []
+    for band in range(MINHASH_BANDS):
+        value = 0
+        for row in signature[band * MINHASH_BAND_ROWS:(band + 1) * MINHASH_BAND_ROWS]:
+            value = value * _MINHASH_PRIME + row
+        bands.append((band, value & 0x7FFFFFFFFFFFFFFF))
+    return bands
+
+
+def title_similarity(norm_a, norm_b):
+    """정규화 제목 유사도 (그룹화와 같은 SequenceMatcher 기준, norm_a가 기준 제목)"""
+    comparison_stats['sequence_ratio'] += 1
+    return SequenceMatcher(None, norm_a, norm_b).ratio()
+
+
+def co_grouped_pairs(groups):
+    """같은 그룹으로 묶인 (작은 인덱스, 큰 인덱스) 쌍 집합"""
+    return {
+        (a, b) if a < b else (b, a)
+        for group in groups
+        for a, b in combinations(group, 2)
+    }
+
+
+def compare_backends(news_list, threshold):
+    """sequence 방식 대비 matrix 방식의 그룹화 차이 요약
+
+    반환값의 pair_agreement는 두 방식이 같은 판단(같은 그룹/다른 그룹)을 내린 기사 쌍의 비율이다.
+    """
+    norm_titles = [normalize_title(news['title']) for news in news_list]
+    baseline = group_similar_titles(norm_titles, threshold)
+    candidate = group_similar_titles_matrix(norm_titles, threshold)
+
+    baseline_pairs = co_grouped_pairs(baseline)
+    candidate_pairs = co_grouped_pairs(candidate)
+    total_pairs = len(news_list) * (len(news_list) - 1) // 2
+    disagreements = len(baseline_pairs ^ candidate_pairs)
+
+    def titles(pairs):
+        return [(clean_title(news_list[a]['title']), clean_title(news_list[b]['title'])) for a, b in sorted(pairs)]
+
+    return {
+        "articles": len(news_list),
+        "sequence_groups": len(baseline),
+        "matrix_groups": len(candidate),
+        "identical": baseline == candidate,
+        "pair_agreement": 1.0 - disagreements / total_pairs if total_pairs else 1.0,
+        "only_sequence": titles(baseline_pairs - candidate_pairs),
+        "only_matrix": titles(candidate_pairs - baseline_pairs)
+    }
+
+
+def print_backend_comparison(keyword, news_list, threshold, max_examples=3):
+    """compare_backends 결과를 로그로 출력"""
+    report = compare_backends(news_list, threshold)
+    print(
+        f"  [compare] {keyword}: sequence {report['sequence_groups']}개 그룹 / "
+        f"matrix {report['matrix_groups']}개 그룹, 쌍 일치율 {report['pair_agreement']:.3f}"
+    )
+    for label in ("only_sequence", "only_matrix"):
+        for title_a, title_b in report[label][:max_examples]:
+            print(f"    {label}: {title_a} ↔ {title_b}")
+    return report
+
+
+if __name__ == "__main__":
+    # python news_similarity.py mvno_news/mvno_news_YYYYMMDD_HHMMSS.json [임계값]
+    # 저장된 수집 결과로 sequence/matrix 방식의 그룹화 차이 확인
+    if len(sys.argv) < 2:
+        print("Usage: python news_similarity.py <news json> [threshold]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    threshold = float(sys.argv[2]) if len(sys.argv) > 2 else data.get('similarity_threshold', 0.60)
+
+    for keyword, groups in data.get('news_by_keyword', {}).items():
+        articles = [news for group in groups for news in group]
+        if articles:
+            print_backend_comparison(keyword, articles, threshold)
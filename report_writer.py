@@ -0,0 +1,154 @@
+# 리포트 출력 (JSON, Excel, Markdown 공용)
+# 그룹화된 뉴스를 한 번만 순회하며 세 형식에 바로 기록한다.
+# 그룹별 대표 기사/정리된 제목은 한 번만 계산하고, Excel은 openpyxl write-only 모드로 스트리밍 저장한다.
+
+import json
+from contextlib import ExitStack
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from config import KEYWORDS
+from news_similarity import clean_title
+
+EXCEL_COLUMNS = ["키워드", "제목", "링크", "발행일", "유사기사수", "그룹크기"]
+
+# pandas to_excel과 같은 헤더 서식
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def select_representative_title(group):
+    """그룹에서 대표 제목 선택 (가장 정보가 풍부한 제목)"""
+    return max(group, key=lambda x: len(clean_title(x['title'])))
+
+
+def _dumps(value, level):
+    """json.dump(indent=2)와 같은 형식으로 level 단계 들여쓴 JSON 문자열"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace("\n", "\n" + "  " * level)
+
+
+class _JsonStream:
+    """json.dump(data, ensure_ascii=False, indent=2)와 같은 결과를 순서대로 기록"""
+
+    def __init__(self, f, header):
+        self.f = f
+        self.keyword_count = 0
+        self.group_count = 0
+        f.write("{")
+        for key, value in header.items():
+            f.write(f"\n  {json.dumps(key, ensure_ascii=False)}: {_dumps(value, 1)},")
+        f.write('\n  "news_by_keyword": {')
+
+    def begin_keyword(self, keyword, has_groups):
+        prefix = "," if self.keyword_count else ""
+        self.keyword_count += 1
+        self.group_count = 0
+        self.f.write(f"{prefix}\n    {json.dumps(keyword, ensure_ascii=False)}: {'[' if has_groups else '[]'}")
+
+    def group(self, group):
+        prefix = "," if self.group_count else ""
+        self.group_count += 1
+        self.f.write(f"{prefix}\n      {_dumps(group, 3)}")
+
+    def end_keyword(self, has_groups):
+        if has_groups:
+            self.f.write("\n    ]")
+
+    def close(self):
+        self.f.write("\n  }\n}" if self.keyword_count else "}\n}")
+
+
+class _ExcelStream:
+    """write-only 워크북에 행 단위로 기록 (행이 없으면 파일을 만들지 않음)"""
+
+    def __init__(self):
+        self.workbook = None
+        self.sheet = None
+        self.rows = 0
+
+    def row(self, values):
+        if self.workbook is None:
+            self.workbook = Workbook(write_only=True)
+            self.sheet = self.workbook.create_sheet("Sheet1")
+            header = []
+            for name in EXCEL_COLUMNS:
+                cell = WriteOnlyCell(self.sheet, value=name)
+                cell.font = _HEADER_FONT
+                cell.border = _HEADER_BORDER
+                cell.alignment = _HEADER_ALIGNMENT
+                header.append(cell)
+            self.sheet.append(header)
+        self.sheet.append(values)
+        self.rows += 1
+
+    def save(self, path):
+        if self.workbook is None:
+            return False
+        self.workbook.save(path)
+        return True
+
+
+def write_reports(grouped_news_by_keyword, json_path, json_header, excel_path, md_path, md_header):
+    """그룹화된 뉴스를 JSON/Excel/Markdown으로 한 번에 기록
+
+    json_path: None이면 JSON은 기록하지 않음
+    json_header: news_by_keyword 앞에 들어갈 JSON 필드 (순서 유지)
+    md_header: Markdown 본문 앞부분 (제목, 수집 정보, 구분선)
+    반환값: Excel 파일 생성 여부
+    """
+    excel = _ExcelStream()
+
+    with ExitStack() as stack:
+        md_file = stack.enter_context(open(md_path, 'w', encoding='utf-8'))
+        json_stream = None
+        if json_path:
+            json_stream = _JsonStream(stack.enter_context(open(json_path, 'w', encoding='utf-8')), json_header)
+        md_file.write(md_header)
+
+        for keyword in KEYWORDS:
+            if keyword not in grouped_news_by_keyword:
+                continue
+
+            groups = grouped_news_by_keyword[keyword]
+            if json_stream:
+                json_stream.begin_keyword(keyword, bool(groups))
+            if groups:
+                total_in_keyword = sum(len(group) for group in groups)
+                md_file.write(f"## 🔍 {keyword} ({total_in_keyword}개)\n\n")
+
+            for idx, group in enumerate(groups, 1):
+                if json_stream:
+                    json_stream.group(group)
+
+                representative = select_representative_title(group)
+                title = clean_title(representative['title'])
+                link = representative['link']
+                pub_date = representative['pubDate']
+                similar_count = len(group) - 1
+
+                excel.row([keyword, title, link, pub_date, similar_count, len(group)])
+
+                md_file.write(f"### {idx}. {title}\n")
+                if similar_count > 0:
+                    md_file.write(f"**유사 기사**: {similar_count}건\n")
+                md_file.write(f"**링크**: {link}\n")
+                md_file.write(f"**발행일**: {pub_date}\n\n")
+
+                if similar_count > 0:
+                    md_file.write("**유사 기사 목록**:\n")
+                    for similar_news in group[1:]:
+                        md_file.write(f"- {clean_title(similar_news['title'])}\n")
+                        md_file.write(f"  - {similar_news['link']}\n")
+                    md_file.write("\n")
+
+            if json_stream:
+                json_stream.end_keyword(bool(groups))
+
+        if json_stream:
+            json_stream.close()
+
+    return excel.save(excel_path)
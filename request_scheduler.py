@@ -0,0 +1,184 @@
+# 네이버 API 요청 스케줄러
+# 모든 네이버 호출이 이곳을 거치며, 토큰 버킷 속도 제한 / 429·5xx 재시도(지수 백오프+지터) /
+# 일일 호출 한도(실행 간 유지)를 적용하고 재시도·대기 통계를 남긴다.
+
+import atexit
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+import requests
+
+KST = pytz.timezone('Asia/Seoul')
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class QuotaExceededError(Exception):
+    """일일 API 호출 한도 초과"""
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 모아 쓸 수 있는 토큰 버킷"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기하고, 대기한 시간(초)을 반환"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class DailyQuota:
+    """KST 날짜별 호출 횟수를 파일에 저장하는 일일 한도"""
+
+    def __init__(self, path, daily_limit, keep_days=7):
+        self.path = Path(path)
+        self.daily_limit = daily_limit
+        self.keep_days = keep_days
+        self.lock = threading.Lock()
+        self.counts = {}
+        self.persist = True  # False면 저장하지 않음 (샤드 프로세스, 호출 횟수는 병합 단계에서 합산)
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.counts = json.load(f)
+            except Exception:
+                self.counts = {}
+
+    @staticmethod
+    def today():
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    def used(self):
+        return self.counts.get(self.today(), 0)
+
+    def remaining(self):
+        return max(self.daily_limit - self.used(), 0)
+
+    def consume(self):
+        """호출 1회를 기록 (한도를 넘으면 QuotaExceededError)"""
+        with self.lock:
+            today = self.today()
+            if self.counts.get(today, 0) >= self.daily_limit:
+                raise QuotaExceededError(f"daily quota {self.daily_limit} exhausted for {today}")
+            self.counts[today] = self.counts.get(today, 0) + 1
+
+    def add(self, count):
+        """다른 프로세스(샤드)가 사용한 호출 횟수 합산 (한도 확인 없음)"""
+        with self.lock:
+            today = self.today()
+            self.counts[today] = self.counts.get(today, 0) + count
+
+    def save(self):
+        if not self.persist:
+            return
+        with self.lock:
+            recent = sorted(self.counts)[-self.keep_days:]
+            self.counts = {day: self.counts[day] for day in recent}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.counts, f, ensure_ascii=False, indent=2)
+
+
+class RequestScheduler:
+    """속도 제한·재시도·일일 한도를 적용하는 HTTP 요청 실행기"""
+
+    def __init__(self, session_factory, bucket, quota, max_retries=4, backoff_base=1.0, backoff_max=30.0):
+        self.session_factory = session_factory
+        self.bucket = bucket
+        self.quota = quota
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'bytes': 0,
+            'retried': 0,
+            'failed': 0,
+            'throttled': 0,
+            'throttle_wait_sec': 0.0
+        }
+
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def backoff_delay(self, attempt, response=None):
+        """재시도 대기 시간 (Retry-After 우선, 없으면 지수 백오프 + full jitter)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def request(self, method, url, **kwargs):
+        """요청 실행 (429/5xx/연결 오류는 max_retries회까지 재시도, 마지막 응답 또는 예외 반환)"""
+        for attempt in range(self.max_retries + 1):
+            self.quota.consume()
+            waited = self.bucket.acquire()
+            if waited > 0:
+                self._count('throttled')
+                self._count('throttle_wait_sec', waited)
+
+            self._count('requests')
+            try:
+                response = self.session_factory().request(method, url, **kwargs)
+                self._count('bytes', len(response.content))
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self._count('failed')
+                    raise
+                self._count('retried')
+                time.sleep(self.backoff_delay(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                if response.status_code in RETRY_STATUS_CODES:
+                    self._count('failed')
+                return response
+
+            self._count('retried')
+            time.sleep(self.backoff_delay(attempt, response))
+
+    def reset_stats(self):
+        """통계 초기화 (데몬 모드에서 주기별 통계를 따로 집계)"""
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0.0 if key == 'throttle_wait_sec' else 0
+
+    def summary(self):
+        """통계 dict (일일 한도 사용량 포함)"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats['throttle_wait_sec'] = round(stats['throttle_wait_sec'], 3)
+        stats['quota_used_today'] = self.quota.used()
+        stats['quota_remaining'] = self.quota.remaining()
+        return stats
+
+
+def create_scheduler(session_factory, rate, burst, daily_limit, quota_path, max_retries):
+    """스케줄러 생성 (프로세스 종료 시 일일 호출 횟수 저장)"""
+    quota = DailyQuota(quota_path, daily_limit)
+    atexit.register(quota.save)
+    return RequestScheduler(session_factory, TokenBucket(rate, burst), quota, max_retries=max_retries)
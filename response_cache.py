@@ -0,0 +1,128 @@
+# 네이버 검색 API 응답 디스크 캐시
+# (query, display, start, sort)별로 200 응답을 저장해, 워크플로우 재실행이나 저장 단계에서 중단된 실행을
+# 다시 돌릴 때 같은 요청을 API 호출(일일 한도) 없이 처리한다.
+# - "on": TTL 안의 응답은 캐시에서, 나머지는 API 호출 후 저장 (기본값)
+# - "refresh": 캐시를 읽지 않고 API 호출 후 저장
+# - "offline": 캐시만 사용 (TTL 무시, 없는 요청은 504 응답), 그룹화/리포트 변경을 네트워크 없이 재현할 때
+# - "off": 캐시 사용 안 함
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+CACHE_MODES = ("on", "refresh", "offline", "off")
+
+
+def cache_key(query, display, start, sort):
+    """요청 파라미터별 캐시 키 (sha1)"""
+    raw = json.dumps([query, display, start, sort], ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def make_response(status_code, content, url=""):
+    """캐시된 본문으로 requests.Response 생성 (호출 측은 API 응답과 똑같이 사용)"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.encoding = 'utf-8'
+    response.headers['Content-Type'] = "application/json; charset=utf-8"
+    response.url = url
+    return response
+
+
+class ResponseCache:
+    """요청 파라미터별 응답 파일 캐시 (directory/<키 앞 2자리>/<키>.json)"""
+
+    def __init__(self, directory, ttl_min, mode="on", keep_days=3):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"NAVER_CACHE_MODE must be one of {CACHE_MODES}: {mode}")
+        self.directory = Path(directory)
+        self.ttl_sec = ttl_min * 60
+        self.mode = mode
+        self.keep_sec = keep_days * 86400
+        self.lock = threading.Lock()
+        self.pruned = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stored': 0,
+            'offline_misses': 0
+        }
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _path(self, key):
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, query, display, start, sort):
+        """캐시된 응답 (없거나 TTL이 지났으면 None, offline 모드에서는 없으면 504 응답)"""
+        if self.mode in ("off", "refresh"):
+            return None
+
+        key = cache_key(query, display, start, sort)
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry and (self.mode == "offline" or time.time() - entry['fetched_ts'] < self.ttl_sec):
+            self._count('hits')
+            return make_response(200, entry['body'].encode('utf-8'))
+
+        if self.mode == "offline":
+            self._count('offline_misses')
+            body = {"errorMessage": "Not in offline cache.", "errorCode": "CACHE_MISS"}
+            return make_response(504, json.dumps(body).encode('utf-8'))
+
+        self._count('misses')
+        return None
+
+    def put(self, query, display, start, sort, response):
+        """200 응답 저장 (임시 파일에 쓴 뒤 교체)"""
+        if self.mode in ("off", "offline") or response.status_code != 200:
+            return
+
+        self._prune_once()
+        key = cache_key(query, display, start, sort)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        entry = {
+            'params': {'query': query, 'display': display, 'start': start, 'sort': sort},
+            'fetched_ts': time.time(),
+            'body': response.content.decode('utf-8')
+        }
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self._count('stored')
+
+    def _prune_once(self):
+        """keep_days보다 오래된 캐시 파일 삭제 (프로세스당 한 번, 첫 저장 시)"""
+        with self.lock:
+            if self.pruned or not self.keep_sec:
+                return
+            self.pruned = True
+        oldest = time.time() - self.keep_sec
+        for path in self.directory.glob("*/*.json"):
+            try:
+                if path.stat().st_mtime < oldest:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def summary(self):
+        with self.lock:
+            return dict(self.stats)
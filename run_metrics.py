@@ -0,0 +1,174 @@
+# 실행 계측 (단계별 소요 시간/메모리, 카운터) 및 내보내기
+# 단계별 시간과 메모리, HTTP·유사도 비교 카운터를 모아 실행 JSON의 statistics에 넣고,
+# METRICS_EXPORT 설정에 따라 Prometheus textfile(.prom) / JSON lines로 저장한다.
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+
+from config import METRICS_DIR, METRICS_EXPORT as DEFAULT_METRICS_EXPORT
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 내보내기 형식 (쉼표 구분: "prometheus", "jsonl", 빈 값이면 내보내지 않음)
+METRICS_EXPORT = os.environ.get('METRICS_EXPORT', DEFAULT_METRICS_EXPORT)
+
+# 1이면 단계별 최대 메모리를 tracemalloc으로 측정 (정확하지만 느림, 기본은 프로세스 최대 RSS)
+METRICS_TRACE_MEMORY = os.environ.get('METRICS_TRACE_MEMORY', '0') == '1'
+
+# stage()가 tracemalloc.reset_peak()로 지운 최대값 (run_profiler가 전체 실행의 최대값을 구할 때 사용)
+_cleared_peak = 0
+
+
+def traced_memory():
+    """tracemalloc 현재/최대 메모리 (bytes), 최대값은 stage()의 reset_peak() 이전 값 포함"""
+    current, peak = tracemalloc.get_traced_memory()
+    return current, max(peak, _cleared_peak)
+
+
+def max_rss_mb():
+    """프로세스 최대 RSS(MB, 측정 불가 시 None)"""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class RunMetrics:
+    """한 번의 실행에 대한 단계별 시간/메모리와 카운터"""
+
+    def __init__(self, job, trace_memory=None):
+        self.job = job
+        self.trace_memory = METRICS_TRACE_MEMORY if trace_memory is None else trace_memory
+        self.started_at = datetime.now(KST)
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """with metrics.stage("fetch"): ... 블록의 소요 시간과 최대 메모리 기록"""
+        global _cleared_peak
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            _cleared_peak = max(_cleared_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {"seconds": round(time.perf_counter() - started, 4), "max_rss_mb": max_rss_mb()}
+            if self.trace_memory:
+                record["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 2)
+            if tracing:
+                tracemalloc.stop()
+            with self.lock:
+                previous = self.stages.get(name)
+                if previous:
+                    record["seconds"] = round(previous["seconds"] + record["seconds"], 4)
+                self.stages[name] = record
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_counters(self, prefix, values):
+        """다른 모듈의 통계 dict를 prefix_이름 카운터로 기록 (숫자 값만)"""
+        with self.lock:
+            for name, value in values.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    self.counters[f"{prefix}_{name}"] = value
+
+    def summary(self):
+        """실행 JSON의 statistics에 넣을 요약"""
+        with self.lock:
+            return {
+                "job": self.job,
+                "started_at": self.started_at.isoformat(),
+                "total_seconds": round(time.perf_counter() - self.started, 4),
+                "max_rss_mb": max_rss_mb(),
+                "stages": {name: dict(record) for name, record in self.stages.items()},
+                "counters": dict(self.counters)
+            }
+
+    def prometheus_text(self, summary):
+        """Prometheus textfile collector 형식"""
+        labels = f'job="{self.job}"'
+        lines = [
+            "# HELP mvno_news_run_timestamp_seconds Start time of the last run",
+            "# TYPE mvno_news_run_timestamp_seconds gauge",
+            f"mvno_news_run_timestamp_seconds{{{labels}}} {self.started_at.timestamp():.0f}",
+            "# HELP mvno_news_run_duration_seconds Wall time of the last run",
+            "# TYPE mvno_news_run_duration_seconds gauge",
+            f"mvno_news_run_duration_seconds{{{labels}}} {summary['total_seconds']}",
+            "# HELP mvno_news_stage_duration_seconds Wall time per pipeline stage",
+            "# TYPE mvno_news_stage_duration_seconds gauge"
+        ]
+        for name, record in summary["stages"].items():
+            lines.append(f'mvno_news_stage_duration_seconds{{{labels},stage="{name}"}} {record["seconds"]}')
+        if any("peak_mb" in record for record in summary["stages"].values()):
+            lines += [
+                "# HELP mvno_news_stage_peak_bytes Peak traced memory per pipeline stage",
+                "# TYPE mvno_news_stage_peak_bytes gauge"
+            ]
+            for name, record in summary["stages"].items():
+                if "peak_mb" in record:
+                    lines.append(
+                        f'mvno_news_stage_peak_bytes{{{labels},stage="{name}"}} {int(record["peak_mb"] * 1024 * 1024)}'
+                    )
+        if summary["max_rss_mb"] is not None:
+            lines += [
+                "# HELP mvno_news_max_rss_bytes Peak resident set size of the run",
+                "# TYPE mvno_news_max_rss_bytes gauge",
+                f"mvno_news_max_rss_bytes{{{labels}}} {int(summary['max_rss_mb'] * 1024 * 1024)}"
+            ]
+        lines += [
+            "# HELP mvno_news_run_counter Counters of the last run (HTTP, similarity comparisons, articles)",
+            "# TYPE mvno_news_run_counter gauge"
+        ]
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f'mvno_news_run_counter{{{labels},name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, formats=None, directory=METRICS_DIR):
+        """설정된 형식으로 저장하고 저장한 파일 경로 목록 반환"""
+        formats = [f.strip() for f in (METRICS_EXPORT if formats is None else formats).split(",") if f.strip()]
+        if not formats:
+            return []
+
+        summary = self.summary()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+
+        if "prometheus" in formats:
+            path = directory / f"{self.job}.prom"
+            temp_path = path.with_suffix(".prom.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text(summary))
+            os.replace(temp_path, path)
+            paths.append(path)
+
+        if "jsonl" in formats:
+            path = directory / f"{self.job}_metrics.jsonl"
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            paths.append(path)
+
+        for path in paths:
+            print(f"✓ Metrics 저장: {path}")
+        return paths
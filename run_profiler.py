@@ -0,0 +1,176 @@
+# 실행 프로파일링 (선택, PROFILE_RUN=1)
+# main()을 cProfile + tracemalloc으로 감싸 실행하고, REPORTS_DIR에
+#   profile_<스크립트>_YYYYMMDD_HHMMSS.pstats  (python -m pstats / snakeviz 등으로 분석)
+#   profile_<스크립트>_YYYYMMDD_HHMMSS.txt     (주요 함수별 호출 수/시간 + 누적 시간 상위 함수 + 메모리 할당 상위 위치)
+# 를 저장한다. 예약 실행의 실제 데이터에서만 나타나는 문제를 확인하기 위한 용도.
+# cProfile은 호출한 스레드만 측정하므로, 실행 중 새로 시작되는 스레드(키워드 검색 워커,
+# body-fetch, telegram-notifier)에도 스레드별 프로파일러를 붙이고 결과를 합친다.
+# Python 3.12 이상에서는 프로파일러를 동시에 하나만 켤 수 있어(sys.monitoring) 스레드별 프로파일러를
+# 붙이지 못하고 메인 스레드 프로파일만 남는다 (워크플로우는 3.11).
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+
+from config import REPORTS_DIR
+from run_metrics import traced_memory
+
+KST = pytz.timezone('Asia/Seoul')
+
+# 프로파일링 여부 (환경 변수, 기본값 끔)
+PROFILE_RUN = os.environ.get('PROFILE_RUN', '0') == '1'
+
+# 보고서에 따로 표시할 함수 (파일 이름, 함수 이름), 파일 이름이 None이면 저장소 내 모든 파일
+HOT_FUNCTIONS = [
+    ("news_similarity.py", "group_similar_titles"),  # 그룹화 (후보 색인 + TitleComparer)
+    ("news_similarity.py", "similar"),             # 그룹화 유사도 판정 (TitleComparer)
+    ("news_similarity.py", "title_similarity"),    # 재게재 기사 판정
+    ("news_similarity.py", "minhash_signature"),   # 재게재 기사 제목 서명
+    ("article_store.py", "find_repeat"),
+    (None, "normalize_title"),
+    (None, "parse_pub_date"),
+    (None, "load_existing_news"),
+    (None, "remove_duplicates"),
+    (None, "stream_collect"),
+    ("article_body.py", "fetch"),                  # 기사 본문 요청 (캐시/조건부 요청 포함)
+    ("article_body.py", "extract_text"),           # 기사 본문 추출
+    ("news_similarity.py", "add"),                 # 스트리밍 모드 근접 중복 판정 (StoryTracker)
+    (None, "group_all_news"),
+    ("report_writer.py", "write_reports"),         # JSON/Excel/Markdown 기록 (기존 DataFrame.to_excel)
+    ("report_writer.py", "save"),                  # Excel 파일 저장
+    (None, "send_telegram_summary"),
+    ("telegram_notifier.py", "send")               # 보관함 기록 (전송은 백그라운드 스레드)
+]
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def _is_hot(filename, funcname):
+    path = Path(filename)
+    if REPO_DIR not in path.resolve().parents:
+        return False
+    return any(
+        funcname == name and (file_name is None or path.name == file_name)
+        for file_name, name in HOT_FUNCTIONS
+    )
+
+
+def hot_function_report(stats):
+    """HOT_FUNCTIONS별 호출 수, 자체 시간, 누적 시간"""
+    lines = [f"{'function':<60} {'calls':>10} {'tottime':>10} {'cumtime':>10}"]
+    rows = []
+    for (filename, line, funcname), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        if _is_hot(filename, funcname):
+            rows.append((cumtime, f"{Path(filename).name}:{line}({funcname})", ncalls, tottime))
+    for cumtime, label, ncalls, tottime in sorted(rows, reverse=True):
+        lines.append(f"{label:<60} {ncalls:>10} {tottime:>10.3f} {cumtime:>10.3f}")
+    return "\n".join(lines)
+
+
+def allocation_report(snapshot):
+    """할당 크기 상위 위치 (파일:줄)"""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>")
+    ])
+    lines = []
+    for rank, stat in enumerate(snapshot.statistics("lineno")[:TOP_ALLOCATIONS], 1):
+        frame = stat.traceback[0]
+        lines.append(f"{rank:>3}. {frame.filename}:{frame.lineno}  {stat.size / 1024:.1f} KiB  ({stat.count} blocks)")
+    return "\n".join(lines)
+
+
+class ThreadProfilers:
+    """threading.setprofile()로 이후 시작되는 스레드마다 cProfile.Profile을 붙여 모음"""
+
+    def __init__(self):
+        self.profilers = []
+        self.unprofiled = 0  # 프로파일러를 붙이지 못한 스레드 수 (Python 3.12 이상)
+        self.lock = threading.Lock()
+
+    def _attach(self, frame, event, arg):
+        # 새 스레드의 첫 이벤트에서 호출됨: 이 스레드 전용 프로파일러로 교체
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # "Another profiling tool is already active" - 메인 스레드 프로파일만 사용
+            with self.lock:
+                self.unprofiled += 1
+            return
+        with self.lock:
+            self.profilers.append(profiler)
+
+    def start(self):
+        threading.setprofile(self._attach)
+
+    def stop(self):
+        """새 스레드 측정을 멈추고 지금까지의 스레드별 프로파일러 목록 반환"""
+        threading.setprofile(None)
+        with self.lock:
+            return list(self.profilers)
+
+
+def profile_main(main_fn, job):
+    """main_fn()을 프로파일링하며 실행하고 결과 파일을 REPORTS_DIR에 저장"""
+    timestamp = datetime.now(KST).strftime("%Y%m%d_%H%M%S")
+    profiler = cProfile.Profile()
+    thread_profilers = ThreadProfilers()
+    tracemalloc.start(10)
+    thread_profilers.start()
+
+    try:
+        return profiler.runcall(main_fn)
+    finally:
+        workers = thread_profilers.stop()
+        snapshot = tracemalloc.take_snapshot()
+        # RunMetrics.stage()의 reset_peak()로 지워진 최대값까지 포함한 실행 전체 최대값
+        current, peak = traced_memory()
+        tracemalloc.stop()
+
+        Path(REPORTS_DIR).mkdir(exist_ok=True)
+        base = Path(REPORTS_DIR) / f"profile_{job}_{timestamp}"
+        # 메인 스레드와 워커 스레드 결과를 합쳐 저장 (워커 스레드는 실행이 끝나 유휴 상태)
+        stats = pstats.Stats(profiler)
+        for worker in workers:
+            stats.add(worker)
+        stats.dump_stats(f"{base}.pstats")
+
+        top = io.StringIO()
+        stats.stream = top
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(f"# Profile: {job} ({timestamp} KST)\n\n")
+            f.write(f"threads: main + {len(workers)} worker threads")
+            if thread_profilers.unprofiled:
+                f.write(f" ({thread_profilers.unprofiled} threads not profiled: another profiler is active)")
+            f.write("\n")
+            f.write(f"traced memory: current {current / 1024 / 1024:.1f} MiB, peak {peak / 1024 / 1024:.1f} MiB\n\n")
+            f.write("## Hot functions\n\n")
+            f.write(hot_function_report(stats) + "\n\n")
+            f.write(f"## Top {TOP_FUNCTIONS} by cumulative time\n\n")
+            f.write(top.getvalue() + "\n")
+            f.write(f"## Top {TOP_ALLOCATIONS} allocations (live at end of run)\n\n")
+            f.write(allocation_report(snapshot) + "\n")
+
+        print(f"✓ Profile 저장: {base}.pstats, {base}.txt")
+
+
+def run_main(main_fn, job):
+    """PROFILE_RUN=1이면 프로파일링하며, 아니면 그대로 main_fn() 실행"""
+    if PROFILE_RUN:
+        return profile_main(main_fn, job)
+    return main_fn()
@@ -0,0 +1,142 @@
+# 샤드 실행 (키워드가 많을 때 검색을 여러 프로세스로 나누고 결과를 병합)
+# 1) naver_news.py --shard i/N --run-id RUN_ID : KEYWORDS를 N개로 나눈 i번째 조각만 검색해
+#    SHARD_DIR/RUN_ID/shard-i-of-N.json에 부분 결과(키워드별 검색 결과) 저장
+# 2) naver_news.py --merge RUN_ID : 모든 조각을 모아 KEYWORDS 순서로 합친 뒤 단일 실행과 같은
+#    중복 제거(앞쪽 키워드 우선)/그룹화/저장/워터마크 갱신/알림 실행
+# 이 스크립트는 1)을 로컬 프로세스 N개로 동시에 실행하고 2)까지 이어서 실행한다.
+# CI에서는 1)을 matrix 작업으로, 2)를 부분 결과 artifact를 모은 뒤 실행한다 (mvno_news_sharded.yml).
+#
+# 사용법:
+#   python shard_runner.py --shards 4
+#   KEYWORDS_FILE=keywords.txt python shard_runner.py --shards 8
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+
+from config import KEYWORDS, SHARD_DIR
+
+KST = pytz.timezone('Asia/Seoul')
+
+REPO_DIR = Path(__file__).resolve().parent
+
+
+def parse_shard(value):
+    """"i/N" → (i, N) (0 <= i < N)"""
+    try:
+        shard, shards = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must be i/N: {value}")
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard index out of range: {value}")
+    return shard, shards
+
+
+def shard_keywords(keywords, shard, shards):
+    """i번째 조각의 키워드 (번갈아 배정해 우선순위가 높은 키워드가 한 조각에 몰리지 않게 함)"""
+    return list(keywords)[shard::shards]
+
+
+def keywords_digest(keywords):
+    """키워드 목록(순서 포함) 해시 - 모든 조각이 같은 목록으로 실행됐는지 병합 시 확인"""
+    return hashlib.sha1("\n".join(keywords).encode('utf-8')).hexdigest()[:12]
+
+
+def new_run_id():
+    return datetime.now(KST).strftime("%Y%m%d_%H%M%S")
+
+
+def shard_path(run_id, shard, shards, shard_dir=SHARD_DIR):
+    return Path(shard_dir) / run_id / f"shard-{shard}-of-{shards}.json"
+
+
+def write_shard(run_id, shard, shards, news_by_keyword, fetch_status, request_stats, shard_dir=SHARD_DIR):
+    """부분 결과 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = shard_path(run_id, shard, shards, shard_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "run_id": run_id,
+        "shard": shard,
+        "shards": shards,
+        "keywords_digest": keywords_digest(KEYWORDS),
+        "created_at": datetime.now(KST).isoformat(timespec="seconds"),
+        "keywords": list(news_by_keyword),
+        "api_requests": request_stats.get('requests', 0),
+        "fetch_status": fetch_status,
+        "news_by_keyword": news_by_keyword
+    }
+    temp_path = path.with_suffix(".tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    temp_path.replace(path)
+    return path
+
+
+def load_shards(run_id, shard_dir=SHARD_DIR):
+    """모든 조각을 읽어 ({키워드: 검색 결과} KEYWORDS 순서, {키워드: 검색 종료 사유}, 조각들의 API 호출 수 합) 반환
+
+    조각이 빠졌거나 다른 키워드 목록으로 실행된 조각이 있으면 ValueError.
+    """
+    paths = sorted((Path(shard_dir) / run_id).glob("shard-*-of-*.json"))
+    if not paths:
+        raise ValueError(f"no shard results in {Path(shard_dir) / run_id}")
+
+    shards = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            shards.append(json.load(f))
+
+    total = shards[0]['shards']
+    digest = keywords_digest(KEYWORDS)
+    found = sorted(data['shard'] for data in shards if data['shards'] == total)
+    if found != list(range(total)) or len(shards) != total:
+        raise ValueError(f"incomplete shard results for {run_id}: got {found}, expected 0..{total - 1}")
+    mismatched = [data['shard'] for data in shards if data['keywords_digest'] != digest]
+    if mismatched:
+        raise ValueError(f"shards {mismatched} were run with a different keyword list")
+
+    merged = {}
+    fetch_status = {}
+    for data in shards:
+        merged.update(data['news_by_keyword'])
+        fetch_status.update(data.get('fetch_status', {}))
+    news_by_keyword = {keyword: merged[keyword] for keyword in KEYWORDS if keyword in merged}
+    return news_by_keyword, fetch_status, sum(data.get('api_requests', 0) for data in shards)
+
+
+def remove_shards(run_id, shard_dir=SHARD_DIR):
+    """병합이 끝난 부분 결과 삭제"""
+    shutil.rmtree(Path(shard_dir) / run_id, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 샤드 병렬 실행 후 병합")
+    parser.add_argument("--shards", type=int, required=True, help="조각(프로세스) 수")
+    parser.add_argument("--run-id", help="부분 결과 디렉토리 이름 (기본: 현재 시각)")
+    args = parser.parse_args()
+
+    run_id = args.run_id or new_run_id()
+    script = str(REPO_DIR / "naver_news.py")
+    print(f"Running {len(KEYWORDS)} keywords in {args.shards} shards (run_id: {run_id})")
+
+    processes = [
+        subprocess.Popen([sys.executable, script, "--shard", f"{shard}/{args.shards}", "--run-id", run_id])
+        for shard in range(args.shards)
+    ]
+    failed = [shard for shard, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        print(f"Shards failed: {failed} (partial results kept in {Path(SHARD_DIR) / run_id})")
+        sys.exit(1)
+
+    sys.exit(subprocess.call([sys.executable, script, "--merge", run_id]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# 유사도 임계값 튜닝 (API 재호출 없이 저장된 수집 결과로 실행)
+# 실행 결과의 키워드별 유사도 그래프(floor 이상인 쌍)를 한 번 계산해 캐시하고,
+# 이후에는 캐시된 간선만으로 임의의 임계값/임계값 구간의 그룹화 결과를 바로 만든다.
+# 그룹화 규칙은 GROUPING_SCOPE=keyword (키워드별 탐욕적 그룹화)와 같다.
+#
+# 사용법:
+#   python similarity_sweep.py mvno_news/mvno_news_YYYYMMDD_HHMMSS.json   # 실행별 JSON
+#   python similarity_sweep.py YYYYMMDD_HHMMSS                             # 아카이브의 실행
+#   옵션: --floor 0.3  --thresholds 0.4,0.5,0.6,0.7  --output sweep.json
+
+import argparse
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from config import DATA_DIR
+from news_archive import iter_runs
+from news_similarity import group_edges, normalize_title, similarity_edges
+
+CACHE_DIR = Path(DATA_DIR) / "similarity_cache"
+
+DEFAULT_FLOOR = 0.3
+DEFAULT_THRESHOLDS = [round(0.3 + 0.05 * step, 2) for step in range(13)]
+
+
+def load_run(source):
+    """실행별 JSON 경로 또는 아카이브 run_id로 (run_id, {키워드: 기사 목록}) 반환
+
+    저장된 그룹 순서대로 펼치면 원래 임계값에서 같은 그룹이 다시 만들어진다.
+    """
+    path = Path(source)
+    if path.suffix == ".json" and path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        run_id = path.stem.replace("mvno_news_", "")
+        grouped = data.get('news_by_keyword', {})
+    else:
+        run_id = source
+        day = datetime.strptime(run_id, "%Y%m%d_%H%M%S").strftime("%Y-%m-%d")
+        grouped = next((news for rid, _, _, news in iter_runs(day, day) if rid == run_id), None)
+        if grouped is None:
+            raise FileNotFoundError(f"run {run_id} not found in archive")
+
+    articles = {
+        keyword: [news for group in groups for news in group]
+        for keyword, groups in grouped.items()
+    }
+    return run_id, articles
+
+
+def titles_digest(norm_titles_by_keyword):
+    """캐시 유효성 확인용 제목 목록 해시"""
+    text = json.dumps(norm_titles_by_keyword, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def load_graph(run_id, articles, floor):
+    """키워드별 유사도 간선 {키워드: [(i, j, ratio), ...]} (캐시가 맞으면 재사용)"""
+    norm_titles = {keyword: [normalize_title(news['title']) for news in news_list] for keyword, news_list in articles.items()}
+    digest = titles_digest(norm_titles)
+    cache_path = CACHE_DIR / f"{run_id}.json"
+
+    if cache_path.exists():
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('digest') == digest and cache.get('floor', 1.0) <= floor:
+            print(f"Using cached similarity graph: {cache_path}")
+            return {
+                keyword: [tuple(edge) for edge in edges if edge[2] >= floor]
+                for keyword, edges in cache['edges'].items()
+            }
+
+    print(f"Computing similarity graph (floor {floor})...")
+    graph = {keyword: similarity_edges(titles, floor) for keyword, titles in norm_titles.items()}
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump({'run_id': run_id, 'floor': floor, 'digest': digest, 'edges': graph}, f)
+    print(f"✓ Cache 저장: {cache_path}")
+    return graph
+
+
+def summarize(articles, graph, threshold):
+    """임계값 하나에 대한 그룹화 요약"""
+    by_keyword = {}
+    total_groups = 0
+    multi_groups = 0
+    largest = 0
+    for keyword, news_list in articles.items():
+        groups = group_edges(len(news_list), graph[keyword], threshold)
+        by_keyword[keyword] = len(groups)
+        total_groups += len(groups)
+        multi_groups += sum(1 for group in groups if len(group) > 1)
+        largest = max([largest] + [len(group) for group in groups])
+
+    return {
+        'threshold': threshold,
+        'articles': sum(len(news_list) for news_list in articles.values()),
+        'groups': total_groups,
+        'multi_article_groups': multi_groups,
+        'largest_group': largest,
+        'by_keyword': by_keyword
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유사도 임계값별 그룹화 결과 비교")
+    parser.add_argument("source", help="실행별 JSON 경로 또는 아카이브 run_id (YYYYMMDD_HHMMSS)")
+    parser.add_argument("--floor", type=float, default=DEFAULT_FLOOR, help="캐시할 최소 유사도")
+    parser.add_argument("--thresholds", help="쉼표로 구분한 임계값 목록 (기본: 0.30~0.90, 0.05 간격)")
+    parser.add_argument("--output", help="요약을 저장할 JSON 경로")
+    args = parser.parse_args()
+
+    thresholds = [float(value) for value in args.thresholds.split(",")] if args.thresholds else DEFAULT_THRESHOLDS
+    if min(thresholds) < args.floor:
+        print(f"Threshold below floor {args.floor}: {min(thresholds)}")
+        sys.exit(1)
+
+    run_id, articles = load_run(args.source)
+    graph = load_graph(run_id, articles, args.floor)
+    print(f"Run {run_id}: {sum(len(v) for v in articles.values())} articles, {sum(len(v) for v in graph.values())} edges\n")
+
+    summaries = [summarize(articles, graph, threshold) for threshold in thresholds]
+
+    print(f"{'threshold':>9} {'groups':>7} {'multi':>6} {'largest':>8}")
+    for summary in summaries:
+        print(
+            f"{summary['threshold']:>9.2f} {summary['groups']:>7} "
+            f"{summary['multi_article_groups']:>6} {summary['largest_group']:>8}"
+        )
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'run_id': run_id, 'floor': args.floor, 'sweep': summaries}, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ Sweep 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
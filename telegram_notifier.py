@@ -0,0 +1,263 @@
+# 텔레그램 알림 전송 (백그라운드 스레드 + 디스크 보관함)
+# 수집 스크립트는 메시지를 보관함(outbox)에 넣기만 하고 바로 다음 단계로 넘어간다.
+# 전송 스레드가 밀린 메시지를 4096자 이내로 합쳐 속도 제한에 맞춰 보내고, 429/5xx/연결 오류는
+# 백오프 후 재시도한다. 보내지 못한 메시지는 보관함 파일에 남아 다음 실행에서 이어서 전송된다.
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import requests
+
+from config import (
+    TELEGRAM_API_BASE as DEFAULT_TELEGRAM_API_BASE, TELEGRAM_OUTBOX_PATH, TELEGRAM_OUTBOX_MAX_AGE_HOURS,
+    TELEGRAM_RATE_PER_SEC as DEFAULT_RATE_PER_SEC, TELEGRAM_MAX_RETRIES as DEFAULT_MAX_RETRIES,
+    TELEGRAM_FLUSH_TIMEOUT_SEC as DEFAULT_FLUSH_TIMEOUT_SEC
+)
+from request_scheduler import RETRY_STATUS_CODES, TokenBucket
+
+TELEGRAM_BOT_TOKEN = os.environ.get('TELEGRAM_BOT_TOKEN')
+TELEGRAM_CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID_NEWS')
+TELEGRAM_API_BASE = os.environ.get('TELEGRAM_API_BASE', DEFAULT_TELEGRAM_API_BASE).rstrip("/")
+
+# 전송 속도(초당 메시지 수), 재시도 횟수, 종료 전 전송 대기 시간(초) - 환경 변수로 덮어쓰기 가능
+TELEGRAM_RATE_PER_SEC = float(os.environ.get('TELEGRAM_RATE_PER_SEC', DEFAULT_RATE_PER_SEC))
+TELEGRAM_MAX_RETRIES = int(os.environ.get('TELEGRAM_MAX_RETRIES', DEFAULT_MAX_RETRIES))
+TELEGRAM_FLUSH_TIMEOUT_SEC = float(os.environ.get('TELEGRAM_FLUSH_TIMEOUT_SEC', DEFAULT_FLUSH_TIMEOUT_SEC))
+
+# 텔레그램 메시지 최대 길이
+TELEGRAM_MAX_LENGTH = 4096
+
+# 합친 메시지 사이 구분
+COALESCE_SEPARATOR = "\n\n"
+
+
+def split_text(text, limit=TELEGRAM_MAX_LENGTH):
+    """limit자를 넘는 메시지를 줄 단위로 나눔 (한 줄이 limit보다 길면 글자 단위로 자름)"""
+    if len(text) <= limit:
+        return [text]
+
+    parts = []
+    current = ""
+    for line in text.split("\n"):
+        while len(line) > limit:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            parts.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        parts.append(current)
+    return parts
+
+
+def coalesce(messages, limit=TELEGRAM_MAX_LENGTH):
+    """앞에서부터 같은 채팅방 메시지를 limit자 이내로 합쳐 (텍스트, 포함된 메시지 id 목록) 반환"""
+    first = messages[0]
+    text = first['text']
+    ids = [first['id']]
+    for message in messages[1:]:
+        if message['chat_id'] != first['chat_id']:
+            break
+        candidate = text + COALESCE_SEPARATOR + message['text']
+        if len(candidate) > limit:
+            break
+        text = candidate
+        ids.append(message['id'])
+    return text, ids
+
+
+class TelegramNotifier:
+    """보관함 파일을 거쳐 백그라운드에서 전송하는 텔레그램 알림"""
+
+    def __init__(self, token, chat_id, api_base=TELEGRAM_API_BASE, outbox_path=TELEGRAM_OUTBOX_PATH,
+                 rate=TELEGRAM_RATE_PER_SEC, max_retries=TELEGRAM_MAX_RETRIES, backoff_base=1.0, backoff_max=30.0):
+        self.url = f"{api_base}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.outbox_path = Path(outbox_path).resolve()
+        self.bucket = TokenBucket(rate, 1)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.session = requests.Session()
+        self.lock = threading.Condition()
+        self.outbox = self._load()
+        self.thread = None
+        self.stats = {
+            'queued': 0,
+            'resumed': len(self.outbox),
+            'sent_messages': 0,
+            'sent_requests': 0,
+            'retried': 0,
+            'dropped': 0
+        }
+
+    def _load(self):
+        """이전 실행에서 보내지 못한 메시지 읽기 (보관 기간이 지난 메시지는 버림)"""
+        try:
+            with open(self.outbox_path, 'r', encoding='utf-8') as f:
+                outbox = json.load(f)
+        except (OSError, ValueError):
+            return []
+        oldest = time.time() - TELEGRAM_OUTBOX_MAX_AGE_HOURS * 3600
+        return [message for message in outbox if message.get('created_ts', 0) >= oldest]
+
+    def _save(self):
+        """보관함 저장 (임시 파일에 쓴 뒤 교체, lock을 잡은 상태에서 호출)"""
+        self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.outbox_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.outbox, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.outbox_path)
+
+    def send(self, text):
+        """메시지를 보관함에 넣고 바로 반환 (전송은 백그라운드 스레드)"""
+        with self.lock:
+            for part in split_text(text):
+                self.outbox.append({
+                    'id': uuid.uuid4().hex,
+                    'chat_id': self.chat_id,
+                    'text': part,
+                    'created_ts': time.time()
+                })
+                self.stats['queued'] += 1
+            self._save()
+            self.lock.notify_all()
+        self.start()
+
+    def start(self):
+        """전송 스레드 시작 (보관함에 남은 메시지가 있으면 바로 전송 시작)"""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="telegram-notifier", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        isolate = False  # 합친 메시지가 400으로 거부되면 보관함이 빌 때까지 하나씩 전송 (잘못된 메시지만 버림)
+        while True:
+            with self.lock:
+                if not self.outbox:
+                    isolate = False
+                while not self.outbox:
+                    self.lock.wait()
+                text, ids = coalesce(self.outbox, 0 if isolate else TELEGRAM_MAX_LENGTH)
+                chat_id = self.outbox[0]['chat_id']
+
+            self.bucket.acquire()
+            delivered = self._post(chat_id, text)
+
+            with self.lock:
+                if delivered is None:
+                    # 재시도 횟수 초과 - 보관함에 남겨 다음 실행에서 다시 전송
+                    print(f"Telegram: delivery postponed ({len(self.outbox)} messages kept in outbox)")
+                    return
+                if delivered is False and len(ids) > 1:
+                    isolate = True
+                    continue
+                sent = set(ids)
+                self.outbox = [message for message in self.outbox if message['id'] not in sent]
+                self._save()
+                if delivered:
+                    self.stats['sent_messages'] += len(ids)
+                else:
+                    self.stats['dropped'] += len(ids)
+                self.lock.notify_all()
+
+    def backoff_delay(self, attempt, response=None):
+        """재시도 대기 시간 (429의 retry_after 우선, 없으면 지수 백오프 + full jitter)"""
+        if response is not None:
+            try:
+                retry_after = response.json().get('parameters', {}).get('retry_after')
+            except ValueError:
+                retry_after = None
+            if retry_after:
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, chat_id, text):
+        """전송 성공 True, 잘못된 메시지(400) False, 재시도 횟수 초과 또는 설정 오류(401/403/404 등) None"""
+        data = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
+        for attempt in range(self.max_retries + 1):
+            with self.lock:
+                self.stats['sent_requests'] += 1
+            try:
+                response = self.session.post(self.url, data=data, timeout=10)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                print(f"Telegram error: {e}")
+                response = None
+            else:
+                if response.status_code == 200:
+                    return True
+                if response.status_code not in RETRY_STATUS_CODES:
+                    print(f"Telegram error {response.status_code}: {response.text[:200]}")
+                    return False if response.status_code == 400 else None
+
+            if attempt < self.max_retries:
+                with self.lock:
+                    self.stats['retried'] += 1
+                time.sleep(self.backoff_delay(attempt, response))
+        return None
+
+    def pending(self):
+        with self.lock:
+            return len(self.outbox)
+
+    def flush(self, timeout=TELEGRAM_FLUSH_TIMEOUT_SEC):
+        """보관함이 빌 때까지 최대 timeout초 대기, 남은 메시지 수 반환 (남은 메시지는 다음 실행에서 전송)"""
+        if self.outbox:
+            self.start()
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            while self.outbox and self.thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.lock.wait(min(remaining, 0.5))
+            if self.outbox:
+                print(f"Telegram: {len(self.outbox)} messages left in outbox for the next run")
+            return len(self.outbox)
+
+    def summary(self):
+        """통계 dict (보관함에 남은 메시지 수 포함)"""
+        with self.lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self.outbox)
+        return stats
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier():
+    """프로세스 공용 알림 전송기 (처음 호출 시 이전 실행의 보관함을 읽고 전송 시작)"""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = TelegramNotifier(TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID)
+            if _notifier.outbox:
+                print(f"Telegram: resuming {len(_notifier.outbox)} undelivered messages")
+                _notifier.start()
+    return _notifier
+
+
+def send_message(text):
+    """메시지를 보관함에 넣고 바로 반환"""
+    get_notifier().send(text)
+
+
+def flush_notifications(timeout=None):
+    """종료 전 보관함 전송 대기 (알림 전송기를 쓰지 않았으면 바로 반환)"""
+    if _notifier is None:
+        return 0
+    return _notifier.flush(TELEGRAM_FLUSH_TIMEOUT_SEC if timeout is None else timeout)